@@ -747,6 +747,7 @@ class Transpiler {
                         return (
                             line.replace ('asyncio.get_event_loop().run_until_complete(main())', 'main()')
                                 .replace ('import ccxt.async_support as ccxt', 'import ccxt')
+                                .replace ('ccxt.async_support.base.recorder', 'ccxt.base.recorder')
                                 .replace (/.*token\_bucket.*/g, '')
                                 .replace ('await asyncio.sleep', 'time.sleep')
                                 .replace ('async ', '')
@@ -20,35 +20,11 @@ bitmex = ccxt.bitmex({
 symbol = 'BTC/USD'
 
 ohlcv5 = bitmex.fetch_ohlcv(symbol, '5m')
-ohlcv15 = []
-
-# OHLCV key indexes
-
-timestamp = 0
-open = 1
-high = 2
-low = 3
-close = 4
-volume = 5
-
-# convert 5m → 15m
-
-if len(ohlcv5) > 2:
-    for i in range(0, len(ohlcv5) - 2, 3):
-        highs = [ohlcv5[i + j][high] for j in range(0, 3) if ohlcv5[i + j][high]]
-        lows = [ohlcv5[i + j][low] for j in range(0, 3) if ohlcv5[i + j][low]]
-        volumes = [ohlcv5[i + j][volume] for j in range(0, 3) if ohlcv5[i + j][volume]]
-        candle = [
-            ohlcv5[i + 0][timestamp],
-            ohlcv5[i + 0][open],
-            max(highs) if len(highs) else None,
-            min(lows) if len(lows) else None,
-            ohlcv5[i + 2][close],
-            sum(volumes) if len(volumes) else None,
-        ]
-        ohlcv15.append(candle)
-else:
-    raise Exception('Too few 5m candles')
+
+# convert 5m → 15m locally (requires numpy), periods without candles are
+# filled with the previous close and a volume of 0
+
+ohlcv15 = bitmex.resample_ohlcv(ohlcv5, '15m')
 
 # do whatever you want with your 15m candles here...
 
@@ -72,6 +72,9 @@ module.exports = class Exchange {
             'countries': undefined,
             'enableRateLimit': false,
             'rateLimit': 2000, // milliseconds = seconds * 1000
+            'tokenBuckets': undefined, // additional named buckets of the weighted endpoints, used by the python rate limiter
+            'adaptiveRateLimit': false, // adjust the rate limiter from the rateLimitHeaders of the responses, python only
+            'rateLimitHeaders': undefined, // the rate limit headers of the exchange, see RateLimitFeedback in python
             'certified': false,
             'pro': false,
             'has': {
@@ -432,15 +435,23 @@ module.exports = class Exchange {
 
     defineRestApi (api, methodName, options = {}) {
 
+        this.apiCosts = {}
+
         for (const type of Object.keys (api)) {
             for (const httpMethod of Object.keys (api[type])) {
 
-                let paths = api[type][httpMethod]
+                // either a list of paths or a dictionary of paths to their rate limiter costs
+                const urls = api[type][httpMethod]
+                const isDict = !Array.isArray (urls)
+                const paths = isDict ? Object.keys (urls) : urls
                 for (let i = 0; i < paths.length; i++) {
                     let path = paths[i].trim ()
                     let splitPath = path.split (/[^a-zA-Z0-9]/)
 
                     let uppercaseMethod  = httpMethod.toUpperCase ()
+                    if (isDict) {
+                        this.apiCosts[[ type, uppercaseMethod, path ].join (' ')] = urls[paths[i]]
+                    }
                     let lowercaseMethod  = httpMethod.toLowerCase ()
                     let camelcaseMethod  = this.capitalize (lowercaseMethod)
                     let camelcaseSuffix  = splitPath.map (this.capitalize).join ('')
@@ -513,10 +524,40 @@ module.exports = class Exchange {
         return this.executeRestRequest (url, method, headers, body)
     }
 
+    calculateRateLimiterCost (type, method, path, params) {
+
+        // the cost from the api definitions is either a number or an object with
+        // 'cost', 'byLimit': [ [ limit, cost ], ... ] and 'noSymbol' keys,
+        // the named 'buckets' of an endpoint are only charged by the python limiter
+        const config = (this.apiCosts !== undefined) ? this.apiCosts[[ type, method, path ].join (' ')] : undefined
+        if (config === undefined) {
+            return this.tokenBucket['defaultCost']
+        }
+        if (typeof config !== 'object') {
+            return config
+        }
+        let cost = this.safeValue (config, 'cost', this.tokenBucket['defaultCost'])
+        if (('noSymbol' in config) && !((typeof params === 'object') && ('symbol' in params))) {
+            cost = config['noSymbol']
+        }
+        const byLimit = this.safeValue (config, 'byLimit')
+        const limit = this.safeInteger (params, 'limit')
+        if ((byLimit !== undefined) && (limit !== undefined)) {
+            cost = byLimit[byLimit.length - 1][1]
+            for (let i = 0; i < byLimit.length; i++) {
+                if (limit <= byLimit[i][0]) {
+                    cost = byLimit[i][1]
+                    break
+                }
+            }
+        }
+        return cost
+    }
+
     async fetch2 (path, type = 'public', method = 'GET', params = {}, headers = undefined, body = undefined) {
 
         if (this.enableRateLimit) {
-            await this.throttle (this.rateLimit)
+            await this.throttle (this.rateLimit, this.calculateRateLimiterCost (type, method, path, params))
         }
 
         const request = this.sign (path, type, method, params, headers, body)
@@ -14,7 +14,18 @@ module.exports = class binance extends Exchange {
             'id': 'binance',
             'name': 'Binance',
             'countries': [ 'JP', 'MT' ], // Japan, Malta
-            'rateLimit': 500,
+            'rateLimit': 50, // 1200 request weight per minute
+            'tokenBuckets': {
+                'orders': {
+                    'refillRate': 0.01, // 10 orders per second
+                    'capacity': 10,
+                },
+            },
+            'rateLimitHeaders': {
+                'used': 'X-MBX-USED-WEIGHT-1M',
+                'limit': 1200,
+                'window': 60000,
+            },
             'certified': true,
             'pro': true,
             // new metainfo interface
@@ -244,44 +255,45 @@ module.exports = class binance extends Exchange {
                     ],
                 },
                 'public': {
-                    'get': [
-                        'ping',
-                        'time',
-                        'depth',
-                        'trades',
-                        'aggTrades',
-                        'historicalTrades',
-                        'klines',
-                        'ticker/24hr',
-                        'ticker/price',
-                        'ticker/bookTicker',
-                        'exchangeInfo',
-                    ],
+                    // request weights, https://github.com/binance-exchange/binance-official-api-docs/blob/master/rest-api.md
+                    'get': {
+                        'ping': 1,
+                        'time': 1,
+                        'depth': { 'cost': 1, 'byLimit': [ [ 100, 1 ], [ 500, 5 ], [ 1000, 10 ], [ 5000, 50 ] ] },
+                        'trades': 1,
+                        'aggTrades': 1,
+                        'historicalTrades': 5,
+                        'klines': 1,
+                        'ticker/24hr': { 'cost': 1, 'noSymbol': 40 },
+                        'ticker/price': { 'cost': 1, 'noSymbol': 2 },
+                        'ticker/bookTicker': { 'cost': 1, 'noSymbol': 2 },
+                        'exchangeInfo': 1,
+                    },
                     'put': [ 'userDataStream' ],
                     'post': [ 'userDataStream' ],
                     'delete': [ 'userDataStream' ],
                 },
                 'private': {
-                    'get': [
-                        'allOrderList', // oco
-                        'openOrderList', // oco
-                        'orderList', // oco
-                        'order',
-                        'openOrders',
-                        'allOrders',
-                        'account',
-                        'myTrades',
-                    ],
-                    'post': [
-                        'order/oco',
-                        'order',
-                        'order/test',
-                    ],
-                    'delete': [
-                        'openOrders', // added on 2020-04-25 for canceling all open orders per symbol
-                        'orderList', // oco
-                        'order',
-                    ],
+                    'get': {
+                        'allOrderList': 10, // oco
+                        'openOrderList': 2, // oco
+                        'orderList': 1, // oco
+                        'order': 1,
+                        'openOrders': { 'cost': 1, 'noSymbol': 40 },
+                        'allOrders': 5,
+                        'account': 5,
+                        'myTrades': 5,
+                    },
+                    'post': {
+                        'order/oco': { 'cost': 1, 'buckets': { 'orders': 1 } },
+                        'order': { 'cost': 1, 'buckets': { 'orders': 1 } },
+                        'order/test': 1,
+                    },
+                    'delete': {
+                        'openOrders': 1, // added on 2020-04-25 for canceling all open orders per symbol
+                        'orderList': 1, // oco
+                        'order': 1,
+                    },
                 },
             },
             'fees': {
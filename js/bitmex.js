@@ -17,6 +17,11 @@ module.exports = class bitmex extends Exchange {
             'version': 'v1',
             'userAgent': undefined,
             'rateLimit': 2000,
+            'rateLimitHeaders': {
+                'remaining': 'x-ratelimit-remaining',
+                'limit': 'x-ratelimit-limit',
+                'reset': 'x-ratelimit-reset',
+            },
             'pro': true,
             'has': {
                 'CORS': false,
@@ -818,6 +818,10 @@ class Exchange {
             'defaultCost' => 1.0,
             'maxCapacity' => 1000,
         );
+        $this->tokenBuckets = null; // additional named buckets of the weighted endpoints, used by the python rate limiter
+        $this->adaptiveRateLimit = false; // adjust the rate limiter from the rateLimitHeaders of the responses, python only
+        $this->rateLimitHeaders = null; // the rate limit headers of the exchange, see RateLimitFeedback in python
+        $this->api_costs = array(); // per-endpoint costs from the api definitions, filled in by define_rest_api
 
         $this->curlopt_interface = null;
         $this->timeout = 10000; // in milliseconds
@@ -1046,10 +1050,16 @@ class Exchange {
     public function define_rest_api($api, $method_name, $options = array()) {
         foreach ($api as $type => $methods) {
             foreach ($methods as $http_method => $paths) {
-                foreach ($paths as $path) {
+                // either a list of paths or a dictionary of paths to their rate limiter costs
+                $is_dict = static::is_associative($paths);
+                foreach ($paths as $key => $value) {
+                    $path = $is_dict ? $key : $value;
                     $splitPath = mb_split('[^a-zA-Z0-9]', $path);
 
                     $uppercaseMethod = mb_strtoupper($http_method);
+                    if ($is_dict) {
+                        $this->api_costs[implode(' ', array($type, $uppercaseMethod, $path))] = $value;
+                    }
                     $lowercaseMethod = mb_strtolower($http_method);
                     $camelcaseMethod = static::capitalize($lowercaseMethod);
                     $camelcaseSuffix = implode(array_map(get_called_class() . '::capitalize', $splitPath));
@@ -1166,20 +1176,55 @@ class Exchange {
     }
 
     // this method is experimental
-    public function throttle() {
+    public function throttle($cost = null) {
+        $cost = ($cost === null) ? $this->tokenBucket['defaultCost'] : $cost;
         $now = $this->milliseconds();
         $elapsed = $now - $this->lastRestRequestTimestamp;
-        if ($elapsed < $this->rateLimit) {
-            $delay = $this->rateLimit - $elapsed;
+        $interval = $this->rateLimit * $cost;
+        if ($elapsed < $interval) {
+            $delay = $interval - $elapsed;
             usleep((int) ($delay * 1000.0));
         }
     }
 
+    public function calculate_rate_limiter_cost($api, $method, $path, $params) {
+        // the cost from the api definitions is either a number or an array with
+        // 'cost', 'byLimit' => array(array(limit, cost), ...) and 'noSymbol' keys,
+        // the named 'buckets' of an endpoint are only charged by the python limiter
+        $key = implode(' ', array($api, $method, $path));
+        $config = array_key_exists($key, $this->api_costs) ? $this->api_costs[$key] : null;
+        if ($config === null) {
+            return $this->tokenBucket['defaultCost'];
+        }
+        if (!is_array($config)) {
+            return $config;
+        }
+        $cost = $this->safe_value($config, 'cost', $this->tokenBucket['defaultCost']);
+        if (array_key_exists('noSymbol', $config) && !(is_array($params) && array_key_exists('symbol', $params))) {
+            $cost = $config['noSymbol'];
+        }
+        $by_limit = $this->safe_value($config, 'byLimit');
+        $limit = $this->safe_integer($params, 'limit');
+        if (($by_limit !== null) && ($limit !== null)) {
+            $cost = $by_limit[count($by_limit) - 1][1];
+            foreach ($by_limit as $threshold) {
+                if ($limit <= $threshold[0]) {
+                    $cost = $threshold[1];
+                    break;
+                }
+            }
+        }
+        return $cost;
+    }
+
     public function sign($path, $api = 'public', $method = 'GET', $params = array(), $headers = null, $body = null) {
         throw new NotSupported($this->id . ' sign() not supported yet');
     }
 
     public function fetch2($path, $api = 'public', $method = 'GET', $params = array(), $headers = null, $body = null) {
+        if ($this->enableRateLimit) {
+            $this->throttle($this->calculate_rate_limiter_cost($api, $method, $path, $params));
+        }
         $request = $this->sign($path, $api, $method, $params, $headers, $body);
         return $this->fetch($request['url'], $request['method'], $request['headers'], $request['body']);
     }
@@ -1244,10 +1289,6 @@ class Exchange {
     }
 
     public function fetch($url, $method = 'GET', $headers = null, $body = null) {
-        if ($this->enableRateLimit) {
-            $this->throttle();
-        }
-
         $headers = array_merge($this->headers, $headers ? $headers : array());
 
         if (strlen($this->proxy)) {
@@ -21,7 +21,18 @@ class binance extends Exchange {
             'id' => 'binance',
             'name' => 'Binance',
             'countries' => array( 'JP', 'MT' ), // Japan, Malta
-            'rateLimit' => 500,
+            'rateLimit' => 50, // 1200 request weight per minute
+            'tokenBuckets' => array(
+                'orders' => array(
+                    'refillRate' => 0.01, // 10 orders per second
+                    'capacity' => 10,
+                ),
+            ),
+            'rateLimitHeaders' => array(
+                'used' => 'X-MBX-USED-WEIGHT-1M',
+                'limit' => 1200,
+                'window' => 60000,
+            ),
             'certified' => true,
             'pro' => true,
             // new metainfo interface
@@ -251,18 +262,19 @@ class binance extends Exchange {
                     ),
                 ),
                 'public' => array(
+                    // request weights, https://github.com/binance-exchange/binance-official-api-docs/blob/master/rest-api.md
                     'get' => array(
-                        'ping',
-                        'time',
-                        'depth',
-                        'trades',
-                        'aggTrades',
-                        'historicalTrades',
-                        'klines',
-                        'ticker/24hr',
-                        'ticker/price',
-                        'ticker/bookTicker',
-                        'exchangeInfo',
+                        'ping' => 1,
+                        'time' => 1,
+                        'depth' => array( 'cost' => 1, 'byLimit' => array( array( 100, 1 ), array( 500, 5 ), array( 1000, 10 ), array( 5000, 50 ) ) ),
+                        'trades' => 1,
+                        'aggTrades' => 1,
+                        'historicalTrades' => 5,
+                        'klines' => 1,
+                        'ticker/24hr' => array( 'cost' => 1, 'noSymbol' => 40 ),
+                        'ticker/price' => array( 'cost' => 1, 'noSymbol' => 2 ),
+                        'ticker/bookTicker' => array( 'cost' => 1, 'noSymbol' => 2 ),
+                        'exchangeInfo' => 1,
                     ),
                     'put' => array( 'userDataStream' ),
                     'post' => array( 'userDataStream' ),
@@ -270,24 +282,24 @@ class binance extends Exchange {
                 ),
                 'private' => array(
                     'get' => array(
-                        'allOrderList', // oco
-                        'openOrderList', // oco
-                        'orderList', // oco
-                        'order',
-                        'openOrders',
-                        'allOrders',
-                        'account',
-                        'myTrades',
+                        'allOrderList' => 10, // oco
+                        'openOrderList' => 2, // oco
+                        'orderList' => 1, // oco
+                        'order' => 1,
+                        'openOrders' => array( 'cost' => 1, 'noSymbol' => 40 ),
+                        'allOrders' => 5,
+                        'account' => 5,
+                        'myTrades' => 5,
                     ),
                     'post' => array(
-                        'order/oco',
-                        'order',
-                        'order/test',
+                        'order/oco' => array( 'cost' => 1, 'buckets' => array( 'orders' => 1 ) ),
+                        'order' => array( 'cost' => 1, 'buckets' => array( 'orders' => 1 ) ),
+                        'order/test' => 1,
                     ),
                     'delete' => array(
-                        'openOrders', // added on 2020-04-25 for canceling all open orders per symbol
-                        'orderList', // oco
-                        'order',
+                        'openOrders' => 1, // added on 2020-04-25 for canceling all open orders per symbol
+                        'orderList' => 1, // oco
+                        'order' => 1,
                     ),
                 ),
             ),
@@ -21,6 +21,11 @@ class bitmex extends Exchange {
             'version' => 'v1',
             'userAgent' => null,
             'rateLimit' => 2000,
+            'rateLimitHeaders' => array(
+                'remaining' => 'x-ratelimit-remaining',
+                'limit' => 'x-ratelimit-limit',
+                'reset' => 'x-ratelimit-reset',
+            ),
             'pro' => true,
             'has' => array(
                 'CORS' => false,
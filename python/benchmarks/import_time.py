@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""Measures the time it takes to import ccxt in a fresh interpreter
+
+    python benchmarks/import_time.py [--runs N] [--exchange binance]
+
+Every statement runs in a new process, the median of the runs is reported.
+Use python -X importtime -c "import ccxt" to see where the time goes."""
+
+import argparse
+import os
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+template = '''
+import sys, time
+sys.path.insert(0, %r)
+start = time.perf_counter()
+%s
+print(time.perf_counter() - start)
+'''
+
+
+def measure(statement, runs):
+    timings = []
+    for i in range(0, runs):
+        output = subprocess.check_output([sys.executable, '-c', template % (root, statement)])
+        timings.append(float(output.decode().strip().splitlines()[-1]))
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--exchange', default='binance')
+    args = parser.parse_args()
+    statements = [
+        'import ccxt',
+        'import ccxt; ccxt.' + args.exchange,
+        'import ccxt; [getattr(ccxt, id) for id in ccxt.exchanges]',
+        'import ccxt.async_support',
+        'import ccxt.async_support; ccxt.async_support.' + args.exchange,
+    ]
+    for statement in statements:
+        print('%8.1f ms  %s' % (measure(statement, args.runs) * 1000, statement))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""Measures how long it takes to instantiate every exchange in ccxt.exchanges
+
+    python benchmarks/instantiate_exchanges.py [--async] [--rounds N]
+
+The first round includes the one-time class setup (generated api methods and
+camelcase aliases), the following rounds show the cost of a new instance."""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+
+def instantiate(module, config):
+    instances = []
+    for id in ccxt.exchanges:
+        try:
+            instances.append(getattr(module, id)(config))
+        except ccxt.NotSupported:
+            pass  # missing optional dependencies, web3 for example
+    return instances
+
+
+async def close(instances):
+    for instance in instances:
+        await instance.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--async', dest='asynchronous', action='store_true', help='instantiate the async_support classes')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    module = ccxt.async_support if args.asynchronous else ccxt
+    config = {}
+    loop = None
+    if args.asynchronous:
+        loop = asyncio.new_event_loop()
+        config = {'asyncio_loop': loop}
+    for i in range(0, args.rounds):
+        start = time.perf_counter()
+        instances = instantiate(module, config)
+        elapsed = time.perf_counter() - start
+        print('round %d: %d exchanges in %.1f ms, %.3f ms per exchange' % (i + 1, len(instances), elapsed * 1000, elapsed * 1000 / len(instances)))
+        if args.asynchronous:
+            loop.run_until_complete(close(instances))
+    if loop is not None:
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""Measures how long it takes to decode large exchange responses with every installed JSON codec
+
+    python benchmarks/json_decoding.py [--rounds N] [recorded responses ...]
+
+Without arguments it generates payloads shaped like the binance fetch_tickers,
+okex fetch_markets and poloniex returnOrderBook?currencyPair=all responses,
+otherwise every argument is a file with a recorded response body. The text
+column is the former path, decoding the body to str and parsing it with the
+json module."""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+from ccxt.base import json_codec  # noqa: E402
+
+
+def number(random, digits=8):
+    return '%.*f' % (digits, random.uniform(0, 10000))
+
+
+def binance_tickers(random):
+    return [{
+        'symbol': 'COIN%dUSDT' % i,
+        'priceChange': number(random), 'priceChangePercent': number(random, 3), 'weightedAvgPrice': number(random),
+        'prevClosePrice': number(random), 'lastPrice': number(random), 'lastQty': number(random),
+        'bidPrice': number(random), 'bidQty': number(random), 'askPrice': number(random), 'askQty': number(random),
+        'openPrice': number(random), 'highPrice': number(random), 'lowPrice': number(random),
+        'volume': number(random), 'quoteVolume': number(random),
+        'openTime': 1590000000000 + i, 'closeTime': 1590086400000 + i,
+        'firstId': 100000 + i, 'lastId': 200000 + i, 'count': 100000,
+    } for i in range(0, 1200)]
+
+
+def okex_markets(random):
+    return [{
+        'instrument_id': 'COIN%d-USDT-SWAP' % i, 'underlying_index': 'COIN%d' % i, 'quote_currency': 'USDT',
+        'coin': 'USDT', 'contract_val': '0.1', 'listing': '2020-01-01T00:00:00.000Z', 'delivery': '',
+        'size_increment': '1', 'tick_size': '0.01', 'base_currency': 'COIN%d' % i, 'underlying': 'COIN%d-USDT' % i,
+        'settlement_currency': 'USDT', 'is_inverse': 'false', 'contract_val_currency': 'COIN%d' % i,
+        'min_size': '1', 'category': '1',
+    } for i in range(0, 3000)]
+
+
+def poloniex_order_books(random):
+    return {'USDT_COIN%d' % i: {
+        'asks': [[number(random), random.uniform(0, 100)] for j in range(0, 100)],
+        'bids': [[number(random), random.uniform(0, 100)] for j in range(0, 100)],
+        'isFrozen': '0', 'seq': 100000000 + i,
+    } for i in range(0, 150)}
+
+
+def payloads(files):
+    if files:
+        for file in files:
+            with open(file, 'rb') as f:
+                yield os.path.basename(file), f.read()
+    else:
+        generator = random.Random(1)
+        for name, function in [['binance fetch_tickers', binance_tickers], ['okex fetch_markets', okex_markets], ['poloniex order books', poloniex_order_books]]:
+            yield name, json.dumps(function(generator), separators=(',', ':')).encode('utf-8')
+
+
+def best(function, rounds):
+    return min(timeit.repeat(function, number=1, repeat=rounds))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('files', nargs='*')
+    args = parser.parse_args()
+    codecs = []
+    for codec_class in json_codec.codecs:
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            pass
+    print('%-24s %8s %8s' % ('payload', 'size', 'text') + ''.join(' %8s' % codec.name for codec in codecs))
+    for name, body in payloads(args.files):
+        timings = [best(lambda: json.loads(body.decode('utf-8')), args.rounds)]
+        for codec in codecs:
+            timings.append(best(lambda: codec.loads(body), args.rounds))
+        print('%-24s %6.1fMB' % (name, len(body) / 1e6) + ''.join(' %6.1fms' % (timing * 1000) for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+"""Drives concurrent REST requests and websocket streams through the async binance client against a local mock server
+
+    python benchmarks/load.py [--requests N] [--concurrency N] [--symbols N] [--rate N] [--duration S]
+                              [--latency S] [--errors 429=0.01,503=0.01] [--url http://host:port]
+
+The mock server, ccxt.async_support.base.mock_server, runs in a child process
+unless --url points to one started separately. The REST part calls
+fetch_order_book, fetch_ticker and create_order from concurrency tasks until
+requests calls are made, the latencies are measured per unified method and
+the phases of the requests are taken from the instrumentation of the
+exchange. The stream part subscribes to the diff depth and trade streams of
+symbols markets, every stream sending rate messages per second, and counts
+the order book and trade events emitted by the exchange for duration
+seconds. The delay is the time from the event time of the server to the
+emit, the clocks are the same."""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base import mock_server  # noqa: E402
+from ccxt.base.instrumentation import LatencyHistogram  # noqa: E402
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float('nan')
+
+
+def free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+async def wait_for(exchange, url, timeout=10):
+    started = time.time()
+    while True:
+        try:
+            async with exchange.session.get(url + '/api/v3/ping') as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        if time.time() - started > timeout:
+            raise RuntimeError('the mock server at ' + url + ' does not answer')
+        await asyncio.sleep(0.1)
+
+
+async def load_markets(exchange, attempts=20):
+    # the server injects its errors into the exchangeInfo request too
+    for attempt in range(0, attempts):
+        try:
+            return await exchange.load_markets()
+        except ccxt.BaseError:
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def rest(exchange, symbols, requests, concurrency):
+    calls = [
+        ['fetch_order_book', lambda symbol: exchange.fetch_order_book(symbol, 20)],
+        ['fetch_ticker', lambda symbol: exchange.fetch_ticker(symbol)],
+        ['create_order', lambda symbol: exchange.create_order(symbol, 'limit', 'buy', 0.01, exchange.markets[symbol]['info']['filters'][0]['minPrice'])],
+    ]
+    latencies = dict((name, []) for name, call in calls)
+    errors = {}
+    counter = [0]
+
+    async def worker():
+        while counter[0] < requests:
+            i = counter[0]
+            counter[0] += 1
+            name, call = calls[i % len(calls)]
+            started = time.perf_counter()
+            try:
+                await call(symbols[i % len(symbols)])
+                latencies[name].append(time.perf_counter() - started)
+            except ccxt.BaseError as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for i in range(0, concurrency)])
+    elapsed = time.perf_counter() - started
+    print('%d requests by %d tasks in %.2fs, %.0f requests/s, errors: %s' % (requests, concurrency, elapsed, requests / elapsed, errors or 'none'))
+    print('%-18s %8s %10s %10s %10s' % ('method', 'calls', 'p50', 'p90', 'p99'))
+    for name, values in latencies.items():
+        print('%-18s %8d %8.2fms %8.2fms %8.2fms' % (name, len(values), percentile(values, 0.5) * 1000, percentile(values, 0.9) * 1000, percentile(values, 0.99) * 1000))
+
+
+def phases(histogram):
+    histograms = histogram.snapshot()[0]
+    print('%-22s %10s %10s %10s %10s %10s' % ('request', 'throttle', 'sign', 'ttfb', 'read', 'parse_json'))
+    for name in ['publicGetDepth', 'publicGetTicker24hr', 'privatePostOrder']:
+        means = []
+        for phase in ['throttle', 'sign', 'ttfb', 'read', 'parse_json']:
+            value = histograms.get(('binance', name, phase))
+            means.append(value['sum'] / value['count'] * 1000 if value and value['count'] else float('nan'))
+        print('%-22s' % name + ''.join(' %8.3fms' % mean for mean in means))
+
+
+async def streams(exchange, symbols, duration):
+    counts = {'ob': 0, 'trade': 0}
+    delays = []
+
+    def received(event, timestamp):
+        counts[event] += 1
+        if timestamp is not None:
+            delays.append(time.time() * 1000 - timestamp)
+
+    exchange.on('ob', lambda symbol, orderbook: received('ob', orderbook['timestamp']))
+    exchange.on('trade', lambda symbol, trade: received('trade', trade['timestamp']))
+    exchange.on('err', lambda error, conxid=None: print('websocket error', conxid, error))
+    await exchange.websocket_subscribe_all([{'event': event, 'symbol': symbol, 'params': {}} for symbol in symbols for event in ['ob', 'trade']])
+    counts['ob'] = counts['trade'] = 0
+    del delays[:]
+    await asyncio.sleep(duration)
+    exchange.websocketCloseAll()
+    total = counts['ob'] + counts['trade']
+    print('%d streams for %.0fs: %d order books and %d trades, %.0f messages/s, delay p50 %.1fms p99 %.1fms' % (
+        len(symbols) * 2, duration, counts['ob'], counts['trade'], total / duration, percentile(delays, 0.5), percentile(delays, 0.99)))
+
+
+async def run(args, url):
+    histogram = LatencyHistogram()
+    exchange = ccxt.binance({
+        'apiKey': 'key',
+        'secret': 'secret',
+        'enableRateLimit': False,
+        'instrumentation': histogram,
+        'timeout': 60000,
+    })
+    mock_server.configure(exchange, url)
+    exchange.open()
+    try:
+        await wait_for(exchange, url)
+        await load_markets(exchange)
+        symbols = sorted(exchange.symbols)[0:args.symbols]
+        if args.requests:
+            await rest(exchange, symbols, args.requests, args.concurrency)
+            phases(histogram)
+        if args.duration:
+            await streams(exchange, symbols, args.duration)
+    finally:
+        await exchange.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--rate', type=float, default=100, help='messages per second of every stream')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of streaming')
+    parser.add_argument('--latency', type=float, default=0, help='seconds added by the server to every REST response')
+    parser.add_argument('--errors', type=mock_server.parse_errors, default={}, help='error probabilities, like 429=0.01,503=0.01,maintenance=0.01')
+    parser.add_argument('--url', help='a mock server started separately')
+    args = parser.parse_args()
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        options = {
+            'symbols': ['COIN%d/USDT' % i for i in range(0, args.symbols)],
+            'latency': args.latency,
+            'errors': args.errors,
+            'messageRate': args.rate,
+            'apiKey': 'key',
+            'secret': 'secret',
+        }
+        server = multiprocessing.Process(target=mock_server.run, args=(options, '127.0.0.1', port), daemon=True)
+        server.start()
+        url = 'http://127.0.0.1:%d' % port
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(run(args, url))
+    finally:
+        loop.close()
+        if server is not None:
+            server.terminate()
+
+
+if __name__ == '__main__':
+    main()
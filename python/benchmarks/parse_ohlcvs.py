@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""Compares parse_ohlcvs returning lists with the numpy ohlcvFormat on binance klines
+
+    python benchmarks/parse_ohlcvs.py [--rounds N] [--candles N]
+
+The klines are generated with the layout of the binance response, the list
+column includes the sort_by(ohlcvs, 0) done by fetch_ohlcv."""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+import ccxt  # noqa: E402
+
+
+def klines(count):
+    generator = random.Random(1)
+    return [[
+        1590000000000 + i * 60000, '%.8f' % generator.uniform(9000, 9100), '%.8f' % generator.uniform(9100, 9200),
+        '%.8f' % generator.uniform(8900, 9000), '%.8f' % generator.uniform(9000, 9100), '%.8f' % generator.uniform(0, 100),
+        1590000059999 + i * 60000, '%.8f' % generator.uniform(0, 1000000), 100 + i, '0', '0', '0',
+    ] for i in range(0, count)]
+
+
+def best(function, rounds):
+    return min(timeit.repeat(function, number=1, repeat=rounds))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--candles', type=int, nargs='*', default=[500, 1000, 100000])
+    args = parser.parse_args()
+    exchange = ccxt.binance()
+    print('%8s %10s %10s' % ('candles', 'list', 'numpy'))
+    for count in args.candles:
+        response = klines(count)
+        timings = []
+        for ohlcv_format in [None, 'numpy']:
+            exchange.ohlcvFormat = ohlcv_format
+            timings.append(best(lambda: exchange.sort_by(exchange.parse_ohlcvs(response, None, '1m'), 0), args.rounds))
+        print('%8d' % count + ''.join(' %8.2fms' % (timing * 1000) for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""Measures how fast the unified methods parse recorded responses, without network access
+
+    python benchmarks/parse_throughput.py record binance kraken [--symbol BTC/USDT] [--fixtures DIR]
+    python benchmarks/parse_throughput.py [--rounds N] [--fixtures DIR] [binance kraken ...]
+
+The record command calls the public unified methods of the exchanges once
+(and fetch_balance with the keys in keys.json) and saves the responses to
+DIR/<exchange>.jsonl.gz. Without it every method is called again rounds times
+on the recorded responses. The per-phase timings are taken from the
+instrumentation of the exchange: parse_json is the decoding of the response
+and parse the work of the unified method after the response, parse_trade,
+parse_order_book and the like. The objects column counts the tickers, trades,
+candles, order book levels, balances and markets returned per second of
+parse_json and parse together."""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+import ccxt  # noqa: E402
+from ccxt.base.instrumentation import Instrumentation  # noqa: E402
+from ccxt.base.recorder import FixtureStore  # noqa: E402
+from ccxt.base.recorder import RecordingSession  # noqa: E402
+from ccxt.base.recorder import ReplaySession  # noqa: E402
+
+methods = [
+    # [has, method, takes a symbol, private]
+    ['fetchMarkets', 'fetch_markets', False, False],
+    ['fetchTicker', 'fetch_ticker', True, False],
+    ['fetchTickers', 'fetch_tickers', False, False],
+    ['fetchOrderBook', 'fetch_order_book', True, False],
+    ['fetchTrades', 'fetch_trades', True, False],
+    ['fetchOHLCV', 'fetch_ohlcv', True, False],
+    ['fetchBalance', 'fetch_balance', False, True],
+]
+
+
+def count(result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if 'bids' in result and 'asks' in result:
+            return len(result['bids']) + len(result['asks'])
+        if 'info' in result and 'total' in result:
+            return len(result['total'])  # a balance
+        if 'symbol' in result:
+            return 1  # a ticker
+        return len(result)
+    return 1
+
+
+class PhaseTotals(Instrumentation):
+
+    def __init__(self):
+        self.timings = {}
+
+    def end(self, timings):
+        for phase in ['parse_json', 'parse']:
+            if phase in timings.timings:
+                self.timings[phase] = self.timings.get(phase, 0) + timings.timings[phase]
+
+
+def keys():
+    for name in ['keys.local.json', 'keys.json']:
+        path = os.path.join(os.path.dirname(root), name)
+        if os.path.exists(path):
+            with open(path) as file:
+                return json.load(file)
+    return {}
+
+
+def record(ids, symbol, fixtures):
+    config = keys()
+    for id in ids:
+        store = FixtureStore(os.path.join(fixtures, id + '.jsonl.gz'))
+        store.entries = {}
+        exchange = getattr(ccxt, id)(ccxt.Exchange.extend({'enableRateLimit': True, 'session': RecordingSession(store)}, config.get(id, {})))
+        exchange.load_markets()
+        recorded = []
+        for has, method, symbolic, private in methods:
+            if not exchange.has[has] or (private and not exchange.apiKey):
+                continue
+            try:
+                getattr(exchange, method)(*([symbol] if symbolic else []))
+                recorded.append(method)
+            except ccxt.BaseError as e:
+                print(id, method, type(e).__name__, str(e)[0:100])
+        store.meta = {'symbol': symbol, 'methods': recorded, 'version': ccxt.__version__}
+        store.save()
+        print(id, 'recorded', ', '.join(recorded))
+
+
+def replay(ids, rounds, fixtures):
+    print('%-12s %-18s %10s %12s %10s %14s' % ('exchange', 'method', 'calls/s', 'parse_json', 'parse', 'objects/s'))
+    for id in ids:
+        store = FixtureStore(os.path.join(fixtures, id + '.jsonl.gz'))
+        symbol = store.meta['symbol']
+        config = {'session': ReplaySession(store)}
+        if 'fetch_balance' in store.meta['methods']:
+            # the requests are signed with other credentials, the signatures are not compared
+            config.update({'apiKey': 'key', 'secret': 'secret', 'uid': 'uid', 'password': 'password'})
+        exchange = getattr(ccxt, id)(config)
+        exchange.load_markets()
+        symbolic = dict((method[1], method[2]) for method in methods)
+        for method in store.meta['methods']:
+            arguments = [symbol] if symbolic[method] else []
+            function = getattr(exchange, method)
+            objects = count(function(*arguments))
+            totals = PhaseTotals()
+            exchange.set_instrumentation(totals)
+            elapsed = timeit.timeit(lambda: getattr(exchange, method)(*arguments), number=rounds)
+            exchange.set_instrumentation(None)
+            parse_json = totals.timings.get('parse_json', 0) / rounds
+            parse = totals.timings.get('parse', 0) / rounds
+            print('%-12s %-18s %10.1f %10.3fms %8.3fms %14.0f' % (id, method, rounds / elapsed, parse_json * 1000, parse * 1000, objects / (parse_json + parse)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--symbol', default='BTC/USDT')
+    parser.add_argument('--fixtures', default=os.path.join(root, 'benchmarks', 'fixtures'))
+    parser.add_argument('exchanges', nargs='*')
+    args = parser.parse_args()
+    if args.exchanges[0:1] == ['record']:
+        record(args.exchanges[1:], args.symbol, args.fixtures)
+    else:
+        ids = args.exchanges or sorted(name.split('.')[0] for name in os.listdir(args.fixtures) if name.endswith('.jsonl.gz'))
+        replay(ids, args.rounds, args.fixtures)
+
+
+if __name__ == '__main__':
+    main()
@@ -27,6 +27,7 @@ __version__ = '1.27.18'
 # ----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange                     # noqa: F401
+from ccxt.base.lazy_module import load_exchanges
 
 from ccxt.base.decimal_to_precision import decimal_to_precision  # noqa: F401
 from ccxt.base.decimal_to_precision import TRUNCATE              # noqa: F401
@@ -68,126 +69,6 @@ from ccxt.base.errors import InvalidNonce                   # noqa: F401
 from ccxt.base.errors import RequestTimeout                 # noqa: F401
 from ccxt.base.errors import error_hierarchy                # noqa: F401
 
-from ccxt._1btcxe import _1btcxe                            # noqa: F401
-from ccxt.acx import acx                                    # noqa: F401
-from ccxt.adara import adara                                # noqa: F401
-from ccxt.anxpro import anxpro                              # noqa: F401
-from ccxt.aofex import aofex                                # noqa: F401
-from ccxt.bcex import bcex                                  # noqa: F401
-from ccxt.bequant import bequant                            # noqa: F401
-from ccxt.bibox import bibox                                # noqa: F401
-from ccxt.bigone import bigone                              # noqa: F401
-from ccxt.binance import binance                            # noqa: F401
-from ccxt.binanceje import binanceje                        # noqa: F401
-from ccxt.binanceus import binanceus                        # noqa: F401
-from ccxt.bit2c import bit2c                                # noqa: F401
-from ccxt.bitbank import bitbank                            # noqa: F401
-from ccxt.bitbay import bitbay                              # noqa: F401
-from ccxt.bitfinex import bitfinex                          # noqa: F401
-from ccxt.bitfinex2 import bitfinex2                        # noqa: F401
-from ccxt.bitflyer import bitflyer                          # noqa: F401
-from ccxt.bitforex import bitforex                          # noqa: F401
-from ccxt.bithumb import bithumb                            # noqa: F401
-from ccxt.bitkk import bitkk                                # noqa: F401
-from ccxt.bitmart import bitmart                            # noqa: F401
-from ccxt.bitmax import bitmax                              # noqa: F401
-from ccxt.bitmex import bitmex                              # noqa: F401
-from ccxt.bitso import bitso                                # noqa: F401
-from ccxt.bitstamp import bitstamp                          # noqa: F401
-from ccxt.bitstamp1 import bitstamp1                        # noqa: F401
-from ccxt.bittrex import bittrex                            # noqa: F401
-from ccxt.bitz import bitz                                  # noqa: F401
-from ccxt.bl3p import bl3p                                  # noqa: F401
-from ccxt.bleutrade import bleutrade                        # noqa: F401
-from ccxt.braziliex import braziliex                        # noqa: F401
-from ccxt.btcalpha import btcalpha                          # noqa: F401
-from ccxt.btcbox import btcbox                              # noqa: F401
-from ccxt.btcmarkets import btcmarkets                      # noqa: F401
-from ccxt.btctradeim import btctradeim                      # noqa: F401
-from ccxt.btctradeua import btctradeua                      # noqa: F401
-from ccxt.btcturk import btcturk                            # noqa: F401
-from ccxt.buda import buda                                  # noqa: F401
-from ccxt.bw import bw                                      # noqa: F401
-from ccxt.bybit import bybit                                # noqa: F401
-from ccxt.bytetrade import bytetrade                        # noqa: F401
-from ccxt.cex import cex                                    # noqa: F401
-from ccxt.chilebit import chilebit                          # noqa: F401
-from ccxt.coinbase import coinbase                          # noqa: F401
-from ccxt.coinbaseprime import coinbaseprime                # noqa: F401
-from ccxt.coinbasepro import coinbasepro                    # noqa: F401
-from ccxt.coincheck import coincheck                        # noqa: F401
-from ccxt.coinegg import coinegg                            # noqa: F401
-from ccxt.coinex import coinex                              # noqa: F401
-from ccxt.coinfalcon import coinfalcon                      # noqa: F401
-from ccxt.coinfloor import coinfloor                        # noqa: F401
-from ccxt.coingi import coingi                              # noqa: F401
-from ccxt.coinmarketcap import coinmarketcap                # noqa: F401
-from ccxt.coinmate import coinmate                          # noqa: F401
-from ccxt.coinone import coinone                            # noqa: F401
-from ccxt.coinspot import coinspot                          # noqa: F401
-from ccxt.coolcoin import coolcoin                          # noqa: F401
-from ccxt.coss import coss                                  # noqa: F401
-from ccxt.crex24 import crex24                              # noqa: F401
-from ccxt.deribit import deribit                            # noqa: F401
-from ccxt.digifinex import digifinex                        # noqa: F401
-from ccxt.dsx import dsx                                    # noqa: F401
-from ccxt.exmo import exmo                                  # noqa: F401
-from ccxt.exx import exx                                    # noqa: F401
-from ccxt.fcoin import fcoin                                # noqa: F401
-from ccxt.fcoinjp import fcoinjp                            # noqa: F401
-from ccxt.flowbtc import flowbtc                            # noqa: F401
-from ccxt.foxbit import foxbit                              # noqa: F401
-from ccxt.ftx import ftx                                    # noqa: F401
-from ccxt.fybse import fybse                                # noqa: F401
-from ccxt.gateio import gateio                              # noqa: F401
-from ccxt.gemini import gemini                              # noqa: F401
-from ccxt.hitbtc import hitbtc                              # noqa: F401
-from ccxt.hollaex import hollaex                            # noqa: F401
-from ccxt.huobipro import huobipro                          # noqa: F401
-from ccxt.huobiru import huobiru                            # noqa: F401
-from ccxt.ice3x import ice3x                                # noqa: F401
-from ccxt.idex import idex                                  # noqa: F401
-from ccxt.independentreserve import independentreserve      # noqa: F401
-from ccxt.indodax import indodax                            # noqa: F401
-from ccxt.itbit import itbit                                # noqa: F401
-from ccxt.kkex import kkex                                  # noqa: F401
-from ccxt.kraken import kraken                              # noqa: F401
-from ccxt.kucoin import kucoin                              # noqa: F401
-from ccxt.kuna import kuna                                  # noqa: F401
-from ccxt.lakebtc import lakebtc                            # noqa: F401
-from ccxt.latoken import latoken                            # noqa: F401
-from ccxt.lbank import lbank                                # noqa: F401
-from ccxt.liquid import liquid                              # noqa: F401
-from ccxt.livecoin import livecoin                          # noqa: F401
-from ccxt.luno import luno                                  # noqa: F401
-from ccxt.lykke import lykke                                # noqa: F401
-from ccxt.mercado import mercado                            # noqa: F401
-from ccxt.mixcoins import mixcoins                          # noqa: F401
-from ccxt.oceanex import oceanex                            # noqa: F401
-from ccxt.okcoin import okcoin                              # noqa: F401
-from ccxt.okex import okex                                  # noqa: F401
-from ccxt.paymium import paymium                            # noqa: F401
-from ccxt.poloniex import poloniex                          # noqa: F401
-from ccxt.rightbtc import rightbtc                          # noqa: F401
-from ccxt.southxchange import southxchange                  # noqa: F401
-from ccxt.stex import stex                                  # noqa: F401
-from ccxt.stronghold import stronghold                      # noqa: F401
-from ccxt.surbitcoin import surbitcoin                      # noqa: F401
-from ccxt.theocean import theocean                          # noqa: F401
-from ccxt.therock import therock                            # noqa: F401
-from ccxt.tidebit import tidebit                            # noqa: F401
-from ccxt.tidex import tidex                                # noqa: F401
-from ccxt.timex import timex                                # noqa: F401
-from ccxt.topq import topq                                  # noqa: F401
-from ccxt.upbit import upbit                                # noqa: F401
-from ccxt.vaultoro import vaultoro                          # noqa: F401
-from ccxt.vbtc import vbtc                                  # noqa: F401
-from ccxt.whitebit import whitebit                          # noqa: F401
-from ccxt.xbtce import xbtce                                # noqa: F401
-from ccxt.yobit import yobit                                # noqa: F401
-from ccxt.zaif import zaif                                  # noqa: F401
-from ccxt.zb import zb                                      # noqa: F401
-
 exchanges = [
     '_1btcxe',
     'acx',
@@ -317,3 +198,8 @@ base = [
 ]
 
 __all__ = base + errors.__all__ + exchanges
+
+# -----------------------------------------------------------------------------
+
+# the exchange classes are imported on first access, ccxt.binance imports the binance module
+load_exchanges(__name__)
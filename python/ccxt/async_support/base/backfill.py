@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import os
+
+from ccxt.async_support.base.paginator import Paginator
+from ccxt.async_support.base.paginator import paginations
+from ccxt.base.ohlcv import ohlcv_array
+
+__all__ = [
+    'OHLCVBackfill',
+]
+
+
+class OHLCVBackfill(object):
+    """Fetches the candles of [since, until) in windows of one page, several windows at once
+
+    The windows are fetched with up to concurrency requests in flight, every
+    request goes through the rate limiter of the exchange if enableRateLimit
+    is on. Without it the windows are fetched one at a time unless an explicit
+    concurrency is given. A window is fetched with several requests if the
+    exchange returns fewer candles than the limit. The candles are merged by timestamp into candles, gaps lists
+    the [start, end) ranges without candles, exchanges leave out the candles
+    of periods without trades and of downtimes. With the numpy ohlcvFormat
+    the windows are kept as lists and candles is a structured array.
+
+    With a checkpoint file every finished window is appended to it as a line
+    of JSON, a backfill started again with the same file, symbol, timeframe,
+    since and limit only fetches the windows that are missing from it, the
+    last window is fetched again if until has moved. The restored windows
+    are written to a new file that replaces the checkpoint, an interruption
+    never loses them. If some windows fail the others are still fetched and
+    saved before the first error is raised."""
+
+    def __init__(self, exchange, symbol, timeframe='1m', since=None, until=None, limit=None, params={}, checkpoint=None, concurrency=None):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.duration = exchange.parse_timeframe(timeframe) * 1000
+        self.since = since - since % self.duration
+        self.until = until if until is not None else exchange.milliseconds()
+        pagination = Paginator.lookup(exchange.safe_value(exchange.options, 'paginate', {}), 'fetchOHLCV')
+        pagination = pagination or Paginator.lookup(paginations.get(exchange.id, {}), 'fetchOHLCV') or {}
+        self.limit = limit or pagination.get('limit') or 100
+        self.params = params
+        self.checkpoint = checkpoint
+        if concurrency is None:
+            # without the rate limiter concurrent windows would burst past the limits of the exchange
+            concurrency = 8 if exchange.enableRateLimit else 1
+        self.concurrency = concurrency
+        self.candles = []
+        self.gaps = []
+        self.fetched = 0  # windows fetched by this run, the others were read from the checkpoint
+
+    def windows(self):
+        span = self.limit * self.duration
+        return [[start, min(start + span, self.until)] for start in range(self.since, self.until, span)]
+
+    def header(self):
+        return {'symbol': self.symbol, 'timeframe': self.timeframe, 'since': self.since, 'limit': self.limit}
+
+    def restore(self):
+        """Returns the [end, candles] of the windows in the checkpoint by the start of the window"""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return {}
+        windows = {}
+        with open(self.checkpoint) as file:
+            lines = file.read().splitlines()
+        try:
+            if json.loads(lines[0]) != self.header():
+                return {}  # the checkpoint of another backfill
+        except (IndexError, ValueError):
+            return {}
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interruption
+            windows[entry['window']] = [entry['end'], entry['candles']]
+        return windows
+
+    def save(self, file, start, end, candles):
+        file.write(json.dumps({'window': start, 'end': end, 'candles': candles}, separators=(',', ':')) + '\n')
+        file.flush()
+
+    async def fetch_window(self, start, end):
+        candles = []
+        cursor = start
+        while cursor < end:
+            page = await self.exchange.fetch_ohlcv(self.symbol, self.timeframe, cursor, self.limit, self.params)
+            if hasattr(page, 'dtype'):  # candles in the numpy ohlcvFormat
+                page = [list(candle) for candle in page.tolist()]
+            page = [candle for candle in page if cursor <= candle[0] < end]
+            if not page:
+                break
+            candles.extend(page)
+            cursor = page[-1][0] + self.duration
+        return candles
+
+    async def run(self):
+        restored = self.restore()
+        windows = {}
+        missing = []
+        for start, end in self.windows():
+            if start in restored and restored[start][0] == end:
+                windows[start] = restored[start][1]
+            else:
+                missing.append([start, end])
+        file = None
+        if self.checkpoint:
+            # the checkpoint is written again without the broken and outdated lines
+            temporary = self.checkpoint + '.' + str(os.getpid()) + '.tmp'
+            with open(temporary, 'w') as file:
+                file.write(json.dumps(self.header()) + '\n')
+                for start in sorted(windows):
+                    self.save(file, start, restored[start][0], windows[start])
+            rename = getattr(os, 'replace', os.rename)  # os.replace is Python 3.3+
+            rename(temporary, self.checkpoint)
+            file = open(self.checkpoint, 'a')
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(start, end):
+            async with semaphore:
+                candles = await self.fetch_window(start, end)
+            windows[start] = candles
+            self.fetched += 1
+            if file:
+                self.save(file, start, end, candles)
+
+        try:
+            # the windows that do not fail are fetched and saved before the first error is raised
+            results = await asyncio.gather(*[fetch(start, end) for start, end in missing], return_exceptions=True)
+        finally:
+            if file:
+                file.close()
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+        merged = {}
+        for start in sorted(windows):
+            for candle in windows[start]:
+                merged[candle[0]] = candle
+        self.candles = [merged[timestamp] for timestamp in sorted(merged)]
+        self.gaps = self.find_gaps()
+        if self.exchange.ohlcvFormat == 'numpy':
+            self.candles = ohlcv_array(self.candles)
+        return self.candles
+
+    def find_gaps(self):
+        gaps = []
+        expected = self.since
+        for candle in self.candles:
+            if candle[0] > expected:
+                gaps.append([expected, candle[0]])
+            expected = candle[0] + self.duration
+        if expected < self.until:
+            gaps.append([expected, self.until])
+        return gaps
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import ssl
+
+import aiohttp
+
+__all__ = [
+    'ConnectionPool',
+    'acquire_connection_pool',
+    'ssl_context',
+]
+
+# TLS contexts by CA file, loading the certificates takes several milliseconds
+contexts = {}
+
+# connection pools in use by key, see acquire_connection_pool
+pools = {}
+
+
+def ssl_context(cafile):
+    """Returns one shared TLS context per CA file"""
+    context = contexts.get(cafile)
+    if context is None:
+        context = contexts[cafile] = ssl.create_default_context(cafile=cafile)
+    return context
+
+
+class ConnectionPool(object):
+    """A TCPConnector shared by the sessions of several exchange instances
+
+    Every instance that acquires the pool has to release it, the connector
+    is closed when the last one does."""
+
+    def __init__(self, key, connector):
+        self.key = key
+        self.connector = connector
+        self.references = 0
+
+    async def release(self):
+        self.references -= 1
+        if self.references == 0:
+            if pools.get(self.key) is self:
+                del pools[self.key]
+            await self.connector.close()
+
+
+def acquire_connection_pool(loop, ssl, options=None):
+    """Returns the pool for the loop, TLS context and options, creates it on first use
+
+    The options are passed to aiohttp.TCPConnector: limit, limit_per_host,
+    keepalive_timeout, ttl_dns_cache, use_dns_cache and so on. The name
+    option is not, instances only share a pool if their names are equal,
+    which makes it possible to keep separate pools per exchange or host."""
+    options = dict(options or {})
+    key = (loop, ssl, tuple(sorted(options.items())))
+    pool = pools.get(key)
+    if pool is None or pool.connector.closed:
+        options.pop('name', None)
+        connector = aiohttp.TCPConnector(ssl=ssl, loop=loop, **options)
+        pool = pools[key] = ConnectionPool(key, connector)
+    pool.references += 1
+    return pool
@@ -8,10 +8,10 @@ __version__ = '1.27.18'
 
 import asyncio
 import concurrent
+import copy
 import socket
 import certifi
 import aiohttp
-import ssl
 import sys
 import yarl
 import json
@@ -19,6 +19,10 @@ import json
 # -----------------------------------------------------------------------------
 
 from ccxt.async_support.base.throttle import throttle
+from ccxt.async_support.base.connection_pool import acquire_connection_pool
+from ccxt.async_support.base.connection_pool import ssl_context
+from ccxt.async_support.base.paginator import Paginator
+from ccxt.async_support.base.backfill import OHLCVBackfill
 
 # -----------------------------------------------------------------------------
 
@@ -27,14 +31,17 @@ from ccxt.base.errors import ExchangeNotAvailable
 from ccxt.base.errors import RequestTimeout
 from ccxt.base.errors import NotSupported
 from ccxt.base.errors import NetworkError
+from ccxt.base.errors import ArgumentsRequired
 
 # -----------------------------------------------------------------------------
 
 from ccxt.base.exchange import Exchange as BaseExchange
+from ccxt.base.instrumentation import clock
+from ccxt.base.order_book import OrderBook
+from ccxt.base.json_codec import get_json_codec
 
 # -----------------------------------------------------------------------------
 
-from ccxt.async_support.websocket.websocket_connection import WebsocketConnection
 from pyee import EventEmitter
 
 # -----------------------------------------------------------------------------
@@ -48,8 +55,23 @@ __all__ = [
 # -----------------------------------------------------------------------------
 
 
+def current_task(loop):
+    if hasattr(asyncio, 'current_task'):  # Python 3.7+
+        return asyncio.current_task(loop)
+    return asyncio.Task.current_task(loop)
+
+# -----------------------------------------------------------------------------
+
+
 class Exchange(BaseExchange, EventEmitter):
 
+    connectionPool = None  # True or TCPConnector options to share the connections with other instances
+    acquired_pool = None
+    # identical concurrent requests to these api types share one response,
+    # True for the api types with public in their name, or a list of them,
+    # private requests are never coalesced
+    coalesceRequests = False
+
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
             self.asyncio_loop = config['asyncio_loop']
@@ -60,18 +82,24 @@ class Exchange(BaseExchange, EventEmitter):
         self.wsconf = {}
         self.websocketContexts = {}
         self.websocketDelayedConnections = {}
+        self.websocketShards = {}  # the connections of the sharded templates by the id of the first one
         self.wsproxy = None
         self.cafile = config.get('cafile', certifi.where())
         super(Exchange, self).__init__(config)
         super(EventEmitter, self).__init__()
-        self.init_rest_rate_limiter()
         self.markets_loading = None
         self.reloading_markets = False
+        self.inflight_requests = {}
+        self.revalidating_responses = {}
+        self.coalescedRequests = {'hits': 0, 'misses': 0}
+        self.instrumented_call_stacks = {}
 
     def init_rest_rate_limiter(self):
         self.throttle = throttle(self.extend({
             'loop': self.asyncio_loop,
-        }, self.tokenBucket))
+            'rateLimit': self.rateLimit,
+        }, self.tokenBucket), self.tokenBuckets)
+        self.init_rate_limit_feedback(self.asyncio_loop.time)
 
     def __del__(self):
         if self.session is not None:
@@ -88,26 +116,169 @@ class Exchange(BaseExchange, EventEmitter):
 
     def open(self):
         if self.own_session and self.session is None:
-            # Create our SSL context object with our CA cert file
-            context = ssl.create_default_context(cafile=self.cafile) if self.verify else self.verify
-            # Pass this SSL context to aiohttp and create a TCPConnector
-            connector = aiohttp.TCPConnector(ssl=context, loop=self.asyncio_loop)
+            # Create our SSL context object with our CA cert file, reused by all instances
+            context = ssl_context(self.cafile) if self.verify else self.verify
+            if self.connectionPool:
+                # every instance has its own session and cookies, the connections are shared
+                options = {} if self.connectionPool is True else self.connectionPool
+                self.acquired_pool = acquire_connection_pool(self.asyncio_loop, context, options)
+                connector = self.acquired_pool.connector
+            else:
+                # Pass this SSL context to aiohttp and create a TCPConnector
+                connector = aiohttp.TCPConnector(ssl=context, loop=self.asyncio_loop)
             self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector,
-                                                 trust_env=self.aiohttp_trust_env)
+                                                 connector_owner=self.acquired_pool is None,
+                                                 trust_env=self.aiohttp_trust_env,
+                                                 trace_configs=[self.trace_config()] if self.instrumentation else None)
 
     async def close(self):
+        for task in list(self.revalidating_responses.values()):
+            task.cancel()
+        await self._websocket_close_sessions()
         if self.session is not None:
             if self.own_session:
                 await self.session.close()
+                if self.acquired_pool is not None:
+                    acquired_pool, self.acquired_pool = self.acquired_pool, None
+                    await acquired_pool.release()
             self.session = None
 
+    async def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        """Exchange.request is the entry point for all generated methods"""
+        ttl = self.response_cache_ttl(path, api, method) if self.responseCache else None
+        if ttl is None:
+            return await self.fetch2(path, api, method, params, headers, body)
+        cache = self.cached_responses()
+        key = self.response_cache_key(path, api, method, params)
+        entry = cache.get(key)
+        if entry is not None:
+            age = self.milliseconds() - entry[0]
+            if age < ttl:
+                return entry[1]
+            if age < ttl + self.responseCache.get('staleWhileRevalidate', 0):
+                # the stale response is returned right away and refreshed in the background
+                if key not in self.revalidating_responses:
+                    task = asyncio.ensure_future(self.fetch_cached_response(cache, key, path, api, method, params, headers, body))
+                    self.revalidating_responses[key] = task
+                    task.add_done_callback(lambda task: self.revalidated_response(key, task))
+                return entry[1]
+        return await self.fetch_cached_response(cache, key, path, api, method, params, headers, body)
+
+    async def fetch_cached_response(self, cache, key, path, api, method, params, headers, body):
+        response = await self.fetch2(path, api, method, params, headers, body)
+        cache.set(key, response, self.milliseconds())
+        return response
+
+    def revalidated_response(self, key, task):
+        del self.revalidating_responses[key]
+        if not task.cancelled() and task.exception() is not None:
+            # the next call after the stale period fetches the response again and raises the error
+            self.logger.debug('%s revalidating %s failed: %r', self.id, key, task.exception())
+
     async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """A better wrapper over request for deferred signing"""
+        if self.coalesceRequests and self.is_coalesced_api(api):
+            return await self.fetch_coalesced(path, api, method, params, headers, body)
+        timings = self.start_request(path, api, method) if self.instrumentation else None
         if self.enableRateLimit:
-            await self.throttle(self.rateLimit)
+            await self.throttle(self.rateLimit, self.calculate_rate_limiter_cost(api, method, path, params))
+        if timings is not None:
+            timings.lap('throttle')
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        if timings is None:
+            return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        timings.lap('sign')
+        return await self.fetch_instrumented(request, timings)
+
+    async def fetch_instrumented(self, request, timings):
+        # fetch takes the timings before it awaits anything, concurrent requests do not see them
+        self.request_timings = timings
+        try:
+            response = await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        except Exception as e:
+            self.end_request(timings, e)
+            raise
+        self.end_request(timings)
+        return response
+
+    @property
+    def instrumented_calls(self):
+        return self.instrumented_call_stacks.get(current_task(self.asyncio_loop))
+
+    @instrumented_calls.setter
+    def instrumented_calls(self, calls):
+        # the unified methods are called concurrently, every task has its own stack of calls
+        task = current_task(self.asyncio_loop)
+        if calls:
+            self.instrumented_call_stacks[task] = calls
+        else:
+            self.instrumented_call_stacks.pop(task, None)
+
+    def instrumented_method(self, name, method):
+        if not asyncio.iscoroutinefunction(method):
+            return super(Exchange, self).instrumented_method(name, method)
+
+        async def call(*args, **kwargs):
+            timings = self.start_call(name)
+            try:
+                result = await method(*args, **kwargs)
+            except Exception as e:
+                self.end_call(timings, e)
+                raise
+            self.end_call(timings)
+            return result
+        return call
+
+    @staticmethod
+    def trace_config():
+        """Measures the connect phase of the instrumented requests that open a new connection"""
+        async def on_connection_create_start(session, context, params):
+            context.connect_started = clock()
+
+        async def on_connection_create_end(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx.timings['connect'] = clock() - context.connect_started
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+    def is_coalesced_api(self, api):
+        # private requests are signed with a nonce or a timestamp, they never match and
+        # their signature could expire while they wait for the throttle
+        if not self.is_public_api(api):
+            return False
+        return (self.coalesceRequests is True) or (api in self.coalesceRequests)
+
+    async def fetch_coalesced(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        """Sends the request unless an identical one is in flight, every caller gets a copy of the decoded response"""
+        # only public requests are coalesced, they are signed before they are throttled
+        request = self.sign(path, api, method, params, headers, body)
+        key = (request['method'], request['url'], request['body'])
+        task = self.inflight_requests.get(key)
+        if task is None:
+            self.coalescedRequests['misses'] += 1
+            timings = self.start_request(path, api, method) if self.instrumentation else None
+            task = asyncio.ensure_future(self.fetch_throttled(request, self.calculate_rate_limiter_cost(api, method, path, params), timings))
+            self.inflight_requests[key] = task
+            task.add_done_callback(lambda task: self.inflight_requests.pop(key, None))
+        else:
+            self.coalescedRequests['hits'] += 1
+        # a cancelled caller does not cancel the request of the others
+        response = await asyncio.shield(task)
+        # the exchanges modify the raw responses while parsing them
+        return copy.deepcopy(response)
+
+    async def fetch_throttled(self, request, cost, timings=None):
+        if self.enableRateLimit:
+            await self.throttle(self.rateLimit, cost)
+        self.lastRestRequestTimestamp = self.milliseconds()
+        if timings is None:
+            return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        timings.lap('throttle')
+        return await self.fetch_instrumented(request, timings)
 
     async def fetch(self, url, method='GET', headers=None, body=None):
         """Perform a HTTP request and return decoded JSON data"""
@@ -120,6 +291,11 @@ class Exchange(BaseExchange, EventEmitter):
 
         request_body = body
         encoded_body = body.encode() if body else None
+        timings = self.request_timings if self.instrumentation else None
+        if timings is not None:
+            self.request_timings = None
+            timings.url = url
+            timings.bytes_sent = len(encoded_body) if encoded_body else 0
         self.open()
         session_method = getattr(self.session, method.lower())
 
@@ -132,12 +308,25 @@ class Exchange(BaseExchange, EventEmitter):
                                       data=encoded_body,
                                       headers=request_headers,
                                       timeout=(self.timeout / 1000),
-                                      proxy=self.aiohttp_proxy) as response:
-                http_response = await response.text()
+                                      proxy=self.aiohttp_proxy,
+                                      trace_request_ctx=timings) as response:
+                if timings is not None:
+                    timings.lap('ttfb')
+                http_body = await response.read()
                 http_status_code = response.status
                 http_status_text = response.reason
-                json_response = self.parse_json(http_response)
+                if timings is not None:
+                    timings.lap('read')
+                    timings.status = http_status_code
+                    timings.bytes_received = len(http_body)
+                # JSON is decoded from the bytes, response.text() guesses the charset when the headers do not specify it
+                json_response = self.parse_json(http_body)
+                http_response = await response.text() if json_response is None else http_body.decode(response.charset or 'utf-8', 'replace')
+                if timings is not None:
+                    timings.lap('parse_json')
                 headers = response.headers
+                if self.rateLimitFeedback:
+                    self.rateLimitFeedback.update(headers, self.milliseconds())
                 if self.enableLastHttpResponse:
                     self.last_http_response = http_response
                 if self.enableLastResponseHeaders:
@@ -164,6 +353,8 @@ class Exchange(BaseExchange, EventEmitter):
                            request_headers, request_body)
         self.handle_rest_errors(http_status_code, http_status_text, http_response, url, method)
         self.handle_rest_response(http_response, json_response, url, method)
+        if timings is not None:
+            timings.lap('handle_errors')
         if json_response is not None:
             return json_response
         if self.is_text_response(headers):
@@ -176,11 +367,18 @@ class Exchange(BaseExchange, EventEmitter):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+            if self.marketsCache is not None:
+                markets = self.load_markets_from_cache()
+                if markets:
+                    return markets
         currencies = None
         if self.has['fetchCurrencies']:
             currencies = await self.fetch_currencies()
         markets = await self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+        result = self.set_markets(markets, currencies)
+        if self.marketsCache is not None:
+            self.save_markets_cache()
+        return result
 
     async def load_markets(self, reload=False, params={}):
         if (reload and not self.reloading_markets) or not self.markets_loading:
@@ -197,6 +395,30 @@ class Exchange(BaseExchange, EventEmitter):
         self.reloading_markets = False
         return result
 
+    def paginate(self, method, symbol=None, since=None, limit=None, params={}, until=None, pagination=None, **arguments):
+        """Iterates over all the objects of a fetch method, requesting them page by page
+
+            async for trade in exchange.paginate('fetch_my_trades', 'BTC/USDT', since):
+                print(trade)
+
+        The first argument of the fetch method is passed in symbol, a currency
+        code for fetch_ledger, other arguments are passed by keyword, like the
+        timeframe of fetch_ohlcv. The pagination style of the exchange is taken
+        from ccxt.async_support.base.paginator.paginations and can be overridden
+        with exchange.options['paginate'] or the pagination argument."""
+        return Paginator(self, method, symbol, since, limit, params, until, pagination, arguments)
+
+    async def backfill_ohlcv(self, symbol, timeframe='1m', since=None, until=None, limit=None, params={}, checkpoint=None, concurrency=None):
+        """Fetches the candles from since to until concurrently, returns an OHLCVBackfill with the candles and gaps
+
+            backfill = await exchange.backfill_ohlcv('BTC/USDT', '1m', since, checkpoint='btc-usdt-1m.jsonl')
+            print(len(backfill.candles), backfill.gaps)"""
+        if since is None:
+            raise ArgumentsRequired(self.id + ' backfill_ohlcv requires a since argument')
+        backfill = OHLCVBackfill(self, symbol, timeframe, since, until, limit, params, checkpoint, concurrency)
+        await backfill.run()
+        return backfill
+
     async def fetch_fees(self):
         trading = {}
         funding = {}
@@ -425,30 +647,160 @@ class Exchange(BaseExchange, EventEmitter):
                (symbol in self.websocketContexts[conxid]['events'][event]) and \
                self.websocketContexts[conxid]['events'][event][symbol]['subscribing']
 
-    def _websocketGetConxid4Event(self, event, symbol):
+    def _websocketGetConxid4Event(self, event, symbol, params={}, subscribe=True):
         eventConf = self.safe_value(self.wsconf['events'], event)
         conxParam = self.safe_value(eventConf, 'conx-param', {
             'id': '{id}'
         })
+        conxid = self.implode_params(conxParam['id'], {
+            'event': event,
+            'symbol': symbol,
+            'id': eventConf['conx-tpl']
+        })
+        conx_tpl = self.safe_value(self.wsconf['conx-tpls'], eventConf['conx-tpl'], {})
+        if (self.safe_string(conx_tpl, 'type') == 'ws-s') and (('maxStreams' in conx_tpl) or ('messageRate' in conx_tpl)):
+            conxid = self._websocket_shard(conxid, eventConf['conx-tpl'], event, symbol, params, subscribe)
         return {
-            'conxid': self.implode_params(conxParam['id'], {
-                'event': event,
-                'symbol': symbol,
-                'id': eventConf['conx-tpl']
-            }),
+            'conxid': conxid,
             'conxtpl': eventConf['conx-tpl']
         }
 
-    def _websocket_get_action_for_event(self, conxid, event, symbol, subscription=True, subscription_params={}):
-        # if subscription and still subscribed no action returned
-        isSubscribed = self._contextIsSubscribed(conxid, event, symbol)
-        isSubscribing = self._contextIsSubscribing(conxid, event, symbol)
-        if (subscription and (isSubscribed or isSubscribing)):
-            return None
-        # if unsubscription and no subscribed and no subscribing no action returned
-        if (not subscription and ((not isSubscribed and not isSubscribing))):
-            return None
-        # get conexion type for event
+    def _websocket_stream_rate(self, event, symbol, params={}):
+        """The expected messages per second of a stream, counted against the messageRate of the connections"""
+        return self.safe_float(self.wsconf['events'][event], 'rate', 1.0)
+
+    def _websocket_shard_load(self, conxid):
+        streams = self._websocketContextGetSubscribedEventSymbols(conxid) if (conxid in self.websocketContexts) else []
+        rate = 0.0
+        for stream in streams:
+            rate += self._websocket_stream_rate(stream['event'], stream['symbol'], stream['params'])
+        return [conxid, len(streams), rate]
+
+    def _websocket_shard_fits(self, conx_tpl, load, rate):
+        maxStreams = self.safe_integer(conx_tpl, 'maxStreams')
+        messageRate = self.safe_float(conx_tpl, 'messageRate')
+        if (maxStreams is not None) and (load[1] >= maxStreams):
+            return False
+        # a stream over the budget on its own gets a connection of its own
+        return (messageRate is None) or (load[1] == 0) or (load[2] + rate <= messageRate)
+
+    def _websocket_shard(self, conxid, conxtpl, event, symbol, params={}, subscribe=True):
+        """The connection of a stream of a ws-s template with maxStreams or messageRate
+
+        The streams of the template are spread over several connections, the
+        first one is conxid, the others conxid-1, conxid-2 and so on. A new
+        stream goes to the least loaded connection with room for it, a new
+        connection is added when none has room."""
+        shards = self.websocketShards.setdefault(conxid, [conxid])
+        for shard in shards:
+            if (shard in self.websocketContexts) and (self._contextIsSubscribed(shard, event, symbol) or self._contextIsSubscribing(shard, event, symbol)):
+                return shard
+        if not subscribe:
+            return conxid
+        conx_tpl = self.wsconf['conx-tpls'][conxtpl]
+        rate = self._websocket_stream_rate(event, symbol, params)
+        best = None
+        for shard in shards:
+            load = self._websocket_shard_load(shard)
+            if self._websocket_shard_fits(conx_tpl, load, rate) and ((best is None) or (load[2], load[1]) < (best[2], best[1])):
+                best = load
+        if best is not None:
+            return best[0]
+        i = 1
+        while (conxid + '-' + str(i)) in shards:
+            i += 1
+        shards.append(conxid + '-' + str(i))
+        return shards[-1]
+
+    async def _websocket_rebalance(self):
+        """Moves the streams of the last connection of a sharded template to the others when they fit there
+
+        The connections taking the streams are reconnected before the last
+        one is closed, the streams do not stop and keep their context."""
+        for conxid in list(self.websocketShards.keys()):
+            shards = self.websocketShards[conxid]
+            for shard in shards[1:]:
+                if self._websocket_shard_load(shard)[1] == 0:
+                    shards.remove(shard)
+                    if shard in self.websocketContexts:
+                        del self.websocketContexts[shard]
+            if len(shards) < 2:
+                continue
+            source = shards[-1]
+            conxtpl = self._contextGetConxTpl(source)
+            conx_tpl = self.wsconf['conx-tpls'][conxtpl]
+            loads = [self._websocket_shard_load(shard) for shard in shards[0:-1]]
+            moves = {}
+            for stream in self._websocketContextGetSubscribedEventSymbols(source):
+                rate = self._websocket_stream_rate(stream['event'], stream['symbol'], stream['params'])
+                target = None
+                for load in loads:
+                    if self._websocket_shard_fits(conx_tpl, load, rate):
+                        target = load
+                        break
+                if target is None:
+                    moves = None
+                    break
+                target[1] += 1
+                target[2] += rate
+                moves.setdefault(target[0], []).append(stream)
+            if not moves:
+                continue
+            source_context = self.websocketContexts[source]
+            for target in moves:
+                if target not in self.websocketContexts:
+                    self._websocket_reset_context(target, conxtpl)
+                context = self.websocketContexts[target]
+                context['_'] = self.deep_extend(source_context['_'], context['_'])
+                for stream in moves[target]:
+                    # the same symbol context, the messages of both connections update it until the source is closed
+                    events = context['events'].setdefault(stream['event'], {})
+                    events[stream['symbol']] = source_context['events'][stream['event']][stream['symbol']]
+                await self._websocket_reconnect(target)
+            self.websocketClose(source)
+            del self.websocketContexts[source]
+            shards.remove(source)
+
+    async def _websocket_reconnect(self, conxid):
+        """Opens a connection for the current streams of a ws-s context and closes the previous one once it is open"""
+        subscribed = self._websocketContextGetSubscribedEventSymbols(conxid)
+        last = subscribed[-1]
+        config = self._websocket_conx_config(last['event'], last['symbol'])[0]
+        config['url'] = self._websocket_generate_url_stream(subscribed, config, last['params'])
+        config['verbose'] = self.verbose
+        self._websocket_replace_connection(conxid)
+        self._contextSetConnectionInfo(conxid, await self._websocket_initialize(config, conxid))
+        await self.websocket_connect(conxid)
+
+    def _websocket_replace_connection(self, conxid):
+        # the messages of the previous connection are handled until the new one is open
+        conx = self._contextGetConnection(conxid)
+        if conx is not None:
+            self.websocketContexts[conxid].setdefault('replaced', []).append(conx)
+
+    async def _websocket_close_sessions(self):
+        # the websockets have sessions of their own, they are closed with the exchange
+        connections = []
+        for conxid, context in self.websocketContexts.items():
+            connections.extend(context.get('replaced', []))
+            if context['conx'] is not None and context['conx']['conx'] is not None:
+                connections.append(context['conx']['conx'])
+        for conx in connections:
+            if conx.own_session:
+                conx.close()
+        closing = [conx.closing for conx in connections if conx.closing is not None]
+        if closing:
+            await asyncio.gather(*closing, return_exceptions=True)
+
+    def _websocket_close_replaced(self, conxid):
+        if conxid in self.websocketContexts:
+            for conx in self.websocketContexts[conxid].pop('replaced', []):
+                try:
+                    conx.close()
+                except AttributeError:
+                    pass
+
+    def _websocket_conx_config(self, event, symbol):
         event_conf = self.safe_value(self.wsconf['events'], event)
         if (event_conf is None):
             raise ExchangeError("invalid websocket configuration for event: " + event + " in exchange: " + self.id)
@@ -471,6 +823,19 @@ class Exchange(BaseExchange, EventEmitter):
             config[key] = self.implode_params(conxParam[key], params)
         if (not (('id' in config) and ('url' in config) and ('type' in config))):
             raise ExchangeError("invalid websocket configuration in exchange: " + self.id)
+        return config, conx_tpl_name
+
+    def _websocket_get_action_for_event(self, conxid, event, symbol, subscription=True, subscription_params={}):
+        # if subscription and still subscribed no action returned
+        isSubscribed = self._contextIsSubscribed(conxid, event, symbol)
+        isSubscribing = self._contextIsSubscribing(conxid, event, symbol)
+        if (subscription and (isSubscribed or isSubscribing)):
+            return None
+        # if unsubscription and no subscribed and no subscribing no action returned
+        if (not subscription and ((not isSubscribed and not isSubscribing))):
+            return None
+        # get conexion type for event
+        config, conx_tpl_name = self._websocket_conx_config(event, symbol)
         if (config['type'] == 'signalr'):
             return {
                 'action': 'connect',
@@ -500,7 +865,7 @@ class Exchange(BaseExchange, EventEmitter):
                 'conx-tpl': conx_tpl_name,
             }
         elif (config['type'] == 'ws-s'):
-            subscribed = self._websocketContextGetSubscribedEventSymbols(config['id'])
+            subscribed = self._websocketContextGetSubscribedEventSymbols(conxid)
             if subscription:
                 subscribed.append({
                     'event': event,
@@ -540,7 +905,7 @@ class Exchange(BaseExchange, EventEmitter):
     async def _websocket_ensure_conx_active(self, event, symbol, subscribe, subscription_params={}, delayed=False):
         await self.load_markets()
         # self.load_markets()
-        ret = self._websocketGetConxid4Event(event, symbol)
+        ret = self._websocketGetConxid4Event(event, symbol, subscription_params, subscribe)
         conxid = ret['conxid']
         conxtpl = ret['conxtpl']
         if (not (conxid in self.websocketContexts)):
@@ -554,11 +919,8 @@ class Exchange(BaseExchange, EventEmitter):
             if (not (symbol in self._contextGetSymbols(conxid, event))):
                 self._contextResetSymbol(conxid, event, symbol)
             if (action['action'] == 'reconnect'):
-                conx = self._contextGetConnection(conxid)
-                try:
-                    conx.close()
-                except AttributeError:
-                    pass
+                # the streams already subscribed keep coming on the previous connection until the new one is open
+                self._websocket_replace_connection(conxid)
                 if not delayed:
                     if (action['reset-context'] == 'onreconnect'):
                         # self._websocket_reset_context(conxid, conxtpl)
@@ -575,6 +937,7 @@ class Exchange(BaseExchange, EventEmitter):
                     self._websocket_reset_context(conxid, conxtpl)
                     self._contextSetConnectionInfo(conxid, await self._websocket_initialize(conx_config, conxid))
             elif (action['action'] == 'disconnect'):
+                self._websocket_close_replaced(conxid)
                 conx = self._contextGetConnection(conxid)
                 try:
                     conx.close()
@@ -629,15 +992,22 @@ class Exchange(BaseExchange, EventEmitter):
 
                 self.timeout_future(future, 'websocket_connect')
                 # self.asyncio_loop.run_until_complete(future)
-                await websocket_connection.connect()
-                await future
+                try:
+                    await websocket_connection.connect()
+                    await future
+                finally:
+                    self._websocket_close_replaced(conxid)
             else:
-                await websocket_connection.connect()
+                try:
+                    await websocket_connection.connect()
+                finally:
+                    self._websocket_close_replaced(conxid)
 
     def websocketParseJson(self, raw_data):
-        return json.loads(raw_data)
+        return get_json_codec().loads(raw_data)
 
     def websocketClose(self, conxid='default'):
+        self._websocket_close_replaced(conxid)
         websocket_conx_info = self._contextGetConnectionInfo(conxid)
         try:
             websocket_conx_info['conx'].close()
@@ -692,12 +1062,21 @@ class Exchange(BaseExchange, EventEmitter):
         websocket_config = await self._websocket_on_init(conxid, websocket_config)
         if self.proxies is not None:
             websocket_config['proxies'] = self.proxies
+        if self.aiohttp_proxy:
+            websocket_config['proxy'] = self.aiohttp_proxy
+        # the websocket modules are only imported by the exchanges that connect to a websocket
+        from ccxt.async_support.websocket.websocket_connection import WebsocketConnection
+        # every websocket gets a connector of its own, the long-lived connections of the shards would
+        # otherwise take the slots of the REST connector and its connection pool, a session given in
+        # the config is used as it is
+        session = None if self.own_session else self.session
+        context = ssl_context(self.cafile) if self.verify else False
         if websocket_config['type'] == 'signalr':
-            websocket_connection_info['conx'] = WebsocketConnection(websocket_config, self.timeout, self.asyncio_loop)
+            websocket_connection_info['conx'] = WebsocketConnection(websocket_config, self.timeout, self.asyncio_loop, session, context, self.aiohttp_trust_env)
         elif websocket_config['type'] == 'ws':
-            websocket_connection_info['conx'] = WebsocketConnection(websocket_config, self.timeout, self.asyncio_loop)
+            websocket_connection_info['conx'] = WebsocketConnection(websocket_config, self.timeout, self.asyncio_loop, session, context, self.aiohttp_trust_env)
         elif websocket_config['type'] == 'ws-s':
-            websocket_connection_info['conx'] = WebsocketConnection(websocket_config, self.timeout, self.asyncio_loop)
+            websocket_connection_info['conx'] = WebsocketConnection(websocket_config, self.timeout, self.asyncio_loop, session, context, self.aiohttp_trust_env)
         else:
             raise NotSupported("invalid async connection: " + websocket_config['type'] + " for exchange " + self.id)
 
@@ -715,16 +1094,18 @@ class Exchange(BaseExchange, EventEmitter):
             # self._websocket_reset_context(conxid)
             self.emit('err', NetworkError(error), conxid)
 
-        @conx.on('message')
         def websocket_connection_message(msg):
             if self.verbose:
-                print((conxid + '<-' + msg).encode('utf-8'))
+                print((conxid + '<-' + (msg if isinstance(msg, str) else msg.decode('utf-8', 'replace'))).encode('utf-8'))
                 sys.stdout.flush()
             try:
                 self._websocket_on_message(conxid, msg)
             except Exception as ex:
                 self.emit('err', ex, conxid)
 
+        # the messages are passed directly, not through the event emitter
+        conx.on_message = websocket_connection_message
+
         @conx.on('pong')
         def websocket_connection_pong(data):
             if self.verbose:
@@ -822,6 +1203,8 @@ class Exchange(BaseExchange, EventEmitter):
             conxid = await self._websocket_ensure_conx_active(event, symbol, True, params, True)
             conxIds.append(conxid)
             self._contextSetSubscribing(conxid, event, symbol, True)
+            # the params of the streams being subscribed count in the load of the connection
+            self._contextGetSymbols(conxid, event)[symbol]['params'] = params
         # connect all delayed
         await self._websocket_connect_delayed()
         for i in range(0, len(eventSymbols)):
@@ -892,6 +1275,8 @@ class Exchange(BaseExchange, EventEmitter):
 
         finally:
             await self._websocket_connect_delayed()
+            if self.websocketShards:
+                await self._websocket_rebalance()
 
     async def _websocket_on_init(self, contextId, websocketConexConfig):
         return websocketConexConfig
@@ -943,10 +1328,13 @@ class Exchange(BaseExchange, EventEmitter):
         asks = self.parse_bids_asks2(orderbook[asks_key], price_key, amount_key) if (
                                                                                                 asks_key in orderbook) and isinstance(
             orderbook[asks_key], list) else []
-        for bid in bids:
-            self.updateBidAsk(bid, currentOrderBook['bids'], True)
-        for ask in asks:
-            self.updateBidAsk(ask, currentOrderBook['asks'], False)
+        if isinstance(currentOrderBook, OrderBook):
+            currentOrderBook.apply(bids, asks)
+        else:
+            for bid in bids:
+                self.updateBidAsk(bid, currentOrderBook['bids'], True)
+            for ask in asks:
+                self.updateBidAsk(ask, currentOrderBook['asks'], False)
 
         currentOrderBook['timestamp'] = timestamp
         currentOrderBook['datetime'] = self.iso8601(timestamp) if timestamp is not None else None
@@ -967,17 +1355,20 @@ class Exchange(BaseExchange, EventEmitter):
         return result
 
     def searchIndexToInsertOrUpdate(self, value, orderedArray, key, descending=False):
-        direction = -1 if descending else 1
-
-        def compare(a, b):
-            return -direction if (a < b) else direction if (a > b) else 0
+        # binary search for the first element that is not better than value
+        low = 0
+        high = len(orderedArray)
+        while low < high:
+            middle = (low + high) // 2
+            current = orderedArray[middle][key]
+            if (current > value) if descending else (current < value):
+                low = middle + 1
+            else:
+                high = middle
+        return low
 
-        i = 0
-        for i in range(len(orderedArray)):
-            if compare(orderedArray[i][key], value) >= 0:
-                return i
-        # return i
-        return len(orderedArray)
+    def order_book(self, snapshot=None):
+        return OrderBook(snapshot)
 
     def updateBidAsk(self, bidAsk, currentBidsAsks, bids=False):
         # insert or replace ordered
@@ -0,0 +1,684 @@
+# -*- coding: utf-8 -*-
+
+"""A local stand-in for the Binance spot REST and websocket stream APIs, for load and latency tests
+
+    server = BinanceMockServer({'latency': 0.002, 'errors': {429: 0.01}})
+    await server.start()
+    exchange = server.configure(ccxt.async_support.binance({'apiKey': 'key', 'secret': 'secret'}))
+    await exchange.fetch_order_book('BTC/USDT')
+    await exchange.websocket_subscribe('ob', 'BTC/USDT')
+    ...
+    await exchange.close()
+    await server.stop()
+
+The REST API under /api/v3 serves ping, time, exchangeInfo, depth, trades,
+aggTrades, klines, ticker/24hr, account and order (POST, GET and DELETE).
+Orders are acknowledged without matching, market orders are filled at the
+middle price. The combined streams under /stream?streams= serve the diff
+depth (symbol@depth), partial depth (symbol@depth20), trade and aggTrade
+streams and accept SUBSCRIBE, UNSUBSCRIBE and LIST_SUBSCRIPTIONS messages.
+The order books are shared by the REST and stream endpoints, the update ids
+of a depth snapshot continue in the diff stream like on the exchange.
+
+Options:
+    'symbols': the markets, BinanceMockServer.symbols by default
+    'latency': the seconds added to every REST response, a number or a [min, max] range
+    'errors': the probability of an injected error per REST request by kind,
+        429 and 418 with the bodies and headers of Binance, 500, 502, 503
+        and 504 with a text body and 'maintenance', a 200 response with a cut
+        off JSON body mentioning maintenance, which handle_rest_response raises
+    'weightLimit': the request weight per minute, the requests over it are answered with a 429 and a Retry-After
+    'messageRate': the messages per second of every stream
+    'maxQueue': the messages queued for a slow websocket client before it is disconnected
+    'apiKey', 'secret': when set the signed endpoints check the key and the signature
+
+    python -m ccxt.async_support.base.mock_server --port 8080 --latency 0.001 --errors 429=0.01,503=0.01"""
+
+# -----------------------------------------------------------------------------
+
+import argparse
+import asyncio
+from collections import deque
+import hashlib
+import hmac
+import json
+import random
+import socket
+import time
+
+from aiohttp import web
+import aiohttp
+
+from ccxt.base.ohlcv import parse_timeframe
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'BinanceMockServer',
+    'configure',
+]
+
+# -----------------------------------------------------------------------------
+
+
+def milliseconds():
+    return int(time.time() * 1000)
+
+
+def dumps(data):
+    return json.dumps(data, separators=(',', ':'))
+
+
+def number(value):
+    return '%.8f' % value
+
+
+def configure(exchange, url):
+    """Points the REST and websocket urls of a binance instance to the server at url, like http://127.0.0.1:8080"""
+    for api in ['public', 'private', 'v3']:
+        exchange.urls['api'][api] = url + '/api/v3'
+    exchange.urls['api']['v1'] = url + '/api/v1'
+    exchange.wsconf['conx-tpls']['default']['baseurl'] = 'ws' + url[len('http'):] + '/stream?streams='
+    return exchange
+
+
+class Market(object):
+    """The order book and recent trades of a symbol"""
+
+    def __init__(self, symbol, price, levels=100):
+        self.symbol = symbol
+        self.base, self.quote = symbol.split('/')
+        self.id = self.base + self.quote
+        self.price = price
+        self.tick = price / 10000
+        self.levels = levels
+        self.update_id = 1
+        self.trade_id = 0
+        self.bids = {}
+        self.asks = {}
+        for i in range(1, levels + 1):
+            self.bids[round(price - i * self.tick, 8)] = round(random.uniform(0.1, 10), 3)
+            self.asks[round(price + i * self.tick, 8)] = round(random.uniform(0.1, 10), 3)
+        self.trades = deque(maxlen=1000)
+        for i in range(0, 500):
+            self.trade(milliseconds() - (500 - i) * 100)
+
+    def change(self, count=1):
+        """Changes count price levels, returns the diff depth event"""
+        bids = []
+        asks = []
+        for i in range(0, count):
+            side = random.random() < 0.5
+            price = round(self.price + (1 if side else -1) * random.randint(1, self.levels) * self.tick, 8)
+            amount = 0 if random.random() < 0.1 else round(random.uniform(0.1, 10), 3)
+            book, levels = (self.asks, asks) if side else (self.bids, bids)
+            if amount:
+                book[price] = amount
+            else:
+                book.pop(price, None)
+            levels.append([number(price), number(amount)])
+        first = self.update_id + 1
+        self.update_id += count
+        return {'e': 'depthUpdate', 'E': milliseconds(), 's': self.id, 'U': first, 'u': self.update_id, 'b': bids, 'a': asks}
+
+    def depth(self, limit=100):
+        return {
+            'lastUpdateId': self.update_id,
+            'bids': [[number(price), number(self.bids[price])] for price in sorted(self.bids, reverse=True)[0:limit]],
+            'asks': [[number(price), number(self.asks[price])] for price in sorted(self.asks)[0:limit]],
+        }
+
+    def trade(self, timestamp=None):
+        self.trade_id += 1
+        trade = {
+            'id': self.trade_id,
+            'price': round(self.price + random.randint(-5, 5) * self.tick, 8),
+            'qty': round(random.uniform(0.001, 2), 3),
+            'time': timestamp or milliseconds(),
+            'isBuyerMaker': random.random() < 0.5,
+        }
+        self.trades.append(trade)
+        return trade
+
+    def rest_trade(self, trade):
+        return {'id': trade['id'], 'price': number(trade['price']), 'qty': number(trade['qty']), 'quoteQty': number(trade['price'] * trade['qty']), 'time': trade['time'], 'isBuyerMaker': trade['isBuyerMaker'], 'isBestMatch': True}
+
+    def rest_agg_trade(self, trade):
+        return {'a': trade['id'], 'p': number(trade['price']), 'q': number(trade['qty']), 'f': trade['id'], 'l': trade['id'], 'T': trade['time'], 'm': trade['isBuyerMaker'], 'M': True}
+
+    def stream_trade(self, trade):
+        return {'e': 'trade', 'E': milliseconds(), 's': self.id, 't': trade['id'], 'p': number(trade['price']), 'q': number(trade['qty']), 'b': trade['id'], 'a': trade['id'], 'T': trade['time'], 'm': trade['isBuyerMaker'], 'M': True}
+
+    def stream_agg_trade(self, trade):
+        return dict(self.rest_agg_trade(trade), e='aggTrade', E=milliseconds(), s=self.id)
+
+    def info(self):
+        return {
+            'symbol': self.id,
+            'status': 'TRADING',
+            'baseAsset': self.base,
+            'baseAssetPrecision': 8,
+            'quoteAsset': self.quote,
+            'quotePrecision': 8,
+            'orderTypes': ['LIMIT', 'LIMIT_MAKER', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+            'icebergAllowed': True,
+            'ocoAllowed': True,
+            'isSpotTradingAllowed': True,
+            'isMarginTradingAllowed': False,
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': number(self.tick), 'maxPrice': number(self.price * 100), 'tickSize': number(self.tick)},
+                {'filterType': 'LOT_SIZE', 'minQty': '0.00100000', 'maxQty': '100000.00000000', 'stepSize': '0.00100000'},
+                {'filterType': 'MIN_NOTIONAL', 'minNotional': number(self.price / 100000), 'applyToMarket': True, 'avgPriceMins': 5},
+            ],
+        }
+
+    def ticker(self):
+        bid = max(self.bids)
+        ask = min(self.asks)
+        now = milliseconds()
+        return {
+            'symbol': self.id,
+            'priceChange': number(self.tick * 10),
+            'priceChangePercent': '0.100',
+            'weightedAvgPrice': number(self.price),
+            'prevClosePrice': number(self.price - self.tick * 10),
+            'lastPrice': number(self.trades[-1]['price']),
+            'lastQty': number(self.trades[-1]['qty']),
+            'bidPrice': number(bid),
+            'bidQty': number(self.bids[bid]),
+            'askPrice': number(ask),
+            'askQty': number(self.asks[ask]),
+            'openPrice': number(self.price - self.tick * 10),
+            'highPrice': number(self.price * 1.01),
+            'lowPrice': number(self.price * 0.99),
+            'volume': '10000.00000000',
+            'quoteVolume': number(self.price * 10000),
+            'openTime': now - 86400000,
+            'closeTime': now,
+            'firstId': self.trades[0]['id'],
+            'lastId': self.trades[-1]['id'],
+            'count': len(self.trades),
+        }
+
+
+class Connection(object):
+    """A websocket client, the messages are queued and written by their own task"""
+
+    def __init__(self, server, websocket):
+        self.server = server
+        self.websocket = websocket
+        self.streams = set()
+        self.queue = deque()
+        self.ready = asyncio.Event()
+        self.closed = False
+
+    def send(self, message):
+        if self.closed:
+            return
+        if len(self.queue) >= self.server.maxQueue:
+            # the exchange disconnects the clients that do not keep up
+            self.server.stats['dropped'] += 1
+            self.close()
+            return
+        self.queue.append(message)
+        self.ready.set()
+
+    async def write(self):
+        try:
+            while not self.closed:
+                await self.ready.wait()
+                self.ready.clear()
+                while self.queue and not self.closed:
+                    await self.websocket.send_str(self.queue.popleft())
+                    self.server.stats['messages'] += 1
+        except (ConnectionError, RuntimeError, asyncio.CancelledError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.ready.set()
+            asyncio.ensure_future(self.websocket.close())
+
+
+class BinanceMockServer(object):
+
+    symbols = {
+        'BTC/USDT': 9000.0,
+        'ETH/USDT': 200.0,
+        'ETH/BTC': 0.022,
+        'BNB/USDT': 15.0,
+        'BNB/BTC': 0.0017,
+        'LTC/USDT': 40.0,
+        'XRP/USDT': 0.2,
+        'ADA/USDT': 0.05,
+    }
+
+    errors = {
+        429: [429, 'application/json', '{"code":-1003,"msg":"Too many requests; current limit of IP is 1200 requests per minute."}'],
+        418: [418, 'application/json', '{"code":-1003,"msg":"Way too much request weight used; IP banned until %d."}'],
+        500: [500, 'text/plain', 'Internal Server Error'],
+        502: [502, 'text/html', '<html><body><h1>502 Bad Gateway</h1></body></html>'],
+        503: [503, 'text/plain', 'Service Unavailable'],
+        504: [504, 'text/html', '<html><body><h1>504 Gateway Time-out</h1></body></html>'],
+        'maintenance': [200, 'application/json', '{"code":-1001,"msg":"System is under maintenance, please retry later'],
+    }
+
+    def __init__(self, options={}):
+        self.options = options
+        symbols = options.get('symbols', self.symbols)
+        if not isinstance(symbols, dict):
+            # the prices of the symbols that are not known are made up
+            symbols = dict((symbol, self.symbols.get(symbol, round(random.uniform(1, 1000), 2))) for symbol in symbols)
+        self.markets = dict((market.id, market) for market in (Market(symbol, price) for symbol, price in symbols.items()))
+        self.latency = options.get('latency', 0)
+        self.error_rates = options.get('errors', {})
+        self.weightLimit = options.get('weightLimit')
+        self.messageRate = options.get('messageRate', 10)
+        self.maxQueue = options.get('maxQueue', 100000)
+        self.apiKey = options.get('apiKey')
+        self.secret = options.get('secret')
+        self.injected = deque()
+        self.orders = {}
+        self.order_id = 0
+        self.weight = [0, 0]  # the minute and the weight used in it
+        self.connections = set()
+        self.subscribers = {}  # the connections by stream name
+        self.stats = {'requests': 0, 'errors': 0, 'messages': 0, 'connections': 0, 'dropped': 0}
+        self.host = None
+        self.port = None
+        self.runner = None
+        self.generator = None
+
+    @property
+    def url(self):
+        return 'http://%s:%d' % (self.host, self.port)
+
+    @property
+    def stream_url(self):
+        return 'ws://%s:%d/stream?streams=' % (self.host, self.port)
+
+    def configure(self, exchange):
+        return configure(exchange, self.url)
+
+    def inject(self, kind, count=1):
+        """Answers the next count REST requests with an error of a kind of the errors option"""
+        self.injected.extend([kind] * count)
+
+    def application(self):
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get('/api/v3/ping', self.ping)
+        app.router.add_get('/api/v3/time', self.time)
+        app.router.add_get('/api/v3/exchangeInfo', self.exchange_info)
+        app.router.add_get('/api/v3/depth', self.depth)
+        app.router.add_get('/api/v3/trades', self.trades)
+        app.router.add_get('/api/v3/aggTrades', self.agg_trades)
+        app.router.add_get('/api/v3/klines', self.klines)
+        app.router.add_get('/api/v3/ticker/24hr', self.ticker)
+        app.router.add_get('/api/v3/account', self.account)
+        app.router.add_post('/api/v3/order', self.create_order)
+        app.router.add_get('/api/v3/order', self.fetch_order)
+        app.router.add_delete('/api/v3/order', self.cancel_order)
+        app.router.add_get('/stream', self.stream)
+        return app
+
+    async def start(self, host='127.0.0.1', port=0):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        self.host, self.port = sock.getsockname()[0:2]
+        self.runner = web.AppRunner(self.application(), access_log=None)
+        await self.runner.setup()
+        await web.SockSite(self.runner, sock).start()
+        self.generator = asyncio.ensure_future(self.generate())
+        return self
+
+    async def stop(self):
+        if self.generator is not None:
+            self.generator.cancel()
+            self.generator = None
+        for connection in list(self.connections):
+            connection.close()
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    # REST ---------------------------------------------------------------------
+
+    def response(self, data, status=200, headers=None):
+        return web.Response(text=dumps(data), status=status, content_type='application/json', headers=headers)
+
+    def fail(self, status, code, message):
+        return self.response({'code': code, 'msg': message}, status)
+
+    def injected_error(self, kind):
+        status, content_type, body = self.errors[kind]
+        headers = {}
+        if kind == 418:
+            body = body % (milliseconds() + 120000)
+            headers['Retry-After'] = '120'
+        elif kind == 429:
+            headers['Retry-After'] = '1'
+        return web.Response(text=body, status=status, content_type=content_type, headers=headers)
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        if request.path == '/stream':
+            return await handler(request)
+        self.stats['requests'] += 1
+        if self.latency:
+            await asyncio.sleep(random.uniform(*self.latency) if isinstance(self.latency, (list, tuple)) else self.latency)
+        kind = self.injected.popleft() if self.injected else None
+        if kind is None:
+            for error, rate in self.error_rates.items():
+                if random.random() < rate:
+                    kind = error
+                    break
+        if kind is not None:
+            self.stats['errors'] += 1
+            return self.injected_error(kind)
+        minute = int(time.time() // 60)
+        if self.weight[0] != minute:
+            self.weight = [minute, 0]
+        self.weight[1] += 1
+        headers = {'X-MBX-USED-WEIGHT-1M': str(self.weight[1])}
+        if self.weightLimit is not None and self.weight[1] > self.weightLimit:
+            self.stats['errors'] += 1
+            headers['Retry-After'] = str(60 - int(time.time() % 60))
+            response = self.injected_error(429)
+            response.headers.update(headers)
+            return response
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    def market(self, request):
+        market = self.markets.get(request.query.get('symbol'))
+        if market is None:
+            raise web.HTTPBadRequest(text=dumps({'code': -1121, 'msg': 'Invalid symbol.'}), content_type='application/json')
+        return market
+
+    async def signed(self, request):
+        """The parameters of a signed request, raises the errors of the exchange for a wrong key or signature"""
+        body = await request.text()
+        if self.apiKey is not None and request.headers.get('X-MBX-APIKEY') != self.apiKey:
+            raise web.HTTPUnauthorized(text=dumps({'code': -2015, 'msg': 'Invalid API-key, IP, or permissions for action.'}), content_type='application/json')
+        payload = request.query_string + body
+        position = payload.rfind('signature=')
+        if position < 0:
+            raise web.HTTPBadRequest(text=dumps({'code': -1102, 'msg': "Mandatory parameter 'signature' was not sent, was empty/null, or malformed."}), content_type='application/json')
+        if self.secret is not None:
+            signed = payload[0:position].rstrip('&')
+            expected = hmac.new(self.secret.encode(), signed.encode(), hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(expected, payload[position + len('signature='):]):
+                raise web.HTTPBadRequest(text=dumps({'code': -1022, 'msg': 'Signature for this request is not valid.'}), content_type='application/json')
+        params = dict(request.query)
+        params.update(await request.post())
+        return params
+
+    async def ping(self, request):
+        return self.response({})
+
+    async def time(self, request):
+        return self.response({'serverTime': milliseconds()})
+
+    async def exchange_info(self, request):
+        return self.response({
+            'timezone': 'UTC',
+            'serverTime': milliseconds(),
+            'rateLimits': [
+                {'rateLimitType': 'REQUEST_WEIGHT', 'interval': 'MINUTE', 'intervalNum': 1, 'limit': self.weightLimit or 1200},
+            ],
+            'exchangeFilters': [],
+            'symbols': [market.info() for market in self.markets.values()],
+        })
+
+    async def depth(self, request):
+        return self.response(self.market(request).depth(int(request.query.get('limit', 100))))
+
+    async def trades(self, request):
+        market = self.market(request)
+        limit = int(request.query.get('limit', 500))
+        return self.response([market.rest_trade(trade) for trade in list(market.trades)[-limit:]])
+
+    async def agg_trades(self, request):
+        market = self.market(request)
+        limit = int(request.query.get('limit', 500))
+        return self.response([market.rest_agg_trade(trade) for trade in list(market.trades)[-limit:]])
+
+    async def klines(self, request):
+        market = self.market(request)
+        duration = parse_timeframe(request.query.get('interval', '1m')) * 1000
+        limit = int(request.query.get('limit', 500))
+        start = int(request.query['startTime']) if 'startTime' in request.query else milliseconds() - limit * duration
+        start -= start % duration
+        result = []
+        for i in range(0, limit):
+            opening = start + i * duration
+            prices = sorted(market.price + random.randint(-20, 20) * market.tick for j in range(0, 4))
+            open, close = (prices[1], prices[2]) if random.random() < 0.5 else (prices[2], prices[1])
+            result.append([opening, number(open), number(prices[3]), number(prices[0]), number(close), '100.00000000', opening + duration - 1, number(market.price * 100), 100, '50.00000000', number(market.price * 50), '0'])
+        return self.response(result)
+
+    async def ticker(self, request):
+        if 'symbol' in request.query:
+            return self.response(self.market(request).ticker())
+        return self.response([market.ticker() for market in self.markets.values()])
+
+    async def account(self, request):
+        await self.signed(request)
+        assets = sorted(set([market.base for market in self.markets.values()] + [market.quote for market in self.markets.values()]))
+        return self.response({
+            'makerCommission': 10,
+            'takerCommission': 10,
+            'buyerCommission': 0,
+            'sellerCommission': 0,
+            'canTrade': True,
+            'canWithdraw': True,
+            'canDeposit': True,
+            'updateTime': milliseconds(),
+            'accountType': 'SPOT',
+            'balances': [{'asset': asset, 'free': '1000.00000000', 'locked': '0.00000000'} for asset in assets],
+        })
+
+    async def create_order(self, request):
+        params = await self.signed(request)
+        market = self.markets.get(params.get('symbol'))
+        if market is None:
+            return self.fail(400, -1121, 'Invalid symbol.')
+        type = params.get('type')
+        if type not in market.info()['orderTypes']:
+            return self.fail(400, -1116, 'Invalid orderType.')
+        if 'quantity' not in params or (type != 'MARKET' and 'price' not in params):
+            return self.fail(400, -1102, 'Mandatory parameter was not sent, was empty/null, or malformed.')
+        self.order_id += 1
+        amount = float(params['quantity'])
+        filled = type == 'MARKET'
+        price = market.price if filled else float(params['price'])
+        order = {
+            'symbol': market.id,
+            'orderId': self.order_id,
+            'orderListId': -1,
+            'clientOrderId': params.get('newClientOrderId', 'mock%d' % self.order_id),
+            'transactTime': milliseconds(),
+            'price': number(0 if filled else price),
+            'origQty': number(amount),
+            'executedQty': number(amount if filled else 0),
+            'cummulativeQuoteQty': number(amount * price if filled else 0),
+            'status': 'FILLED' if filled else 'NEW',
+            'timeInForce': params.get('timeInForce', 'GTC'),
+            'type': type,
+            'side': params.get('side'),
+        }
+        self.orders[order['orderId']] = order
+        return self.response(order)
+
+    def order(self, params):
+        try:
+            return self.orders[int(params.get('orderId'))]
+        except (KeyError, TypeError, ValueError):
+            raise web.HTTPBadRequest(text=dumps({'code': -2013, 'msg': 'Order does not exist.'}), content_type='application/json')
+
+    async def fetch_order(self, request):
+        order = self.order(await self.signed(request))
+        return self.response(dict(order, time=order['transactTime'], updateTime=milliseconds()))
+
+    async def cancel_order(self, request):
+        order = self.order(await self.signed(request))
+        if order['status'] != 'NEW':
+            return self.fail(400, -2011, 'Unknown order sent.')
+        order['status'] = 'CANCELED'
+        return self.response(order)
+
+    # streams ------------------------------------------------------------------
+
+    def subscribe(self, connection, streams):
+        for stream in streams:
+            if stream not in connection.streams:
+                connection.streams.add(stream)
+                self.subscribers.setdefault(stream, set()).add(connection)
+
+    def unsubscribe(self, connection, streams):
+        for stream in streams:
+            connection.streams.discard(stream)
+            subscribers = self.subscribers.get(stream)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self.subscribers[stream]
+
+    async def stream(self, request):
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        connection = Connection(self, websocket)
+        self.connections.add(connection)
+        self.stats['connections'] += 1
+        streams = request.query.get('streams')
+        self.subscribe(connection, streams.split('/') if streams else [])
+        writer = asyncio.ensure_future(connection.write())
+        try:
+            async for message in websocket:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                try:
+                    command = json.loads(message.data)
+                    method = command['method']
+                except (ValueError, KeyError, TypeError):
+                    connection.send(dumps({'error': {'code': 2, 'msg': 'Invalid request'}}))
+                    continue
+                result = None
+                if method == 'SUBSCRIBE':
+                    self.subscribe(connection, command.get('params', []))
+                elif method == 'UNSUBSCRIBE':
+                    self.unsubscribe(connection, command.get('params', []))
+                elif method == 'LIST_SUBSCRIPTIONS':
+                    result = sorted(connection.streams)
+                connection.send(dumps({'result': result, 'id': command.get('id')}))
+        finally:
+            self.unsubscribe(connection, list(connection.streams))
+            self.connections.discard(connection)
+            connection.close()
+            writer.cancel()
+        return websocket
+
+    def publish(self, stream, data):
+        subscribers = self.subscribers.get(stream)
+        if subscribers:
+            message = '{"stream":"%s","data":%s}' % (stream, dumps(data))
+            for connection in list(subscribers):
+                connection.send(message)
+
+    async def generate(self):
+        """Changes the order books and adds trades at messageRate per stream, publishing the events to the subscribers"""
+        interval = 0.01
+        pending = 0.0
+        last = time.time()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.time()
+            pending += (now - last) * self.messageRate
+            last = now
+            count = int(pending)
+            pending -= count
+            if not count or not self.subscribers:
+                continue
+            # the streams by market and kind, several names can refer to the same one, like symbol@depth and symbol@depth@100ms
+            streams = {}
+            for stream in self.subscribers:
+                parts = stream.split('@')
+                market = self.markets.get(parts[0].upper())
+                if market is not None and len(parts) > 1:
+                    kind = 'depth' if parts[1] == 'depth' else ('partial' if parts[1].startswith('depth') else parts[1])
+                    streams.setdefault(market, {}).setdefault(kind, []).append(stream)
+            for market, kinds in streams.items():
+                for i in range(0, count):
+                    update = market.change(random.randint(1, 3))
+                    for stream in kinds.get('depth', []):
+                        self.publish(stream, update)
+                    if 'trade' in kinds or 'aggTrade' in kinds:
+                        trade = market.trade()
+                        for stream in kinds.get('trade', []):
+                            self.publish(stream, market.stream_trade(trade))
+                        for stream in kinds.get('aggTrade', []):
+                            self.publish(stream, market.stream_agg_trade(trade))
+                for stream in kinds.get('partial', []):
+                    levels = stream.split('@')[1][len('depth'):]
+                    self.publish(stream, market.depth(int(levels) if levels.isdigit() else 20))
+
+
+def run(options={}, host='127.0.0.1', port=8080):
+    """Serves until interrupted"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    server = BinanceMockServer(options)
+    loop.run_until_complete(server.start(host, port))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.stop())
+        loop.close()
+
+
+def parse_errors(value):
+    """'429=0.01,503=0.02,maintenance=0.01' as an errors option"""
+    errors = {}
+    for item in value.split(','):
+        if item:
+            kind, rate = item.split('=')
+            errors[int(kind) if kind.isdigit() else kind] = float(rate)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='A local stand-in for the Binance spot REST and websocket stream APIs')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every REST response')
+    parser.add_argument('--errors', type=parse_errors, default={}, help='error probabilities, like 429=0.01,503=0.01,maintenance=0.01')
+    parser.add_argument('--weight-limit', type=int, help='request weight per minute')
+    parser.add_argument('--message-rate', type=float, default=10, help='messages per second of every stream')
+    parser.add_argument('--api-key')
+    parser.add_argument('--secret')
+    args = parser.parse_args()
+    run({
+        'latency': args.latency,
+        'errors': args.errors,
+        'weightLimit': args.weight_limit,
+        'messageRate': args.message_rate,
+        'apiKey': args.api_key,
+        'secret': args.secret,
+    }, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
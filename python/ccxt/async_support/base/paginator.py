@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+from collections import deque
+
+from ccxt.base.errors import ExchangeError
+
+__all__ = [
+    'Paginator',
+    'paginations',
+]
+
+# how the exchanges paginate their fetch methods, the timestamp pagination is used for everything else
+#     'type': 'timestamp' moves since to the timestamp of the last object
+#             'id' passes the id of the last object in the 'param' parameter
+#             'offset' passes the number of objects received so far in the 'param' parameter
+#             'page' passes the page number, starting with 'start', in the 'param' parameter
+#             'cursor' passes the value of the 'header' response header in the 'param' parameter
+#     'order': 'asc' if the pages go forward in time, 'desc' if they go back from the most recent objects
+#     'limit': the page size passed when paginate() is called without a limit
+# exchange.options['paginate'] overrides them per method name ('fetchMyTrades') or for all methods ('default')
+paginations = {
+    'binance': {
+        'fetchTrades': {'type': 'id', 'param': 'fromId', 'limit': 1000},
+        'fetchMyTrades': {'type': 'id', 'param': 'fromId', 'limit': 1000},
+        'fetchOHLCV': {'type': 'timestamp', 'limit': 1000},
+    },
+    'coinbasepro': {
+        'fetchMyTrades': {'type': 'cursor', 'param': 'after', 'header': 'CB-AFTER', 'order': 'desc'},
+        'fetchOrders': {'type': 'cursor', 'param': 'after', 'header': 'CB-AFTER', 'order': 'desc'},
+        'fetchClosedOrders': {'type': 'cursor', 'param': 'after', 'header': 'CB-AFTER', 'order': 'desc'},
+    },
+    'kraken': {
+        'fetchMyTrades': {'type': 'offset', 'param': 'ofs', 'order': 'desc'},
+        'fetchClosedOrders': {'type': 'offset', 'param': 'ofs', 'order': 'desc'},
+        'fetchLedger': {'type': 'offset', 'param': 'ofs', 'order': 'desc'},
+    },
+    'okex': {
+        'fetchMyTrades': {'type': 'cursor', 'param': 'after', 'header': 'OK-AFTER', 'order': 'desc', 'limit': 100},
+        'fetchClosedOrders': {'type': 'cursor', 'param': 'after', 'header': 'OK-AFTER', 'order': 'desc', 'limit': 100},
+        'fetchLedger': {'type': 'cursor', 'param': 'after', 'header': 'OK-AFTER', 'order': 'desc', 'limit': 100},
+    },
+}
+
+
+class Paginator(object):
+    """Asynchronous iterator over all the objects returned by a fetch method, see Exchange.paginate
+
+    Only the current page and the keys of the previous one are kept in
+    memory. The objects of a page that were already seen on the previous
+    page are skipped, the pages overlap when they are requested by timestamp
+    or when new objects shift an offset. Objects are keyed by their id, the
+    timestamp of a candle or the timestamp, price, amount and side of an object
+    without an id. The iteration ends with the first page without new
+    objects, past until when going forward or before since when going back.
+    Objects at or past until are skipped in both directions. A full page of
+    objects sharing one timestamp cannot be paged by timestamp, the next page
+    starts a millisecond after it, an id pagination does not skip any."""
+
+    def __init__(self, exchange, method, symbol=None, since=None, limit=None, params={}, until=None, pagination=None, arguments=None):
+        self.exchange = exchange
+        self.name = method
+        self.method = getattr(exchange, method)
+        self.arguments = arguments or {}
+        self.symbol = symbol
+        self.since = since
+        self.until = until
+        self.params = params
+        self.pagination = pagination or self.configuration()
+        if self.pagination['type'] == 'cursor' and not exchange.enableLastResponseHeaders:
+            raise ExchangeError(exchange.id + ' paginate() requires enableLastResponseHeaders = true for the cursor pagination of ' + method)
+        self.limit = limit if limit is not None else self.pagination.get('limit')
+        self.descending = self.pagination.get('order') == 'desc'
+        self.cursor = self.pagination.get('start', 1) if self.pagination['type'] == 'page' else None
+        self.offset = 0
+        self.seen = set()
+        self.page = deque()
+        self.done = False
+        self.pages = 0
+
+    def configuration(self):
+        options = self.exchange.safe_value(self.exchange.options, 'paginate', {})
+        pagination = self.lookup(options, self.name) or options.get('default')
+        return pagination or self.lookup(paginations.get(self.exchange.id, {}), self.name) or {'type': 'timestamp'}
+
+    @staticmethod
+    def lookup(configurations, name):
+        """Finds fetchOHLCV by fetch_ohlcv and the other way round"""
+        name = name.replace('_', '').lower()
+        for key in configurations:
+            if key.replace('_', '').lower() == name:
+                return configurations[key]
+        return None
+
+    @staticmethod
+    def timestamp(item):
+        return item[0] if isinstance(item, list) else item.get('timestamp')
+
+    @staticmethod
+    def key(item):
+        if isinstance(item, list):
+            return item[0]
+        if item.get('id') is not None:
+            return item['id']
+        return (item.get('timestamp'), item.get('price'), item.get('amount'), item.get('side'))
+
+    def request(self):
+        """The since argument and the parameters of the next page"""
+        kind = self.pagination['type']
+        if kind == 'timestamp' or (self.pages == 0 and kind != 'page'):
+            return self.since, self.params
+        param = self.pagination.get('param')
+        value = self.offset if kind == 'offset' else self.cursor
+        # an id or a cursor replaces since, binance rejects fromId together with startTime
+        since = None if kind in ['id', 'cursor'] else self.since
+        return since, self.exchange.extend({param: value}, self.params)
+
+    async def fetch(self):
+        since, params = self.request()
+        items = await self.method(self.symbol, since=since, limit=self.limit, params=params, **self.arguments)
+        kind = self.pagination['type']
+        self.pages += 1
+        self.offset += len(items)
+        keys = set(self.key(item) for item in items)
+        fresh = [item for item in items if self.key(item) not in self.seen]
+        self.seen = keys
+        if not fresh:
+            stamps = [self.timestamp(item) for item in items if self.timestamp(item) is not None]
+            stuck = stamps and (self.since is not None) and max(stamps) >= self.since
+            if kind == 'timestamp' and stuck and (self.limit is None or len(items) >= self.limit):
+                # the whole page shares the timestamp of since, step past it instead of stopping
+                self.since = max(stamps) + 1
+            else:
+                self.done = True
+            return
+        timestamps = [self.timestamp(item) for item in fresh if self.timestamp(item) is not None]
+        last = fresh[-1]
+        if self.descending:
+            if self.since is not None and timestamps and min(timestamps) < self.since:
+                self.done = True
+                fresh = [item for item in fresh if (self.timestamp(item) or self.since) >= self.since]
+        elif self.until is not None and timestamps and max(timestamps) >= self.until:
+            self.done = True
+        if self.until is not None:
+            fresh = [item for item in fresh if (self.timestamp(item) or 0) < self.until]
+        if kind == 'timestamp':
+            if not timestamps:
+                self.done = True
+            else:
+                self.since = max(timestamps)
+        elif kind == 'id':
+            self.cursor = self.key(last)
+        elif kind == 'page':
+            self.cursor += 1
+        elif kind == 'cursor':
+            headers = self.exchange.last_response_headers or {}
+            self.cursor = headers.get(self.pagination['header'])
+            if not self.cursor:
+                self.done = True
+        self.page.extend(fresh)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self.page:
+            if self.done:
+                raise StopAsyncIteration
+            await self.fetch()
+        return self.page.popleft()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""Recorded HTTP responses for the async exchanges, see ccxt.base.recorder
+
+    store = FixtureStore('fixtures/binance.jsonl.gz')
+    exchange = ccxt.async_support.binance({'session': ReplaySession(store)})
+
+The sessions implement the part of aiohttp.ClientSession used by
+Exchange.fetch. The exchange does not close a session it was given, the
+RecordingSession is closed with await session.close()."""
+
+from abc import ABC, abstractmethod
+
+import aiohttp
+from multidict import CIMultiDict
+
+from ccxt.base.recorder import FixtureStore
+
+__all__ = [
+    'FixtureStore',
+    'RecordingSession',
+    'ReplaySession',
+]
+
+
+class ReplayedResponse(object):
+    """The part of aiohttp.ClientResponse used by Exchange.fetch, from a recorded entry"""
+
+    def __init__(self, url, entry):
+        self.url = url
+        self.status = entry['status']
+        self.reason = entry['reason']
+        self.headers = CIMultiDict(entry['headers'])
+        self.charset = entry['encoding']
+        self.content = FixtureStore.content(entry)
+
+    async def read(self):
+        return self.content
+
+    async def text(self, encoding=None):
+        return self.content.decode(encoding or self.charset or 'utf-8', 'replace')
+
+    def release(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class Session(ABC):
+
+    @abstractmethod
+    def request(self, method, url, **kwargs):
+        pass
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    async def close(self):
+        pass
+
+
+class RecordingRequest(object):
+
+    def __init__(self, session, method, url, kwargs):
+        self.session = session
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+
+    async def __aenter__(self):
+        session = self.session
+        if session.session is None:
+            session.session = aiohttp.ClientSession()
+        async with session.session.request(self.method, self.url, **self.kwargs) as response:
+            content = await response.read()
+            entry = session.store.add(self.method, self.url, self.kwargs.get('data'), response.status, response.reason, response.headers, content, response.charset)
+        return ReplayedResponse(self.url, entry)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+class RecordingSession(Session):
+    """Sends the requests with an aiohttp.ClientSession and adds every response to a FixtureStore
+
+    Without a session one is created on the first request and closed by close()."""
+
+    def __init__(self, store, session=None):
+        self.store = store
+        self.session = session
+        self.own_session = session is None
+
+    def request(self, method, url, **kwargs):
+        return RecordingRequest(self, method, url, kwargs)
+
+    async def close(self):
+        if self.own_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class ReplaySession(Session):
+    """Answers the requests with the responses from a FixtureStore, it does not connect anywhere"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def request(self, method, url, data=None, **kwargs):
+        return ReplayedResponse(url, self.store.response(method, str(url), data))
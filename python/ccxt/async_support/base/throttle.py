@@ -1,51 +1,120 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import Queue, sleep, Future, ensure_future, get_event_loop
-from time import time
+from asyncio import sleep, ensure_future, get_event_loop
+from collections import deque
+
+from ccxt.base.throttle import TokenBucket
 
 __all__ = [
+    'Throttle',
     'throttle',
 ]
 
 
-def throttle(config=None):
-
-    cfg = {
-        'lastTimestamp': time(),
-        'numTokens': 0,
-        'running': False,
-        'queue': Queue(),
-        'loop': get_event_loop(),
-        'delay': 0.001,
-        'refillRate': 0.001,
-        'defaultCost': 1.000,
-        'capacity': 1.000,
-    }
-
-    cfg.update(config)
-
-    async def run():
-        if not cfg['running']:
-            cfg['running'] = True
-            while not cfg['queue'].empty():
-                now = time()
-                elapsed = (now - cfg['lastTimestamp'])
-                cfg['lastTimestamp'] = now
-                cfg['numTokens'] = min(cfg['capacity'], cfg['numTokens'] + elapsed * cfg['refillRate'] * 1000)
-                if cfg['numTokens'] > 0:
-                    if not cfg['queue'].empty():
-                        cost, future = cfg['queue'].get_nowait()
-                        cfg['numTokens'] -= (cost if cost else cfg['defaultCost'])
-                        if not future.done():
-                            future.set_result(None)
-                await sleep(cfg['delay'])
-            cfg['running'] = False
-
-    def throttle(rate_limit, cost=None):
-        future = Future()
-        cfg['refillRate'] = 1 / rate_limit
-        cfg['queue'].put_nowait((cost, future))
-        ensure_future(run())
+class Throttle(object):
+    """Event-driven token bucket
+
+    Instead of polling the bucket every few milliseconds the limiter computes
+    the exact moment the request at the head of the queue becomes eligible
+    and sleeps once until then. The refill rate is expressed in tokens per
+    millisecond, same as Exchange.tokenBucket. A request may be charged to
+    several named buckets at once by passing a {bucket: cost} dictionary."""
+
+    def __init__(self, config=None, buckets=None):
+        self.config = {
+            'refillRate': 0.001,
+            'defaultCost': 1.000,
+            'capacity': 1.000,
+            'numTokens': 0,
+            'rateLimit': None,
+            'loop': None,
+        }
+        self.config.update(config or {})
+        self.loop = self.config['loop'] or get_event_loop()
+        self.queue = deque()
+        self.running = False
+        now = self.loop.time()
+        self.buckets = {
+            'default': TokenBucket(self.config, now),
+        }
+        for name, bucket_config in (buckets or {}).items():
+            self.buckets[name] = TokenBucket(bucket_config, now)
+        self.totalDelay = 0.0
+
+    def __call__(self, rate_limit=None, cost=None):
+        if rate_limit is not None and rate_limit != self.config['rateLimit']:
+            # only recompute the refill rate when the exchange rateLimit has actually changed
+            self.config['rateLimit'] = rate_limit
+            self.config['refillRate'] = 1 / rate_limit
+            self.buckets['default'].refillRate = self.config['refillRate']
+        future = self.loop.create_future()
+        self.queue.append((self.costs(cost), future))
+        if not self.running:
+            self.running = True
+            ensure_future(self.run(), loop=self.loop)
         return future
 
-    return throttle
+    def costs(self, cost=None):
+        if cost is None:
+            return {'default': self.config['defaultCost']}
+        if isinstance(cost, dict):
+            # buckets that are not configured on this instance are not charged
+            return {name: cost[name] for name in cost if name in self.buckets}
+        return {'default': cost}
+
+    def refill(self):
+        now = self.loop.time()
+        for bucket in self.buckets.values():
+            bucket.refill(now)
+
+    def delay(self, costs=None):
+        """Seconds until every bucket holds enough tokens to pay for costs already queued"""
+        costs = costs or {}
+        return max(bucket.delay(costs.get(name, 0)) for name, bucket in self.buckets.items())
+
+    async def run(self):
+        try:
+            while self.queue:
+                costs, future = self.queue[0]
+                if future.done():
+                    # cancelled by the caller, no tokens are spent on it
+                    self.queue.popleft()
+                    continue
+                self.refill()
+                delay = max(self.buckets[name].delay() for name in costs) if costs else 0
+                if delay > 0:
+                    self.totalDelay += delay
+                    await sleep(delay)
+                    continue
+                self.queue.popleft()
+                for name in costs:
+                    self.buckets[name].take(costs[name])
+                future.set_result(None)
+        finally:
+            self.running = False
+
+    def queue_depth(self):
+        return len(self.queue)
+
+    def wait_time(self):
+        """Estimated seconds before a request enqueued now is released"""
+        self.refill()
+        queued = {}
+        for costs, future in self.queue:
+            if not future.done():
+                for name in costs:
+                    queued[name] = queued.get(name, 0) + costs[name]
+        # the request is released once the buckets are non-negative after paying for everything queued before it
+        return self.delay(queued)
+
+    def stats(self):
+        return {
+            'queueDepth': self.queue_depth(),
+            'waitTime': self.wait_time(),
+            'numTokens': {name: bucket.numTokens for name, bucket in self.buckets.items()},
+            'totalDelay': self.totalDelay,
+        }
+
+
+def throttle(config=None, buckets=None):
+    return Throttle(config, buckets)
@@ -31,7 +31,18 @@ class binance(Exchange):
             'id': 'binance',
             'name': 'Binance',
             'countries': ['JP', 'MT'],  # Japan, Malta
-            'rateLimit': 500,
+            'rateLimit': 50,  # 1200 request weight per minute
+            'tokenBuckets': {
+                'orders': {
+                    'refillRate': 0.01,  # 10 orders per second
+                    'capacity': 10,
+                },
+            },
+            'rateLimitHeaders': {
+                'used': 'X-MBX-USED-WEIGHT-1M',
+                'limit': 1200,
+                'window': 60000,
+            },
             'certified': True,
             'pro': True,
             # new metainfo interface
@@ -261,44 +272,45 @@ class binance(Exchange):
                     ],
                 },
                 'public': {
-                    'get': [
-                        'ping',
-                        'time',
-                        'depth',
-                        'trades',
-                        'aggTrades',
-                        'historicalTrades',
-                        'klines',
-                        'ticker/24hr',
-                        'ticker/price',
-                        'ticker/bookTicker',
-                        'exchangeInfo',
-                    ],
+                    # request weights, https://github.com/binance-exchange/binance-official-api-docs/blob/master/rest-api.md
+                    'get': {
+                        'ping': 1,
+                        'time': 1,
+                        'depth': {'cost': 1, 'byLimit': [[100, 1], [500, 5], [1000, 10], [5000, 50]]},
+                        'trades': 1,
+                        'aggTrades': 1,
+                        'historicalTrades': 5,
+                        'klines': 1,
+                        'ticker/24hr': {'cost': 1, 'noSymbol': 40},
+                        'ticker/price': {'cost': 1, 'noSymbol': 2},
+                        'ticker/bookTicker': {'cost': 1, 'noSymbol': 2},
+                        'exchangeInfo': 1,
+                    },
                     'put': ['userDataStream'],
                     'post': ['userDataStream'],
                     'delete': ['userDataStream'],
                 },
                 'private': {
-                    'get': [
-                        'allOrderList',  # oco
-                        'openOrderList',  # oco
-                        'orderList',  # oco
-                        'order',
-                        'openOrders',
-                        'allOrders',
-                        'account',
-                        'myTrades',
-                    ],
-                    'post': [
-                        'order/oco',
-                        'order',
-                        'order/test',
-                    ],
-                    'delete': [
-                        'openOrders',  # added on 2020-04-25 for canceling all open orders per symbol
-                        'orderList',  # oco
-                        'order',
-                    ],
+                    'get': {
+                        'allOrderList': 10,  # oco
+                        'openOrderList': 2,  # oco
+                        'orderList': 1,  # oco
+                        'order': 1,
+                        'openOrders': {'cost': 1, 'noSymbol': 40},
+                        'allOrders': 5,
+                        'account': 5,
+                        'myTrades': 5,
+                    },
+                    'post': {
+                        'order/oco': {'cost': 1, 'buckets': {'orders': 1}},
+                        'order': {'cost': 1, 'buckets': {'orders': 1}},
+                        'order/test': 1,
+                    },
+                    'delete': {
+                        'openOrders': 1,  # added on 2020-04-25 for canceling all open orders per symbol
+                        'orderList': 1,  # oco
+                        'order': 1,
+                    },
                 },
             },
             'wsconf': {
@@ -306,6 +318,8 @@ class binance(Exchange):
                     'default': {
                         'type': 'ws-s',
                         'baseurl': 'wss://stream.binance.com:9443/stream?streams=',
+                        'maxStreams': 1024,  # per connection, more are spread over several connections
+                        # 'messageRate': 1000,  # the messages per second a connection is given at most, see _websocket_stream_rate
                     },
                 },
                 'methodmap': {
@@ -332,6 +346,7 @@ class binance(Exchange):
                     },
                     'aggtrade': {
                         'conx-tpl': 'default',
+                        'rate': 5,  # the expected messages per second of a stream, see messageRate
                         'conx-param': {
                             'url': '{baseurl}',
                             'id': '{id}',
@@ -340,6 +355,7 @@ class binance(Exchange):
                     },
                     'trade': {
                         'conx-tpl': 'default',
+                        'rate': 10,
                         'conx-param': {
                             'url': '{baseurl}',
                             'id': '{id}',
@@ -348,6 +364,7 @@ class binance(Exchange):
                     },
                     'ohlcv': {
                         'conx-tpl': 'default',
+                        'rate': 0.5,
                         'conx-param': {
                             'url': '{baseurl}',
                             'id': '{id}',
@@ -356,6 +373,7 @@ class binance(Exchange):
                     },
                     'ticker': {
                         'conx-tpl': 'default',
+                        'rate': 1,
                         'conx-param': {
                             'url': '{baseurl}',
                             'id': '{id}',
@@ -1995,11 +2013,22 @@ class binance(Exchange):
                 self._contextSetSymbolData(contextId, 'ob', symbol, symbolData)
         else:
             config = self._contextGet(contextId, 'config')
-            symbolData['ob'] = self.mergeOrderBookDelta(symbolData['ob'], data, data['E'], 'b', 'a')
+            orderbook = symbolData['ob']
+            U = self.safe_integer(data, 'U')
+            u = self.safe_integer(data, 'u')
+            if orderbook.is_stale(u):
+                return
+            if (U is not None) and (orderbook['nonce'] is not None) and (U != orderbook['nonce'] + 1):
+                # a delta was lost, drop the book and resync it from a new snapshot
+                self._contextSetSymbolData(contextId, 'ob', symbol, {})
+                self._websocket_handle_ob(contextId, data)
+                return
+            symbolData['ob'] = self.mergeOrderBookDelta(orderbook, data, data['E'], 'b', 'a')
+            symbolData['ob']['nonce'] = u
             if config is not None:
-                self.emit('ob', symbol, self._cloneOrderBook(symbolData['ob'], config['ob'][symbol]['limit']))
+                self.emit('ob', symbol, symbolData['ob'].view(config['ob'][symbol]['limit']))
             else:
-                self.emit('ob', symbol, self._cloneOrderBook(symbolData['ob']))
+                self.emit('ob', symbol, symbolData['ob'].view())
             self._contextSetSymbolData(contextId, 'ob', symbol, symbolData)
 
     def _websocket_handle_partial_ob(self, contextId, symbol, data):
@@ -2075,15 +2104,20 @@ class binance(Exchange):
                 self.websocketClose(contextId)
                 return
             # process orderbook
+            orderbook = self.order_book(response)
             for i in range(index, len(deltas)):
                 delta = deltas[i]
-                self.mergeOrderBookDelta(response, delta, None, 'b', 'a')
-            data['ob'] = response
+                u = self.safe_integer(delta, 'u')
+                if orderbook.is_stale(u):
+                    continue
+                self.mergeOrderBookDelta(orderbook, delta, None, 'b', 'a')
+                orderbook['nonce'] = u
+            data['ob'] = orderbook
             data['deltas'] = []
             if config is not None:
-                self.emit('ob', symbol, self._cloneOrderBook(response, config['ob'][symbol]['limit']))
+                self.emit('ob', symbol, orderbook.view(config['ob'][symbol]['limit']))
             else:
-                self.emit('ob', symbol, self._cloneOrderBook(response))
+                self.emit('ob', symbol, orderbook.view())
             self._contextSetSymbolData(contextId, 'ob', symbol, data)
 
     def _websocket_subscribe(self, contextId, event, symbol, nonce, params={}):
@@ -2155,6 +2189,13 @@ class binance(Exchange):
         # console.log(options['url'] + stream)
         return options['url'] + stream
 
+    def _websocket_stream_rate(self, event, symbol, params={}):
+        if (event == 'ob') or (event == 'partob'):
+            # an update every obinterval
+            interval = self.safe_string(params, 'obinterval', '1000ms')
+            return 1000 / float(interval.replace('ms', ''))
+        return super(binance, self)._websocket_stream_rate(event, symbol, params)
+
     def _websocket_market_id(self, symbol):
         return self.market_id(symbol).lower()
 
@@ -26,6 +26,11 @@ class bitmex(Exchange):
             'version': 'v1',
             'userAgent': None,
             'rateLimit': 2000,
+            'rateLimitHeaders': {
+                'remaining': 'x-ratelimit-remaining',
+                'limit': 'x-ratelimit-limit',
+                'reset': 'x-ratelimit-reset',
+            },
             'pro': True,
             'has': {
                 'CORS': False,
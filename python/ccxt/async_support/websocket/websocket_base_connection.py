@@ -14,6 +14,8 @@ import json
 class WebsocketBaseConnection (ABC, EventEmitter):
     def __init__(self):
         super(WebsocketBaseConnection, self).__init__()
+        # called with every message instead of emitting it when set, the exchange sets it
+        self.on_message = None
 
     @abstractmethod
     def connect(self):
@@ -27,6 +29,12 @@ class WebsocketBaseConnection (ABC, EventEmitter):
     def send(self, data):
         pass
 
+    def emit_message(self, message):
+        if self.on_message is not None:
+            self.on_message(message)
+        else:
+            self.emit('message', message)
+
     def sendJson(self, data):
         self.send(json.dumps(data))
 
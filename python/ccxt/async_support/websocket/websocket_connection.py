@@ -1,126 +1,205 @@
 # -*- coding: utf-8 -*-
 
 from .websocket_base_connection import WebsocketBaseConnection
-from autobahn.asyncio.websocket import WebSocketClientProtocol, \
-    WebSocketClientFactory
+from collections import deque
+from inspect import signature
+import aiohttp
 import asyncio
-import ssl
-from urllib.parse import urlparse
-import sys
-
-
-class MyClientProtocol(WebSocketClientProtocol):
-    def __init__(self, event_emitter, future, verbose):
-        super(MyClientProtocol, self).__init__()
-        self.event_emitter = event_emitter  # type: pyee.EventEmitter
-        self.future = future  # type: asyncio.Future
-        self.is_closing = False
-        self.verbose = verbose
-
-    def onConnect(self, response):
-        pass
-
-    def onOpen(self):
-        self.future.done() or self.future.set_result(None)
-
-    def onMessage(self, payload, isBinary):
-        if self.verbose:
-            print("WebsocketConnection: ")
-            print(payload)
-            sys.stdout.flush
-        if self.is_closing:
-            return
-        if isBinary:
-            self.event_emitter.emit('message', payload)
-        else:
-            self.event_emitter.emit('message', payload.decode('utf8'))
-
-    def onClose(self, wasClean, code, reason):
-        self.future.done() or self.future.set_exception(Exception(reason))
-        if self.is_closing:
-            return
-        if wasClean:
-            self.event_emitter.emit('err', Exception(reason))
-        else:
-            self.event_emitter.emit('close')
-
-    def onPong(self, payload):
-        if self.verbose:
-            print("WebsocketConnection: PONG ")
-            print(payload)
-            sys.stdout.flush
-        self.event_emitter.emit('pong', payload.decode('utf8'))
+import socket
+from time import perf_counter as clock
 
 
 class WebsocketConnection(WebsocketBaseConnection):
-    def __init__(self, options, timeout, loop):
+    """A websocket connection opened with aiohttp
+
+    Without a session the connection opens a session and a connector of its
+    own with the SSL context of the exchange, so the long-lived websockets
+    never hold the connections that the REST requests are limited to. Text
+    frames are passed on as str and binary frames as bytes, to on_message
+    when it is set or as 'message' events. The options besides url:
+        'compress': the window bits of permessage-deflate, 15 by default, 0 disables it
+        'maxMessageSize': the largest message accepted in bytes, 4 MB by default, 0 for no limit
+        'receiveBuffer': the receive buffer of the socket in bytes, SO_RCVBUF, the system default when not set,
+            it is set before connecting when aiohttp supports socket_factory (3.12+) and the connection has
+            its own connector. Otherwise it is set after the handshake, when the TCP window scale is already
+            negotiated, and the buffer cannot grow the window beyond what the system default allowed
+        'pingInterval': the seconds between the pings measuring the latency, the connection fails
+            when a ping is not answered before the next one, no pings by default
+        'wait-after-connect': the milliseconds waited after connecting before 'open' is emitted
+        'disableCertCheck', 'proxy' or 'proxies'
+
+    latency is the round trip time of the last answered ping in seconds and
+    latencies the last 100 of them."""
+
+    def __init__(self, options, timeout, loop, session=None, ssl=None, trust_env=False):
         super(WebsocketConnection, self).__init__()
         self.options = options
         self.timeout = timeout
         self.loop = loop  # type: asyncio.BaseEventLoop
+        self.session = session
+        self.own_session = session is None
+        self.ssl = ssl  # the SSL context of the own connector, the aiohttp default when None
+        self.trust_env = trust_env
+        self.receive_buffer_set = False  # whether the socket factory of the connector set receiveBuffer
         self.client = None
+        self.connecting = None
+        self.is_closing = False
+        self.outgoing = deque()
+        self.sender = None
+        self.pinger = None
+        self.closing = None  # the task closing the client and the own session
+        self.pings = {}  # the send time of the pings not answered yet by payload
+        self.latency = None
+        self.latencies = deque(maxlen=100)
+
+    def connect_options(self):
+        url = self.options['url']
+        options = {
+            'autoping': False,  # the pongs are measured
+            'compress': self.options.get('compress', 15),
+            'max_msg_size': self.options.get('maxMessageSize', 4 * 1024 * 1024),
+        }
+        if 'disableCertCheck' in self.options:
+            options['ssl'] = False
+        proxy = self.options.get('proxy')
+        if proxy is None and 'proxies' in self.options:
+            proxy = self.options['proxies'].get('https' if url.startswith('wss') else 'http')
+        if proxy:
+            options['proxy'] = proxy
+        return options
+
+    def connector(self):
+        options = {} if self.ssl is None else {'ssl': self.ssl}
+        receive_buffer = self.options.get('receiveBuffer')
+        self.receive_buffer_set = False
+        if receive_buffer and 'socket_factory' in signature(aiohttp.TCPConnector).parameters:
+            def socket_factory(address_info):
+                family, type, proto = address_info[0:3]
+                sock = socket.socket(family=family, type=type, proto=proto)
+                sock.setblocking(False)
+                # before connect, so that the window scale of the handshake accounts for the buffer
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+                return sock
+            options['socket_factory'] = socket_factory
+            self.receive_buffer_set = True
+        return aiohttp.TCPConnector(loop=self.loop, **options)
 
-    # def connect (self):
     async def connect(self):
-        if (self.client is not None) and (self.client.state == WebSocketClientProtocol.STATE_OPEN):
-            # return self.client.future
-            await self.client.future
-        elif (self.client is not None) and (self.client.state == WebSocketClientProtocol.STATE_CONNECTING):
-            # return self.client.future
-            await self.client.future
-        else:
-            future = asyncio.Future(loop=self.loop)
-            try:
-                print("------------------------------>")
-                print(self.options['url'])
-                url_parsed = urlparse(self.options['url'])
-                print(url_parsed)
-                sys.stdout.flush()
-                ssl_param = True if url_parsed.scheme == 'wss' else False
-                if ssl_param and 'disableCertCheck' in self.options:
-                    ssl_param = ssl.SSLContext()
-                    ssl_param.verify_mode = ssl.CERT_NONE
-                port = url_parsed.port if url_parsed.port is not None else 443 if ssl else 80
-
-                client = MyClientProtocol(self, future, self.options['verbose'])
-                if 'proxies' in list(self.options.keys()):
-                    if url_parsed.scheme == 'wss':
-                        proxy_url_parsed = urlparse(self.options['proxies']['https'])
-                    else:
-                        proxy_url_parsed = urlparse(self.options['proxies']['http'])
-                    proxy = {'host': proxy_url_parsed.hostname, 'port': proxy_url_parsed.port}
-                    factory = WebSocketClientFactory(self.options['url'], proxy=proxy)
-                else:
-                    factory = WebSocketClientFactory(self.options['url'])
-                factory.protocol = lambda: client
-
-                fut = self.loop.create_connection(factory, url_parsed.hostname, port, ssl=ssl_param)
-                self.loop.call_later(self.timeout / 1000, lambda: future.done() or future.set_exception(TimeoutError()))
-                await fut
-                # self.loop.run_until_complete(fut)
-                self.client = client
-                if ('wait-after-connect' in self.options):
-                    await asyncio.sleep(self.options['wait-after-connect'] / 1000)
-                self.emit('open')
-            except Exception as ex:
-                future.done() or future.set_exception(ex)
+        if self.connecting is not None:
+            await self.connecting
+            return
+        if self.isActive():
+            return
+        self.connecting = self.loop.create_future()
+        self.is_closing = False
+        try:
+            if self.session is None:
+                self.session = aiohttp.ClientSession(loop=self.loop, connector=self.connector(), trust_env=self.trust_env)
+            self.client = await asyncio.wait_for(self.session.ws_connect(self.options['url'], **self.connect_options()), self.timeout / 1000)
+            receive_buffer = self.options.get('receiveBuffer')
+            if receive_buffer and not (self.own_session and self.receive_buffer_set):
+                self.client.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+            if 'wait-after-connect' in self.options:
+                await asyncio.sleep(self.options['wait-after-connect'] / 1000)
+        except Exception as ex:
+            self.connecting.set_exception(ex)
+            self.connecting.exception()  # retrieved, the concurrent callers may not exist
+            self.connecting = None
+            self.emit('err', ex)
+            raise
+        connecting, self.connecting = self.connecting, None
+        connecting.set_result(None)
+        self.emit('open')
+        asyncio.ensure_future(self.read(self.client))
+        if self.options.get('pingInterval'):
+            self.pinger = asyncio.ensure_future(self.ping(self.options['pingInterval']))
+
+    async def read(self, client):
+        try:
+            while True:
+                message = await client.receive()
+                if (message.type == aiohttp.WSMsgType.TEXT) or (message.type == aiohttp.WSMsgType.BINARY):
+                    if not self.is_closing:
+                        self.emit_message(message.data)
+                elif message.type == aiohttp.WSMsgType.PING:
+                    await client.pong(message.data)
+                elif message.type == aiohttp.WSMsgType.PONG:
+                    self.received_pong(message.data)
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    raise message.data
+                else:  # CLOSE, CLOSING or CLOSED
+                    break
+        except Exception as ex:
+            if not self.is_closing:
+                self.close()
                 self.emit('err', ex)
-            # return future
-            await future
+            return
+        if not self.is_closing:
+            self.close()
+            self.emit('close')
+
+    async def ping(self, interval):
+        count = 0
+        while self.client is not None:
+            payload = str(count).encode()
+            self.sendPing(payload)
+            await asyncio.sleep(interval)
+            if payload in self.pings:
+                self.close()
+                self.emit('err', asyncio.TimeoutError('no pong in ' + str(interval) + ' seconds'))
+                return
+            count += 1
+
+    def received_pong(self, payload):
+        sent = self.pings.pop(payload, None)
+        if sent is not None:
+            self.latency = clock() - sent
+            self.latencies.append(self.latency)
+        self.emit('pong', payload.decode('utf8', 'replace'))
 
     def close(self):
-        if self.client is not None:
-            self.client.is_closing = True
-            self.client._closeConnection(True)
-            self.client = None
+        self.is_closing = True
+        if self.pinger is not None:
+            self.pinger.cancel()
+            self.pinger = None
+        client, self.client = self.client, None
+        session = self.session if self.own_session else None
+        if self.own_session:
+            self.session = None
+        if (client is not None) or (session is not None):
+            self.closing = asyncio.ensure_future(self.closed(client, session))
+
+    async def closed(self, client, session):
+        if client is not None:
+            await client.close()
+        if session is not None:
+            await session.close()
 
     def send(self, data):
         if self.client is not None:
-            self.client.sendMessage(data.encode('utf8'))
+            self.outgoing.append(data)
+            if (self.sender is None) or self.sender.done():
+                self.sender = asyncio.ensure_future(self.flush(self.client))
+
+    async def flush(self, client):
+        # the messages are sent in order by one task
+        try:
+            while self.outgoing and not client.closed:
+                data = self.outgoing.popleft()
+                if isinstance(data, str):
+                    await client.send_str(data)
+                else:
+                    await client.send_bytes(data)
+        except Exception as ex:
+            self.emit('err', ex)
 
     def sendPing(self, data):
-        self.client.sendPing(("" + str(data)).encode('utf8'))
+        if self.client is not None:
+            payload = data if isinstance(data, bytes) else str(data).encode('utf8')
+            if len(self.pings) >= 100:
+                del self.pings[next(iter(self.pings))]
+            self.pings[payload] = clock()
+            asyncio.ensure_future(self.client.ping(payload))
 
     def isActive(self):
-        return (self.client is not None) and ((self.client.state == WebSocketClientProtocol.STATE_OPEN) or (
-                self.client.state == WebSocketClientProtocol.STATE_CONNECTING))
+        return (self.connecting is not None) or ((self.client is not None) and not self.client.closed)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+"""Candles built from trades, incrementally from a stream or in batches with NumPy"""
+
+# -----------------------------------------------------------------------------
+
+from collections import deque
+
+from ccxt.base.ohlcv import OHLCV_FIELDS
+from ccxt.base.ohlcv import load_numpy
+from ccxt.base.ohlcv import ohlcv_dtype
+from ccxt.base.ohlcv import parse_timeframe
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'CandleBuilder',
+    'build_ohlcv_array',
+]
+
+# -----------------------------------------------------------------------------
+
+
+def candle_fields(vwap=False, count=False):
+    return OHLCV_FIELDS + (['vwap'] if vwap else []) + (['count'] if count else [])
+
+
+def build_ohlcv_array(timestamps, prices, amounts, timeframe='1m', vwap=False, count=False):
+    """The candles of historical trades in a structured array, computed per column instead of per trade
+
+    The trades are given as three columns, lists or arrays of the same length,
+    and are sorted by timestamp if they are not sorted yet. Periods without
+    trades have no candle. The vwap and count fields are added on request."""
+    np = load_numpy()
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    dtype = ohlcv_dtype()
+    dtype = np.dtype(dtype.descr + ([('vwap', np.float64)] if vwap else []) + ([('count', np.int64)] if count else []))
+    if not len(timestamps):
+        return np.empty(0, dtype=dtype)
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        prices = prices[order]
+        amounts = amounts[order]
+    duration = parse_timeframe(timeframe) * 1000
+    openings = timestamps - timestamps % duration
+    # the first trade of every candle
+    starts = np.concatenate(([0], np.flatnonzero(openings[1:] != openings[:-1]) + 1))
+    ends = np.append(starts[1:], len(openings))
+    result = np.empty(len(starts), dtype=dtype)
+    result['timestamp'] = openings[starts]
+    result['open'] = prices[starts]
+    result['high'] = np.maximum.reduceat(prices, starts)
+    result['low'] = np.minimum.reduceat(prices, starts)
+    result['close'] = prices[ends - 1]
+    result['volume'] = np.add.reduceat(amounts, starts)
+    if vwap:
+        cost = np.add.reduceat(prices * amounts, starts)
+        # the close price for candles without volume, like the CandleBuilder
+        result['vwap'] = np.divide(cost, result['volume'], out=result['close'].copy(), where=result['volume'] > 0)
+    if count:
+        result['count'] = ends - starts
+    return result
+
+
+class CandleBuilder(object):
+    """Builds the candles of several timeframes and symbols from a stream of trades
+
+    Each trade updates the current (partial) candle of every timeframe in
+    place, the work per trade does not depend on the number of candles built
+    so far. A candle is closed when a trade of a later period arrives or when
+    flush() is called with a time past its end. The closed candles are kept,
+    at most max_candles per symbol and timeframe, and passed to on_close as
+    on_close(symbol, timeframe, candle).
+
+    Candles are [timestamp, open, high, low, close, volume] lists, followed by
+    the volume weighted average price and the number of trades when vwap and
+    count are set. Periods without trades have no candle. Trades older than the
+    current candle of a timeframe cannot change the candles already closed and
+    are only counted in late. Months are 30 days long, like in build_ohlcv."""
+
+    def __init__(self, timeframes=['1m'], vwap=False, count=False, max_candles=1000, on_close=None):
+        self.timeframes = list(timeframes)
+        self.durations = [parse_timeframe(timeframe) * 1000 for timeframe in self.timeframes]
+        self.vwap = vwap
+        self.count = count
+        self.max_candles = max_candles
+        self.on_close = on_close
+        self.fields = candle_fields(vwap, count)
+        # a [current, closed] pair per timeframe by symbol, current is the partial candle followed by its cost and trade count
+        self.symbols = {}
+        self.late = 0
+
+    def states(self, symbol):
+        states = self.symbols.get(symbol)
+        if states is None:
+            states = self.symbols[symbol] = [[None, deque(maxlen=self.max_candles)] for duration in self.durations]
+        return states
+
+    def update(self, symbol, timestamp, price, amount):
+        """Adds a trade to the candles of the symbol"""
+        states = self.symbols.get(symbol) or self.states(symbol)
+        for i in range(0, len(self.durations)):
+            opening = timestamp - timestamp % self.durations[i]
+            state = states[i]
+            current = state[0]
+            if current is not None and opening == current[0]:
+                if price > current[2]:
+                    current[2] = price
+                elif price < current[3]:
+                    current[3] = price
+                current[4] = price
+                current[5] += amount
+                current[6] += price * amount
+                current[7] += 1
+            elif current is None or opening > current[0]:
+                if current is not None:
+                    self.close(symbol, i)
+                state[0] = [opening, price, price, price, price, amount, price * amount, 1]
+            else:
+                self.late += 1
+
+    def add_trade(self, trade):
+        """Adds a unified trade structure, for instance from exchange.on('trade', ...)"""
+        self.update(trade['symbol'], trade['timestamp'], trade['price'], trade['amount'])
+
+    def add_trades(self, trades):
+        for trade in trades:
+            self.update(trade['symbol'], trade['timestamp'], trade['price'], trade['amount'])
+
+    def candle(self, current):
+        candle = current[0:6]
+        if self.vwap:
+            candle.append(current[6] / current[5] if current[5] else current[4])
+        if self.count:
+            candle.append(current[7])
+        return candle
+
+    def close(self, symbol, i):
+        state = self.symbols[symbol][i]
+        candle = self.candle(state[0])
+        state[0] = None
+        state[1].append(candle)
+        if self.on_close is not None:
+            self.on_close(symbol, self.timeframes[i], candle)
+
+    def flush(self, timestamp):
+        """Closes the current candles that end at or before the timestamp, for instance on a timer"""
+        for symbol in self.symbols:
+            states = self.symbols[symbol]
+            for i in range(0, len(self.durations)):
+                current = states[i][0]
+                if current is not None and current[0] + self.durations[i] <= timestamp:
+                    self.close(symbol, i)
+
+    def partial(self, symbol, timeframe='1m'):
+        """The current candle that is still being built or None"""
+        states = self.symbols.get(symbol)
+        current = states[self.timeframes.index(timeframe)][0] if states else None
+        return self.candle(current) if current is not None else None
+
+    def closed(self, symbol, timeframe='1m'):
+        states = self.symbols.get(symbol)
+        return list(states[self.timeframes.index(timeframe)][1]) if states else []
+
+    def ohlcv(self, symbol, timeframe='1m', partial=True):
+        """The closed candles followed by the current one, oldest first"""
+        result = self.closed(symbol, timeframe)
+        candle = self.partial(symbol, timeframe) if partial else None
+        if candle is not None:
+            result.append(candle)
+        return result
+
+    def build(self, trades):
+        """The candles of historical trades in structured arrays by timeframe, see build_ohlcv_array
+
+        The trades are unified trade structures or a [timestamps, prices,
+        amounts] list of columns, all the trades are treated as one symbol.
+        The state of the builder is not changed."""
+        if isinstance(trades, (list, tuple)) and len(trades) == 3 and not isinstance(trades[0], dict):
+            timestamps, prices, amounts = trades
+        else:
+            timestamps = [trade['timestamp'] for trade in trades]
+            prices = [trade['price'] for trade in trades]
+            amounts = [trade['amount'] for trade in trades]
+        result = {}
+        for timeframe in self.timeframes:
+            result[timeframe] = build_ohlcv_array(timestamps, prices, amounts, timeframe, self.vwap, self.count)
+        return result
@@ -1,4 +1,5 @@
 import decimal
+from fractions import Fraction
 import numbers
 import itertools
 import re
@@ -14,6 +15,8 @@ __all__ = [
     'NO_PADDING',
     'PAD_WITH_ZERO',
     'decimal_to_precision',
+    'PrecisionFormatter',
+    'precision_formatter',
 ]
 
 
@@ -33,7 +36,143 @@ NO_PADDING = 5
 PAD_WITH_ZERO = 6
 
 
+# the most digits a number may have to be formatted with integer arithmetic, the default decimal context has 28
+MAX_DIGITS = 26
+
+# numbers that str() renders in plain positional notation
+PLAIN_NUMBER = re.compile(r'^(-?)(0|[1-9][0-9]*)(?:\.([0-9]+))?$')
+
+
 def decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+    return precision_formatter(rounding_mode, precision, counting_mode, padding_mode)(n)
+
+
+class PrecisionFormatter(object):
+    """decimal_to_precision() compiled for a fixed rounding mode, precision, counting mode and padding mode
+
+    Everything that only depends on the precision is computed once: the number of
+    decimal places of the result and the integer value and scale of a tick size.
+    Numbers that str() renders in plain positional notation are then rounded with
+    integer arithmetic on their digits, without creating Decimals or touching the
+    decimal context. Anything else (exponents, significant digits, negative
+    precisions, very long numbers) goes through the Decimal implementation, so
+    the result is the same string in every case."""
+
+    def __init__(self, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+        assert precision is not None
+        if counting_mode == TICK_SIZE:
+            assert isinstance(precision, float) or isinstance(precision, numbers.Integral)
+        else:
+            assert isinstance(precision, numbers.Integral)
+        assert rounding_mode in [TRUNCATE, ROUND]
+        assert counting_mode in [DECIMAL_PLACES, SIGNIFICANT_DIGITS, TICK_SIZE]
+        assert padding_mode in [NO_PADDING, PAD_WITH_ZERO]
+        self.rounding_mode = rounding_mode
+        self.precision = precision
+        self.counting_mode = counting_mode
+        self.padding_mode = padding_mode
+        self.digits = None  # decimal places of the result, None when there is no integer path
+        self.tick = None  # the tick size as an integer number of units of 10 ** -digits
+        if counting_mode == DECIMAL_PLACES:
+            if 0 <= precision <= MAX_DIGITS:
+                self.digits = precision
+        elif counting_mode == TICK_SIZE and precision > 0:
+            tick = '{:f}'.format(decimal.Decimal(str(precision))).rstrip('0').split('.')
+            if len(tick) > 1 and len(tick[1]) <= MAX_DIGITS:
+                self.digits = len(tick[1])
+                self.tick = int(tick[0] + tick[1])
+                # the Decimal implementation compares the remainder to the float precision / 2 exactly
+                half = Fraction(precision / 2)
+                self.half = (half.numerator, half.denominator)
+
+    def __call__(self, n):
+        if self.digits is not None:
+            parts = split_number(n)
+            if parts is not None and len(parts[1]) + max(len(parts[2]), self.digits) <= MAX_DIGITS:
+                if self.tick is not None:
+                    return self.places(self.round_to_tick(*parts), ROUND)
+                return self.places(parts, self.rounding_mode)
+        return _decimal_to_precision(n, self.rounding_mode, self.precision, self.counting_mode, self.padding_mode)
+
+    def round_to_tick(self, sign, before, after):
+        scale = max(len(after), self.digits)
+        units = int(before + after.ljust(scale, '0'))
+        tick = self.tick * 10 ** (scale - self.digits)
+        missing = units % tick
+        if missing:
+            if self.rounding_mode == ROUND and missing * self.half[1] >= self.half[0] * 10 ** scale:
+                units += tick - missing
+            else:
+                units -= missing
+            if not units:
+                sign = ''  # an exact zero difference of Decimals is positive
+        string = str(units).rjust(scale + 1, '0')
+        return sign, string[:len(string) - scale], string[len(string) - scale:]
+
+    def places(self, parts, rounding_mode):
+        sign, before, after = parts
+        digits = self.digits
+        if rounding_mode == TRUNCATE:
+            precise = sign + before + '.' + after[:digits]
+            if precise == '-0.':
+                precise = precise[1:]
+            precise = precise.rstrip('.')
+        else:
+            if len(after) > digits:
+                if after[digits] < '5':
+                    after = after[:digits]
+                else:
+                    # round half up, carry into the kept digits
+                    string = str(int(before + after[:digits]) + 1).rjust(digits + 1, '0')
+                    before, after = string[:len(string) - digits], string[len(string) - digits:]
+            else:
+                after = after.ljust(digits, '0')
+            precise = sign + before + ('.' + after if digits else '')
+            if precise == '-0':
+                precise = precise[1:]
+        if self.padding_mode == NO_PADDING:
+            return precise.rstrip('0').rstrip('.') if '.' in precise else precise
+        if '.' in precise:
+            before, after = precise.split('.')
+            return before + '.' + after.ljust(digits, '0')
+        if digits > 0:
+            return precise + '.' + digits * '0'
+        return precise
+
+
+def split_number(n):
+    """Returns the sign, integer digits and fractional digits of n, or None if str(n) is not in plain notation"""
+    if type(n) is float:
+        string = repr(n)
+        if 'e' in string or 'n' in string:  # exponent, inf or nan
+            return None
+        # the repr of a finite float has a dot and no leading zeros
+        before, _, after = string.partition('.')
+        if before[0] == '-':
+            return '-', before[1:], after
+        return '', before, after
+    match = PLAIN_NUMBER.match(str(n))
+    if match is None:
+        return None
+    sign, before, after = match.groups()
+    return sign, before, after or ''
+
+
+formatters = {}
+
+
+def precision_formatter(rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
+    """Returns a cached PrecisionFormatter for the arguments of decimal_to_precision()"""
+    key = (rounding_mode, precision, type(precision), counting_mode, padding_mode)
+    formatter = formatters.get(key)
+    if formatter is None:
+        if len(formatters) >= 4096:
+            formatters.clear()
+        formatter = formatters[key] = PrecisionFormatter(rounding_mode, precision, counting_mode, padding_mode)
+    return formatter
+
+
+def _decimal_to_precision(n, rounding_mode=ROUND, precision=None, counting_mode=DECIMAL_PLACES, padding_mode=NO_PADDING):
     assert precision is not None
     if counting_mode == TICK_SIZE:
         assert(isinstance(precision, float) or isinstance(precision, numbers.Integral))
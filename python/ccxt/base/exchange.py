@@ -25,19 +25,23 @@ from ccxt.base.errors import RateLimitExceeded
 from ccxt.base.decimal_to_precision import decimal_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN
 from ccxt.base.decimal_to_precision import number_to_string
+from ccxt.base.decimal_to_precision import precision_formatter
 
 # -----------------------------------------------------------------------------
 
-# rsa jwt signing
-from cryptography.hazmat import backends
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from ccxt.base.throttle import Throttle
+from ccxt.base.throttle import RateLimitFeedback
+from ccxt.base.json_codec import get_json_codec
+from ccxt.base.instrumentation import Timings
+from ccxt.base.response_cache import ResponseCache
+from ccxt.base.response_cache import FileResponseCache
+from ccxt.base.ohlcv import parse_ohlcv_array
+from ccxt.base.ohlcv import resample_ohlcv
+from ccxt.base.ohlcv import sort_ohlcv_array
 
 # -----------------------------------------------------------------------------
 
-# ecdsa signing
-from ccxt.static_dependencies import ecdsa
+# the cryptography package (rsa jwt signing), the ecdsa signing and web3 are imported on first use
 
 # -----------------------------------------------------------------------------
 
@@ -48,7 +52,6 @@ __all__ = [
 # -----------------------------------------------------------------------------
 
 # Python 2 & 3
-import types
 import logging
 import base64
 import calendar
@@ -65,11 +68,13 @@ import math
 from numbers import Number
 import re
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.utils import default_user_agent
 from requests.exceptions import HTTPError, Timeout, TooManyRedirects, RequestException
 # import socket
 from ssl import SSLError
 # import sys
+import threading
 import time
 import uuid
 import zlib
@@ -77,6 +82,11 @@ from decimal import Decimal
 
 # -----------------------------------------------------------------------------
 
+try:
+    from http.cookiejar import DefaultCookiePolicy  # Python 3
+except ImportError:
+    from cookielib import DefaultCookiePolicy  # Python 2
+
 try:
     basestring  # basestring was removed in Python 3
 except NameError:
@@ -97,10 +107,30 @@ except ImportError:
 # -----------------------------------------------------------------------------
 # web3/0x imports
 
-try:
-    from web3 import Web3, HTTPProvider
-except ImportError:
-    Web3 = HTTPProvider = None  # web3/0x not supported in Python 2
+Web3 = HTTPProvider = None  # imported by load_web3(), False if web3 is not installed (not supported in Python 2)
+
+
+def load_web3():
+    global Web3, HTTPProvider
+    if Web3 is None:
+        try:
+            from web3 import Web3, HTTPProvider
+        except ImportError:
+            Web3 = HTTPProvider = False
+    return Web3 or None
+
+# -----------------------------------------------------------------------------
+
+
+def last_response_property(name):
+    """An attribute of the instance that is kept per thread in the threadSafe mode"""
+    def get(self):
+        return (self.thread_local or self).__dict__.get(name)
+
+    def set(self, value):
+        (self.thread_local or self).__dict__[name] = value
+
+    return property(get, set)
 
 # -----------------------------------------------------------------------------
 
@@ -120,6 +150,14 @@ class Exchange(object):
     aiohttp_proxy = None
     aiohttp_trust_env = False
     session = None  # Session () by default
+    httpPool = None  # {'pool_connections': 10, 'pool_maxsize': 10} for the HTTPAdapters of the default session
+    # one instance can be shared by several threads, the last_* responses are kept per thread
+    # and the session keeps no cookies instead of clearing them before every request
+    threadSafe = False
+    thread_local = None
+    # an Instrumentation, like a LatencyHistogram, receiving the Timings of every request and unified method call
+    instrumentation = None
+    instrumented_methods = None
     verify = True  # SSL verification
     logger = None  # logging.getLogger(__name__) by default
     userAgent = None
@@ -166,6 +204,12 @@ class Exchange(object):
     twofa = None
     marketsById = None
     markets_by_id = None
+    marketsCache = None  # {'path': directory or .json(.gz) file, 'ttl': milliseconds} or an object with read() and write()
+    # caches the responses of public GET endpoints, {'ttl': milliseconds or {path: milliseconds}, 'maxSize': responses,
+    # 'staleWhileRevalidate': milliseconds (async only), 'path': a directory shared by processes, 'backend': an object}
+    responseCache = None
+    response_cache_backend = None
+    precisionFormatters = None
     currencies_by_id = None
     precision = None
     exceptions = None
@@ -215,6 +259,7 @@ class Exchange(object):
     trades = None
     transactions = None
     ohlcvs = None
+    ohlcvFormat = None  # 'numpy' returns the candles in structured arrays of timestamp, open, high, low, close and volume
     tickers = None
     base_currencies = None
     quote_currencies = None
@@ -295,12 +340,20 @@ class Exchange(object):
     rateLimitTokens = 16
     rateLimitMaxTokens = 16
     rateLimitUpdateTime = 0
+    tokenBuckets = None  # additional named token buckets charged by weighted endpoints
+    adaptiveRateLimit = False  # adjust the rate limiter from the rateLimitHeaders of the responses
+    rateLimitHeaders = None
+    rateLimitFeedback = None
+    apiCosts = None  # per-endpoint costs from the api definitions, filled in by define_rest_api
+    apiEndpoints = None  # the names of the generated methods by (api, method, path), filled in by define_rest_api
     enableLastHttpResponse = True
     enableLastJsonResponse = True
     enableLastResponseHeaders = True
-    last_http_response = None
-    last_json_response = None
-    last_response_headers = None
+    last_http_response = last_response_property('last_http_response')
+    last_json_response = last_response_property('last_json_response')
+    last_response_headers = last_response_property('last_response_headers')
+    request_timings = last_response_property('request_timings')  # handed from fetch2 to fetch
+    instrumented_calls = last_response_property('instrumented_calls')  # the Timings of the unified methods being called
 
     requiresWeb3 = False
     web3 = None
@@ -347,25 +400,21 @@ class Exchange(object):
             else:
                 setattr(self, key, settings[key])
 
-        if self.api:
+        # the generated api methods and the camelcase aliases live on the class, they are only defined once per class
+        cls = type(self)
+        if self.api and cls.__dict__.get('_defined_api') != self.api:
             self.define_rest_api(self.api, 'request')
+            cls._defined_api = self.api
+        if not cls.__dict__.get('_defined_camelcase'):
+            cls.define_camelcase_aliases()
 
         if self.markets:
             self.set_markets(self.markets)
 
-        # convert all properties from underscore notation foo_bar to camelcase notation fooBar
-        cls = type(self)
-        for name in dir(self):
+        # instance properties set so far get their camelcase aliases on the instance
+        for name in list(self.__dict__):
             if name[0] != '_' and name[-1] != '_' and '_' in name:
-                parts = name.split('_')
-                # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
-                exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
-                camelcase = parts[0] + ''.join(exceptions.get(i, self.capitalize(i)) for i in parts[1:])
-                attr = getattr(self, name)
-                if isinstance(attr, types.MethodType):
-                    setattr(cls, camelcase, getattr(cls, name))
-                else:
-                    setattr(self, camelcase, attr)
+                setattr(self, Exchange.camelcase(name), self.__dict__[name])
 
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit,
@@ -373,11 +422,23 @@ class Exchange(object):
             'capacity': 1.0,
             'defaultCost': 1.0,
         }, getattr(self, 'tokenBucket', {}))
-
-        self.session = self.session if self.session or self.asyncio_loop else Session()
+        self.init_rest_rate_limiter()
+
+        if not self.session and not self.asyncio_loop:
+            self.session = Session()
+            if self.httpPool:
+                adapter = HTTPAdapter(**self.httpPool)
+                self.session.mount('https://', adapter)
+                self.session.mount('http://', adapter)
+        if self.threadSafe:
+            self.thread_local = threading.local()
+            if self.session and not self.asyncio_loop:
+                self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
         self.logger = self.logger if self.logger else logging.getLogger(__name__)
+        if self.instrumentation:
+            self.set_instrumentation(self.instrumentation)
 
-        if self.requiresWeb3 and Web3 and not self.web3:
+        if self.requiresWeb3 and not self.web3 and load_web3():
             self.web3 = Web3(HTTPProvider())
 
     def __del__(self):
@@ -408,10 +469,16 @@ class Exchange(object):
     def define_rest_api(cls, api, method_name, options={}):
         delimiters = re.compile('[^a-zA-Z0-9]')
         entry = getattr(cls, method_name)  # returns a function (instead of a bound method)
+        costs = {}
+        endpoints = {}
         for api_type, methods in api.items():
             for http_method, urls in methods.items():
+                # urls is either a list of paths or a dictionary of paths to their rate limiter costs
                 for url in urls:
+                    cost = urls[url] if isinstance(urls, dict) else None
                     url = url.strip()
+                    if cost is not None:
+                        costs[(api_type, http_method.upper(), url)] = cost
                     split_path = delimiters.split(url)
 
                     uppercase_method = http_method.upper()
@@ -448,25 +515,201 @@ class Exchange(object):
                     to_bind = partialer()
                     setattr(cls, camelcase, to_bind)
                     setattr(cls, underscore, to_bind)
+                    endpoints[(api_type, uppercase_method, url)] = camelcase
+        cls.apiCosts = costs
+        cls.apiEndpoints = endpoints
 
-    def throttle(self):
-        now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        if elapsed < self.rateLimit:
-            delay = self.rateLimit - elapsed
-            time.sleep(delay / 1000.0)
+    @staticmethod
+    def camelcase(name):
+        parts = name.split('_')
+        # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
+        exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
+        return parts[0] + ''.join(exceptions.get(i, Exchange.capitalize(i)) for i in parts[1:])
+
+    @classmethod
+    def define_camelcase_aliases(cls):
+        """Converts all properties of the class from underscore notation foo_bar to camelcase notation fooBar"""
+        for name in dir(cls):
+            if name[0] != '_' and name[-1] != '_' and '_' in name:
+                # the raw attribute, so that static and class methods stay what they are
+                attr = next(klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__)
+                setattr(cls, Exchange.camelcase(name), attr)
+        cls._defined_camelcase = True
+
+    def init_rest_rate_limiter(self):
+        self.throttle = Throttle(self.extend({
+            'rateLimit': self.rateLimit,
+        }, self.tokenBucket), self.tokenBuckets)
+        self.init_rate_limit_feedback()
+
+    def init_rate_limit_feedback(self, clock=None):
+        if self.adaptiveRateLimit and self.rateLimitHeaders:
+            bucket = self.throttle.buckets[self.rateLimitHeaders.get('bucket', 'default')]
+            self.rateLimitFeedback = RateLimitFeedback(bucket, self.rateLimitHeaders, clock, getattr(self.throttle, 'lock', None))
+
+    def calculate_rate_limiter_cost(self, api, method, path, params):
+        """Returns the {bucket: cost} charged for an endpoint
+
+        The cost definition from the api dictionary is either a number or a
+        dictionary with the following optional keys:
+            'cost': the cost charged to the default bucket
+            'byLimit': [[limit, cost], ...] thresholds matched against params['limit']
+            'noSymbol': the cost charged when params has no 'symbol'
+            'buckets': {bucket: cost} charged to the named tokenBuckets together with the default bucket
+        """
+        config = self.apiCosts.get((api, method, path)) if self.apiCosts else None
+        if config is None:
+            return {'default': self.tokenBucket['defaultCost']}
+        if not isinstance(config, dict):
+            return {'default': config}
+        cost = self.safe_value(config, 'cost', self.tokenBucket['defaultCost'])
+        if ('noSymbol' in config) and not (isinstance(params, dict) and ('symbol' in params)):
+            cost = config['noSymbol']
+        by_limit = self.safe_value(config, 'byLimit')
+        limit = self.safe_integer(params, 'limit') if isinstance(params, dict) else None
+        if by_limit and (limit is not None):
+            cost = by_limit[-1][1]
+            for threshold, threshold_cost in by_limit:
+                if limit <= threshold:
+                    cost = threshold_cost
+                    break
+        return self.extend({'default': cost}, self.safe_value(config, 'buckets', {}))
 
     def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """A better wrapper over request for deferred signing"""
+        timings = self.start_request(path, api, method) if self.instrumentation else None
         if self.enableRateLimit:
-            self.throttle()
+            self.throttle(self.rateLimit, self.calculate_rate_limiter_cost(api, method, path, params))
+        if timings is not None:
+            timings.lap('throttle')
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        if timings is None:
+            return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        timings.lap('sign')
+        return self.fetch_instrumented(request, timings)
+
+    def fetch_instrumented(self, request, timings):
+        self.request_timings = timings
+        try:
+            response = self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        except Exception as e:
+            self.end_request(timings, e)
+            raise
+        self.end_request(timings)
+        return response
+
+    def set_instrumentation(self, instrumentation):
+        """Sends the Timings of every request and unified method call to instrumentation, None turns it off
+
+        The unified methods the exchange has are wrapped on the instance to time
+        them, without instrumentation nothing is measured."""
+        for name in self.instrumented_methods or []:
+            del self.__dict__[name]
+        self.instrumented_methods = []
+        self.instrumentation = instrumentation
+        if instrumentation is None:
+            return
+        for name in self.has:
+            underscore = re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).lower()  # fetchOHLCV → fetch_ohlcv
+            method = getattr(self, underscore, None)
+            if self.has[name] and callable(method):
+                wrapper = self.instrumented_method(name, method)
+                for attribute in set([name, underscore]):
+                    setattr(self, attribute, wrapper)
+                    self.instrumented_methods.append(attribute)
+
+    def instrumented_method(self, name, method):
+        def call(*args, **kwargs):
+            timings = self.start_call(name)
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                self.end_call(timings, e)
+                raise
+            self.end_call(timings)
+            return result
+        return call
+
+    def start_call(self, name):
+        calls = self.instrumented_calls or []
+        timings = Timings(self.id, 'call', name, calls[-1].name if calls else None)
+        self.instrumented_calls = calls + [timings]
+        self.instrumentation.start(timings)
+        return timings
+
+    def end_call(self, timings, error=None):
+        calls = [call for call in self.instrumented_calls or [] if call is not timings]
+        self.instrumented_calls = calls or None
+        timings.finish(error)
+        self.instrumentation.end(timings)
+
+    def start_request(self, path, api, method):
+        name = self.apiEndpoints.get((api, method, path)) if self.apiEndpoints else None
+        callers = self.instrumented_calls or []
+        timings = Timings(self.id, 'request', name or ' '.join([str(api), method, path]), callers[-1].name if callers else None)
+        timings.api = api
+        timings.method = method
+        timings.path = path
+        timings.callers = callers
+        if callers:
+            timings.retries = callers[-1].failures.get(timings.name, 0)
+        self.instrumentation.start(timings)
+        return timings
+
+    def end_request(self, timings, error=None):
+        timings.finish(error)
+        for call in timings.callers:
+            call.requests += 1
+            call.last_response = timings.started + timings.timings['total']
+        if error is not None and timings.callers:
+            failures = timings.callers[-1].failures
+            failures[timings.name] = failures.get(timings.name, 0) + 1
+        self.instrumentation.end(timings)
 
     def request(self, path, api='public', method='GET', params={}, headers=None, body=None):
         """Exchange.request is the entry point for all generated methods"""
-        return self.fetch2(path, api, method, params, headers, body)
+        ttl = self.response_cache_ttl(path, api, method) if self.responseCache else None
+        if ttl is None:
+            return self.fetch2(path, api, method, params, headers, body)
+        cache = self.cached_responses()
+        key = self.response_cache_key(path, api, method, params)
+        entry = cache.get(key)
+        if entry is not None and self.milliseconds() - entry[0] < ttl:
+            return entry[1]
+        response = self.fetch2(path, api, method, params, headers, body)
+        cache.set(key, response, self.milliseconds())
+        return response
+
+    @staticmethod
+    def is_public_api(api):
+        return 'public' in str(api).lower()
+
+    def response_cache_ttl(self, path, api, method):
+        """The milliseconds a response is fresh for or None if it is not cached
+
+        The ttl option is either a number for all public GET endpoints or a
+        dictionary of paths, a path may be prefixed with the api type and a
+        space ('fapiPublic ticker/24hr') when it exists in several of them."""
+        if method != 'GET' or not self.is_public_api(api):
+            return None
+        ttl = self.responseCache.get('ttl')
+        if isinstance(ttl, dict):
+            return ttl.get(api + ' ' + path, ttl.get(path))
+        return ttl
+
+    def response_cache_key(self, path, api, method, params):
+        return ' '.join([api, method, path, json.dumps(params, sort_keys=True, default=str)])
+
+    def cached_responses(self):
+        if self.response_cache_backend is None:
+            if 'backend' in self.responseCache:
+                self.response_cache_backend = self.responseCache['backend']
+            elif 'path' in self.responseCache:
+                self.response_cache_backend = FileResponseCache(self.responseCache['path'], self.responseCache.get('maxSize', 1000))
+            else:
+                self.response_cache_backend = ResponseCache(self.responseCache.get('maxSize', 1000))
+        return self.response_cache_backend
 
     @staticmethod
     def gzip_deflate(response, text):
@@ -528,7 +771,14 @@ class Exchange(object):
         if body:
             body = body.encode()
 
-        self.session.cookies.clear()
+        timings = self.request_timings if self.instrumentation else None
+        if timings is not None:
+            self.request_timings = None
+            timings.url = url
+            timings.bytes_sent = len(body) if body else 0
+
+        if not self.threadSafe:
+            self.session.cookies.clear()
 
         http_response = None
         http_status_code = None
@@ -544,11 +794,21 @@ class Exchange(object):
                 proxies=self.proxies,
                 verify=self.verify
             )
-            http_response = response.text
+            http_body = response.content
             http_status_code = response.status_code
             http_status_text = response.reason
-            json_response = self.parse_json(http_response)
+            if timings is not None:
+                timings.transferred(response.elapsed.total_seconds())
+                timings.status = http_status_code
+                timings.bytes_received = len(http_body)
+            # JSON is decoded from the bytes, response.text guesses the charset when the headers do not specify it
+            json_response = self.parse_json(http_body)
+            http_response = response.text if json_response is None else http_body.decode(response.encoding or 'utf-8', 'replace')
+            if timings is not None:
+                timings.lap('parse_json')
             headers = response.headers
+            if self.rateLimitFeedback:
+                self.rateLimitFeedback.update(headers, self.milliseconds())
             # FIXME remove last_x_responses from subclasses
             if self.enableLastHttpResponse:
                 self.last_http_response = http_response
@@ -584,6 +844,8 @@ class Exchange(object):
 
         self.handle_errors(http_status_code, http_status_text, url, method, headers, http_response, json_response, request_headers, request_body)
         self.handle_rest_response(http_response, json_response, url, method)
+        if timings is not None:
+            timings.lap('handle_errors')
         if json_response is not None:
             return json_response
         if self.is_text_response(headers):
@@ -615,7 +877,7 @@ class Exchange(object):
     def parse_json(self, http_response):
         try:
             if Exchange.is_json_encoded_object(http_response):
-                return json.loads(http_response)
+                return get_json_codec().loads(http_response)
         except ValueError:  # superclass of JsonDecodeError (python2)
             pass
 
@@ -834,6 +1096,8 @@ class Exchange(object):
 
     @staticmethod
     def sort_by(array, key, descending=False):
+        if hasattr(array, 'dtype'):  # candles in the numpy ohlcvFormat
+            return sort_ohlcv_array(array, key, descending)
         return sorted(array, key=lambda k: k[key] if k[key] is not None else "", reverse=descending)
 
     @staticmethod
@@ -1092,6 +1356,10 @@ class Exchange(object):
 
     @staticmethod
     def rsa(request, secret, alg='RS256'):
+        from cryptography.hazmat import backends
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+        from cryptography.hazmat.primitives.serialization import load_pem_private_key
         algorithms = {
             "RS256": hashes.SHA256(),
             "RS384": hashes.SHA384(),
@@ -1104,6 +1372,8 @@ class Exchange(object):
     @staticmethod
     def ecdsa(request, secret, algorithm='p256', hash=None, fixed_length=False):
         # your welcome - frosty00
+        from ccxt.static_dependencies import ecdsa
+        from ccxt.base.signing import signing_key
         algorithms = {
             'p192': [ecdsa.NIST192p, 'sha256'],
             'p224': [ecdsa.NIST224p, 'sha256'],
@@ -1121,21 +1391,16 @@ class Exchange(object):
             digest = Exchange.hash(encoded_request, hash, 'binary')
         else:
             digest = base64.b16decode(encoded_request, casefold=True)
-        key = ecdsa.SigningKey.from_string(base64.b16decode(Exchange.encode(secret),
-                                                            casefold=True), curve=curve_info[0])
-        r_binary, s_binary, v = key.sign_digest_deterministic(digest, hashfunc=hash_function,
-                                                              sigencode=ecdsa.util.sigencode_strings_canonize)
-        r_int, s_int = ecdsa.util.sigdecode_strings((r_binary, s_binary), key.privkey.order)
+        key = signing_key(base64.b16decode(Exchange.encode(secret), casefold=True), curve_info[0])
+        r_int, s_int, v = key.sign_digest_deterministic(digest, hash_function)
         counter = 0
         minimum_size = (1 << (8 * 31)) - 1
-        half_order = key.privkey.order / 2
+        half_order = key.order / 2
         while fixed_length and (r_int > half_order or r_int <= minimum_size or s_int <= minimum_size):
-            r_binary, s_binary, v = key.sign_digest_deterministic(digest, hashfunc=hash_function,
-                                                                  sigencode=ecdsa.util.sigencode_strings_canonize,
-                                                                  extra_entropy=Exchange.number_to_le(counter, 32))
-            r_int, s_int = ecdsa.util.sigdecode_strings((r_binary, s_binary), key.privkey.order)
+            r_int, s_int, v = key.sign_digest_deterministic(digest, hash_function, Exchange.number_to_le(counter, 32))
             counter += 1
-        r, s = Exchange.decode(base64.b16encode(r_binary)).lower(), Exchange.decode(base64.b16encode(s_binary)).lower()
+        r = '%0*x' % (2 * curve_info[0].baselen, r_int)
+        s = '%0*x' % (2 * curve_info[0].baselen, s_int)
         return {
             'r': r,
             's': s,
@@ -1144,7 +1409,7 @@ class Exchange(object):
 
     @staticmethod
     def unjson(input):
-        return json.loads(input)
+        return get_json_codec().loads(input)
 
     @staticmethod
     def json(data, params=None):
@@ -1152,6 +1417,8 @@ class Exchange(object):
 
     @staticmethod
     def is_json_encoded_object(input):
+        if isinstance(input, bytes):
+            return (len(input) >= 2) and (input[:1] in (b'{', b'['))
         return (isinstance(input, basestring) and
                 (len(input) >= 2) and
                 ((input[0] == '{') or (input[0] == '[')))
@@ -1214,16 +1481,60 @@ class Exchange(object):
         parts = re.sub(r'0+$', '', string).split('.')
         return len(parts[1]) if len(parts) > 1 else 0
 
+    def market_precision_formatters(self, market):
+        """Precompiles decimal_to_precision for the price and amount precisions of a market"""
+        precision = market.get('precision') or {}
+        formatters = {}
+        for key, rounding_mode in [['price', ROUND], ['amount', TRUNCATE]]:
+            if precision.get(key) is not None:
+                try:
+                    formatters[key] = precision_formatter(rounding_mode, precision[key], self.precisionMode)
+                except AssertionError:
+                    pass  # an unsupported precision fails in decimal_to_precision as before
+        return formatters
+
+    def market_precision_formatter(self, symbol, key):
+        """Returns the formatter precompiled in set_markets or None if the market precision has changed since"""
+        formatters = self.precisionFormatters.get(symbol) if self.precisionFormatters else None
+        formatter = formatters.get(key) if formatters else None
+        if formatter is None:
+            return None
+        if formatter.counting_mode != self.precisionMode or formatter.precision != self.markets[symbol]['precision'][key]:
+            return None
+        return formatter
+
     def cost_to_precision(self, symbol, cost):
+        formatter = self.market_precision_formatter(symbol, 'price')
+        if formatter is not None:
+            return formatter(cost)
         return self.decimal_to_precision(cost, ROUND, self.markets[symbol]['precision']['price'], self.precisionMode)
 
     def price_to_precision(self, symbol, price):
+        formatter = self.market_precision_formatter(symbol, 'price')
+        if formatter is not None:
+            return formatter(price)
         return self.decimal_to_precision(price, ROUND, self.markets[symbol]['precision']['price'], self.precisionMode)
 
     def amount_to_precision(self, symbol, amount):
+        formatter = self.market_precision_formatter(symbol, 'amount')
+        if formatter is not None:
+            return formatter(amount)
         return self.decimal_to_precision(amount, TRUNCATE, self.markets[symbol]['precision']['amount'], self.precisionMode)
 
+    def prices_to_precision(self, symbol, prices):
+        formatter = self.market_precision_formatter(symbol, 'price') or \
+            precision_formatter(ROUND, self.markets[symbol]['precision']['price'], self.precisionMode)
+        return [formatter(price) for price in prices]
+
+    def amounts_to_precision(self, symbol, amounts):
+        formatter = self.market_precision_formatter(symbol, 'amount') or \
+            precision_formatter(TRUNCATE, self.markets[symbol]['precision']['amount'], self.precisionMode)
+        return [formatter(amount) for amount in amounts]
+
     def fee_to_precision(self, symbol, fee):
+        formatter = self.market_precision_formatter(symbol, 'price')
+        if formatter is not None:
+            return formatter(fee)
         return self.decimal_to_precision(fee, ROUND, self.markets[symbol]['precision']['price'], self.precisionMode)
 
     def currency_to_precision(self, currency, fee):
@@ -1239,6 +1550,7 @@ class Exchange(object):
             )
         self.markets = self.index_by(values, 'symbol')
         self.markets_by_id = self.index_by(values, 'id')
+        self.precisionFormatters = {symbol: self.market_precision_formatters(market) for symbol, market in self.markets.items()}
         self.marketsById = self.markets_by_id
         self.symbols = sorted(list(self.markets.keys()))
         self.ids = sorted(list(self.markets_by_id.keys()))
@@ -1274,17 +1586,88 @@ class Exchange(object):
         self.currencies_by_id = self.index_by(list(self.currencies.values()), 'id')
         return self.markets
 
+    def markets_snapshot(self):
+        """Returns the loaded markets and currencies with their indexes in a JSON-serializable form"""
+        values = list(self.markets.values())
+        position = {id(market): i for i, market in enumerate(values)}
+        snapshot = {
+            'markets': values,
+            # pairs instead of a dictionary, JSON turns the numeric ids of some exchanges into strings
+            'marketsById': [[market_id, position[id(market)]] for market_id, market in self.markets_by_id.items()],
+            'symbols': self.symbols,
+            'ids': self.ids,
+            'currencies': self.currencies,
+        }
+        if self.base_currencies is not None:
+            snapshot['baseCurrencies'] = self.base_currencies
+            snapshot['quoteCurrencies'] = self.quote_currencies
+        return snapshot
+
+    def restore_markets(self, snapshot):
+        """Sets the markets and currencies from a markets_snapshot() without recomputing them"""
+        values = snapshot['markets']
+        self.markets = {market['symbol']: market for market in values}
+        self.markets_by_id = {market_id: values[i] for market_id, i in snapshot['marketsById']}
+        self.precisionFormatters = {symbol: self.market_precision_formatters(market) for symbol, market in self.markets.items()}
+        self.marketsById = self.markets_by_id
+        self.symbols = snapshot['symbols']
+        self.ids = snapshot['ids']
+        self.currencies = snapshot['currencies']
+        self.base_currencies = snapshot.get('baseCurrencies', self.base_currencies)
+        self.quote_currencies = snapshot.get('quoteCurrencies', self.quote_currencies)
+        self.currencies_by_id = self.index_by(list(self.currencies.values()), 'id')
+        return self.markets
+
+    def markets_cache_backend(self):
+        if isinstance(self.marketsCache, dict):
+            from ccxt.base.market_cache import MarketCache
+            self.marketsCache = MarketCache(self.marketsCache['path'], self.marketsCache.get('ttl'))
+        return self.marketsCache
+
+    def markets_cache_key(self):
+        """Invalidates the cached markets when ccxt, the exchange version or its endpoints change"""
+        urls = getattr(self, 'urls', None) or {}
+        return '/'.join([__version__, self.id, str(self.version), json.dumps(urls.get('api'), sort_keys=True)])
+
+    def load_markets_from_cache(self):
+        cache = self.markets_cache_backend()
+        if cache is None:
+            return None
+        try:
+            snapshot = cache.read(self.id, self.markets_cache_key())
+            return self.restore_markets(snapshot) if snapshot else None
+        except Exception:
+            return None  # a broken cache entry is refetched and overwritten
+
+    def save_markets_cache(self):
+        """Writes the loaded markets to the marketsCache, also used to build an index shipped with an application"""
+        cache = self.markets_cache_backend()
+        if cache is None or not self.markets:
+            return False
+        try:
+            cache.write(self.id, self.markets_cache_key(), self.markets_snapshot())
+        except Exception:
+            return False
+        return True
+
     def load_markets(self, reload=False, params={}):
         if not reload:
             if self.markets:
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+            if self.marketsCache is not None:
+                markets = self.load_markets_from_cache()
+                if markets:
+                    return markets
         currencies = None
         if self.has['fetchCurrencies']:
             currencies = self.fetch_currencies()
         markets = self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+        result = self.set_markets(markets, currencies)
+        if self.marketsCache is not None:
+            self.save_markets_cache()
+        return result
 
     def load_accounts(self, reload=False, params={}):
         if reload:
@@ -1392,6 +1775,8 @@ class Exchange(object):
         return ohlcv[0:6] if isinstance(ohlcv, list) else ohlcv
 
     def parse_ohlcvs(self, ohlcvs, market=None, timeframe='1m', since=None, limit=None):
+        if self.ohlcvFormat == 'numpy':
+            return parse_ohlcv_array(self, ohlcvs, market, timeframe, since, limit)
         ohlcvs = self.to_array(ohlcvs)
         num_ohlcvs = len(ohlcvs)
         result = []
@@ -1554,7 +1939,7 @@ class Exchange(object):
         ohlcvs = []
         (high, low, close, volume) = (2, 3, 4, 5)
         num_trades = len(trades)
-        oldest = (num_trades - 1) if limit is None else min(num_trades - 1, limit)
+        oldest = num_trades if limit is None else min(num_trades, limit)
         for i in range(0, oldest):
             trade = trades[i]
             if (since is not None) and (trade['timestamp'] < since):
@@ -1579,6 +1964,11 @@ class Exchange(object):
                 ohlcvs[j - 1][volume] += trade['amount']
         return ohlcvs
 
+    @staticmethod
+    def resample_ohlcv(ohlcvs, timeframe='1h', fill_gaps=True):
+        """Derives the candles of a coarser timeframe from finer ones locally, requires numpy"""
+        return resample_ohlcv(ohlcvs, timeframe, fill_gaps)
+
     @staticmethod
     def parse_timeframe(timeframe):
         amount = int(timeframe[0:-1])
@@ -1773,7 +2163,7 @@ class Exchange(object):
 
     @staticmethod
     def has_web3():
-        return Web3 is not None
+        return load_web3() is not None
 
     def check_required_dependencies(self):
         if not Exchange.has_web3():
@@ -1796,6 +2186,7 @@ class Exchange(object):
         return number_to_string(n + 'e' + str(new_exponent))
 
     def privateKeyToAddress(self, privateKey):
+        from ccxt.static_dependencies import ecdsa
         private_key_bytes = base64.b16decode(Exchange.encode(privateKey), True)
         public_key_bytes = ecdsa.SigningKey.from_string(private_key_bytes, curve=ecdsa.SECP256k1).verifying_key.to_string()
         public_key_hash = self.web3.sha3(public_key_bytes)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""Timings of the REST requests and unified methods, see Exchange.instrumentation"""
+
+# -----------------------------------------------------------------------------
+
+from bisect import bisect_left
+import threading
+
+try:
+    from time import perf_counter as clock  # Python 3
+except ImportError:
+    from time import time as clock  # Python 2
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'Timings',
+    'Instrumentation',
+    'LatencyHistogram',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class Timings(object):
+    """The phases of one request or unified method call in seconds of a monotonic clock
+
+    A request ('request' kind) is named after its generated api method
+    ('privatePostOrder') and goes through the phases throttle, sign, ttfb
+    (sending the request until the response headers arrive, connecting
+    included), read (the response body), parse_json and handle_errors. The
+    connect phase of the async exchanges is the part of ttfb spent opening a
+    new connection, DNS and TLS included. call is the unified method the
+    request was made by and retries the number of failed requests to the same
+    endpoint made by it before.
+
+    A unified method call ('call' kind) is named after the method
+    ('createOrder'), its parse phase is the time after its last response,
+    parsing it with parse_order and the like. Both have a total phase and
+    error is the exception they ended with."""
+
+    def __init__(self, exchange, kind, name, call=None):
+        self.exchange = exchange
+        self.kind = kind
+        self.name = name
+        self.call = call
+        self.api = None
+        self.method = None
+        self.path = None
+        self.url = None
+        self.status = None
+        self.error = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.requests = 0  # the requests made by a call
+        self.callers = []  # the calls a request was made by, innermost last
+        self.failures = {}  # the failed requests of a call by endpoint
+        self.last_response = None
+        self.timings = {}
+        self.started = self.mark = clock()
+
+    def lap(self, phase):
+        """Adds the time since the previous lap to the phase"""
+        now = clock()
+        self.timings[phase] = self.timings.get(phase, 0) + now - self.mark
+        self.mark = now
+
+    def transferred(self, ttfb):
+        """Splits the time since the previous lap into ttfb and read"""
+        now = clock()
+        elapsed = now - self.mark
+        self.timings['ttfb'] = min(ttfb, elapsed)
+        self.timings['read'] = elapsed - self.timings['ttfb']
+        self.mark = now
+
+    def finish(self, error=None):
+        now = clock()
+        self.error = error
+        self.timings['total'] = now - self.started
+        if self.last_response is not None:
+            self.timings['parse'] = now - self.last_response
+
+    def __repr__(self):
+        return 'Timings(%s %s %s)' % (self.kind, self.name, ', '.join('%s=%.6f' % item for item in sorted(self.timings.items())))
+
+
+class Instrumentation(object):
+    """Receives the Timings of the requests and calls of the exchanges it is set on
+
+    start() is called before the first phase and end() after the last one,
+    with the same Timings object. Subclasses override one or both, they are
+    called synchronously and should return quickly."""
+
+    def start(self, timings):
+        pass
+
+    def end(self, timings):
+        pass
+
+
+class LatencyHistogram(Instrumentation):
+    """Aggregates the phases by exchange, name and phase into histograms with exponential buckets
+
+    The bucket bounds go from 100 microseconds up, doubling each time, an
+    observation is counted in the first bucket its value is lower than or equal
+    to. snapshot() returns the counters and prometheus() renders them in the
+    Prometheus text format for scraping."""
+
+    bounds = [0.0001 * 2 ** i for i in range(0, 20)]  # up to 52 seconds
+
+    def __init__(self, bounds=None):
+        if bounds is not None:
+            self.bounds = sorted(bounds)
+        self.lock = threading.Lock()
+        self.histograms = {}  # [buckets, count, sum] by (exchange, name, phase)
+        self.counters = {}  # {'requests', 'errors', 'retries', 'bytes_sent', 'bytes_received'} by (exchange, name), requests counts the calls too
+
+    def observe(self, exchange, name, phase, seconds):
+        key = (exchange, name, phase)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * (len(self.bounds) + 1), 0, 0.0]
+            histogram[0][bisect_left(self.bounds, seconds)] += 1
+            histogram[1] += 1
+            histogram[2] += seconds
+
+    def end(self, timings):
+        for phase in timings.timings:
+            self.observe(timings.exchange, timings.name, phase, timings.timings[phase])
+        key = (timings.exchange, timings.name)
+        with self.lock:
+            counters = self.counters.get(key)
+            if counters is None:
+                counters = self.counters[key] = {'requests': 0, 'errors': 0, 'retries': 0, 'bytes_sent': 0, 'bytes_received': 0}
+            counters['requests'] += 1
+            counters['errors'] += 1 if timings.error is not None else 0
+            counters['retries'] += 1 if timings.retries else 0
+            counters['bytes_sent'] += timings.bytes_sent
+            counters['bytes_received'] += timings.bytes_received
+
+    def percentile(self, name, phase='total', q=0.5, exchange=None):
+        """The upper bound of the bucket holding the q quantile of a phase, None without observations"""
+        buckets = None
+        with self.lock:
+            for key in self.histograms:
+                if key[1] == name and key[2] == phase and (exchange is None or key[0] == exchange):
+                    counts = self.histograms[key][0]
+                    buckets = list(counts) if buckets is None else [a + b for a, b in zip(buckets, counts)]
+        if not buckets:
+            return None
+        rank = q * sum(buckets)
+        seen = 0
+        for i in range(0, len(buckets)):
+            seen += buckets[i]
+            if seen >= rank and seen > 0:
+                return self.bounds[i] if i < len(self.bounds) else float('inf')
+        return float('inf')
+
+    def snapshot(self):
+        """{(exchange, name, phase): {'buckets', 'count', 'sum'}} and {(exchange, name): counters}"""
+        with self.lock:
+            histograms = dict((key, {'buckets': list(value[0]), 'count': value[1], 'sum': value[2]}) for key, value in self.histograms.items())
+            counters = dict((key, dict(value)) for key, value in self.counters.items())
+        return histograms, counters
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def prometheus(self, prefix='ccxt'):
+        histograms, counters = self.snapshot()
+        lines = [
+            '# TYPE %s_phase_seconds histogram' % prefix,
+        ]
+        for key in sorted(histograms):
+            labels = 'exchange="%s",name="%s",phase="%s"' % key
+            histogram = histograms[key]
+            cumulative = 0
+            for i in range(0, len(self.bounds)):
+                cumulative += histogram['buckets'][i]
+                lines.append('%s_phase_seconds_bucket{%s,le="%g"} %d' % (prefix, labels, self.bounds[i], cumulative))
+            lines.append('%s_phase_seconds_bucket{%s,le="+Inf"} %d' % (prefix, labels, histogram['count']))
+            lines.append('%s_phase_seconds_sum{%s} %.9f' % (prefix, labels, histogram['sum']))
+            lines.append('%s_phase_seconds_count{%s} %d' % (prefix, labels, histogram['count']))
+        for counter in ['requests', 'errors', 'retries', 'bytes_sent', 'bytes_received']:
+            lines.append('# TYPE %s_%s_total counter' % (prefix, counter))
+            for key in sorted(counters):
+                lines.append('%s_%s_total{exchange="%s",name="%s"} %d' % ((prefix, counter) + key + (counters[key][counter],)))
+        return '\n'.join(lines) + '\n'
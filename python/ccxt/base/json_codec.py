@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""JSON decoding with the fastest installed backend
+
+orjson, ujson and simdjson are used in that order when they are installed,
+pip install orjson is enough to speed up parsing the responses, otherwise
+the json module of the standard library is used. Whatever a backend rejects,
+like NaN values, is retried with the json module, so every backend accepts
+the same documents. orjson decodes integers wider than 64 bits to floats
+instead of rejecting them, the documents with a number of 19 digits or more
+are decoded by the json module to keep such integers exact.
+
+The codecs only decode. Request bodies are signed, so Exchange.json keeps
+encoding them with the json module: the other encoders escape non-ASCII
+characters differently, write NaN as null and reject wide integers."""
+
+# -----------------------------------------------------------------------------
+
+import importlib
+import json
+import re
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'JsonCodec',
+    'get_json_codec',
+    'set_json_codec',
+]
+
+# -----------------------------------------------------------------------------
+
+# a number of 19 digits or more may not fit in 64 bits, it follows [ , or : unless
+# it is the whole document, digits inside strings only cost a slower decoding
+wide_integer = re.compile(r'(?:^|[\[,:])\s*-?[0-9]{19}')
+wide_integer_bytes = re.compile(br'(?:^|[\[,:])\s*-?[0-9]{19}')
+
+# -----------------------------------------------------------------------------
+
+
+class JsonCodec(object):
+    """The json module of the standard library, loads() takes str or UTF-8 bytes"""
+
+    name = 'json'
+
+    def loads(self, data):
+        if isinstance(data, bytes) and not isinstance(data, str):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+
+    name = 'orjson'
+
+    def __init__(self):
+        self.module = importlib.import_module('orjson')
+
+    def loads(self, data):
+        pattern = wide_integer_bytes if isinstance(data, bytes) else wide_integer
+        if pattern.search(data):
+            return JsonCodec.loads(self, data)
+        try:
+            return self.module.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data)
+
+
+class UjsonCodec(JsonCodec):
+
+    name = 'ujson'
+
+    def __init__(self):
+        self.module = importlib.import_module('ujson')
+
+    def loads(self, data):
+        try:
+            return self.module.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data)
+
+
+class SimdjsonCodec(JsonCodec):
+
+    name = 'simdjson'
+
+    def __init__(self):
+        self.module = importlib.import_module('simdjson')
+
+    def loads(self, data):
+        try:
+            return self.module.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data)
+
+
+codecs = [OrjsonCodec, UjsonCodec, SimdjsonCodec, JsonCodec]
+codec = None
+
+
+def get_json_codec():
+    """Returns the codec used by Exchange.parse_json, Exchange.unjson and websocket messages"""
+    if codec is None:
+        set_json_codec()
+    return codec
+
+
+def set_json_codec(name=None):
+    """Selects a codec by its name or the fastest installed one, returns it"""
+    global codec
+    for codec_class in codecs:
+        if name is None or name == codec_class.name:
+            try:
+                codec = codec_class()
+                return codec
+            except ImportError:
+                if name is not None:
+                    raise
+    raise ValueError('unknown json codec ' + str(name))
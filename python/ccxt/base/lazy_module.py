@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""Lazy loading of the exchange classes of the ccxt and ccxt.async_support packages"""
+
+# -----------------------------------------------------------------------------
+
+import importlib
+import sys
+from types import ModuleType
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'ExchangesModule',
+    'load_exchanges',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class ExchangesModule(ModuleType):
+    """A package that imports the module of an exchange when its class is first accessed
+
+    The ids are read from the exchanges list of the package, ccxt.binance
+    imports ccxt/binance.py and caches the binance class on the package.
+    The import system binds every submodule it loads to its parent package,
+    including the modules an exchange imports its base class from, so an
+    exchange module is replaced with its class whenever it gets bound."""
+
+    def __getattr__(self, name):
+        if name in self.__dict__.get('exchanges', ()):
+            module = importlib.import_module(self.__name__ + '.' + name)
+            exchange = getattr(module, name)
+            setattr(self, name, exchange)
+            return exchange
+        raise AttributeError("module '" + self.__name__ + "' has no attribute '" + name + "'")
+
+    def __setattr__(self, name, value):
+        if isinstance(value, ModuleType) and name in self.__dict__.get('exchanges', ()) and hasattr(value, name):
+            value = getattr(value, name)
+        super(ExchangesModule, self).__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super(ExchangesModule, self).__dir__()) | set(self.__dict__.get('exchanges', ())))
+
+
+def load_exchanges(name):
+    """Makes the exchange classes of a package load on first access, imports them all if the Python version can not"""
+    module = sys.modules[name]
+    if sys.version_info >= (3, 5):
+        # module classes can be reassigned since Python 3.5
+        module.__class__ = ExchangesModule
+    else:
+        for id in module.exchanges:
+            setattr(module, id, getattr(importlib.import_module(name + '.' + id), id))
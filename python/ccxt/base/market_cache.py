@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""On-disk cache of the markets and currencies loaded by Exchange.load_markets"""
+
+# -----------------------------------------------------------------------------
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'MarketCache',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class MarketCache(object):
+    """Stores the market index of an exchange in a JSON file
+
+    A path ending with .json or .json.gz is a single file, which is how a
+    prebuilt index is shipped (see Exchange.save_markets_cache). Any other
+    path is a directory, where every exchange gets a file named after its id
+    and cache key. Missing directories are created on the first write. Files
+    ending with .gz are compressed. An entry is only used while its key matches the key of
+    the exchange (the ccxt version, the exchange version and its urls) and
+    it is not older than ttl milliseconds, a ttl of None never expires.
+
+    Any object with the same read() and write() methods can be used as the
+    Exchange.marketsCache backend instead."""
+
+    def __init__(self, path, ttl=None):
+        self.path = path
+        self.ttl = ttl
+
+    def is_directory(self):
+        if os.path.isdir(self.path):
+            return True
+        return not (self.path.endswith('.json') or self.path.endswith('.json.gz'))
+
+    def filename(self, id, key):
+        if self.is_directory():
+            digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+            return os.path.join(self.path, id + '-' + digest + '.json')
+        return self.path
+
+    def read(self, id, key):
+        """Returns the stored snapshot or None if there is no usable one"""
+        filename = self.filename(id, key)
+        try:
+            with (gzip.open(filename, 'rb') if filename.endswith('.gz') else open(filename, 'rb')) as file:
+                entry = json.loads(file.read().decode('utf-8'))
+        except (IOError, OSError, ValueError):
+            return None
+        if entry.get('id') != id or entry.get('key') != key:
+            return None
+        if self.ttl is not None and (time.time() * 1000 - entry.get('timestamp', 0)) > self.ttl:
+            return None
+        return entry.get('snapshot')
+
+    def write(self, id, key, snapshot):
+        filename = self.filename(id, key)
+        data = json.dumps({
+            'id': id,
+            'key': key,
+            'timestamp': int(time.time() * 1000),
+            'snapshot': snapshot,
+        }, separators=(',', ':')).encode('utf-8')
+        directory = os.path.dirname(filename)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):  # created by another process in the meantime
+                    raise
+        # write to a temporary file and rename it, so concurrent readers never see a partial file
+        temporary = filename + '.' + str(os.getpid()) + '.tmp'
+        with (gzip.open(temporary, 'wb') if filename.endswith('.gz') else open(temporary, 'wb')) as file:
+            file.write(data)
+        rename = getattr(os, 'replace', os.rename)  # os.replace is Python 3.3+
+        rename(temporary, filename)
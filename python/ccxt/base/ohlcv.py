@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""Columnar OHLCV candles in NumPy structured arrays, see Exchange.ohlcvFormat
+
+NumPy is an optional dependency, it is imported on first use."""
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.errors import NotSupported
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'OHLCV_FIELDS',
+    'ohlcv_array',
+    'parse_ohlcv_array',
+    'resample_ohlcv',
+    'sort_ohlcv_array',
+]
+
+# -----------------------------------------------------------------------------
+
+OHLCV_FIELDS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+numpy = None
+
+
+def load_numpy():
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise NotSupported('the numpy ohlcvFormat requires numpy, pip install numpy')
+    return numpy
+
+
+def parse_timeframe(timeframe):
+    from ccxt.base.exchange import Exchange  # the exchange module imports this one
+    return Exchange.parse_timeframe(timeframe)
+
+
+def ohlcv_dtype():
+    np = load_numpy()
+    return np.dtype([('timestamp', np.int64)] + [(field, np.float64) for field in OHLCV_FIELDS[1:]])
+
+
+def ohlcv_array(ohlcvs):
+    """Converts [timestamp, open, high, low, close, volume] rows to a structured array, None becomes NaN"""
+    np = load_numpy()
+    result = np.empty(len(ohlcvs), dtype=ohlcv_dtype())
+    if len(ohlcvs):
+        try:
+            # numbers and numeric strings are converted in one pass
+            values = np.array([ohlcv[0:6] for ohlcv in ohlcvs], dtype=np.float64)
+        except TypeError:
+            values = np.array([[np.nan if value is None else value for value in ohlcv[0:6]] for ohlcv in ohlcvs], dtype=np.float64)
+        result['timestamp'] = values[:, 0]
+        for i in range(1, 6):
+            result[OHLCV_FIELDS[i]] = values[:, i]
+    return result
+
+
+def positional(exchange, ohlcvs, market, timeframe):
+    """Whether the raw rows hold the timestamp, open, high, low, close and volume in their first six columns
+
+    The first and the last row are parsed by the exchange and compared, all the
+    rows of a response are expected to have the same layout."""
+    for ohlcv in [ohlcvs[0], ohlcvs[-1]]:
+        if not isinstance(ohlcv, (list, tuple)) or len(ohlcv) < 6:
+            return False
+        try:
+            if exchange.parse_ohlcv(ohlcv, market, timeframe) != [int(float(ohlcv[0]))] + [float(value) for value in ohlcv[1:6]]:
+                return False
+        except (TypeError, ValueError):
+            return False
+    return True
+
+
+def parse_ohlcv_array(exchange, ohlcvs, market=None, timeframe='1m', since=None, limit=None):
+    """Exchange.parse_ohlcvs for the numpy ohlcvFormat, same filtering and order as the lists"""
+    ohlcvs = exchange.to_array(ohlcvs)
+    if len(ohlcvs) and not positional(exchange, ohlcvs, market, timeframe):
+        ohlcvs = [exchange.parse_ohlcv(ohlcv, market, timeframe, since, limit) for ohlcv in ohlcvs]
+    try:
+        result = ohlcv_array(ohlcvs)
+    except (TypeError, ValueError):
+        result = ohlcv_array([exchange.parse_ohlcv(ohlcv, market, timeframe, since, limit) for ohlcv in ohlcvs])
+    if since:
+        result = result[result['timestamp'] >= since]
+    if limit:
+        result = result[:limit]
+    return sort_ohlcv_array(result, 0)
+
+
+def sort_ohlcv_array(array, key, descending=False):
+    """Exchange.sort_by for structured arrays, the key is a field name or its index"""
+    np = load_numpy()
+    field = array.dtype.names[key] if isinstance(key, int) else key
+    column = array[field]
+    if len(column) > 1 and not descending and np.all(column[1:] >= column[:-1]):
+        return array  # exchanges mostly return sorted candles
+    # equal keys keep their order like in sorted()
+    return array[np.argsort(-column if descending else column, kind='stable')]
+
+
+def ohlcv_columns(ohlcvs):
+    """A structured array of the candles given as lists, a structured array or a dict of columns"""
+    np = load_numpy()
+    if hasattr(ohlcvs, 'dtype'):
+        return ohlcvs
+    if isinstance(ohlcvs, dict):
+        result = np.empty(len(ohlcvs['timestamp']), dtype=ohlcv_dtype())
+        for field in OHLCV_FIELDS:
+            result[field] = ohlcvs[field]
+        return result
+    return ohlcv_array(ohlcvs)
+
+
+def resample_ohlcv(ohlcvs, timeframe='1h', fill_gaps=True):
+    """Rolls candles up into a coarser timeframe, see Exchange.resample_ohlcv
+
+    The candles are grouped by their timestamp rounded down to the timeframe,
+    like round_timeframe, the open is the first open of a group, the close the
+    last close, high and low the maximum and minimum ignoring NaN and the volume
+    the sum. With fill_gaps the periods without candles get a candle at the
+    previous close with a volume of 0. The last candle covers the candles
+    received so far even if its period is not over yet. The candles are
+    returned in the form they were given, lists, a structured array or a dict
+    of columns."""
+    np = load_numpy()
+    array = ohlcv_columns(ohlcvs)
+    dtype = ohlcv_dtype()
+    timestamps = array['timestamp'].astype(np.int64)
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        array = array[order]
+        timestamps = timestamps[order]
+    duration = parse_timeframe(timeframe) * 1000
+    openings = timestamps - timestamps % duration
+    starts = np.concatenate(([0], np.flatnonzero(openings[1:] != openings[:-1]) + 1)) if len(openings) else np.empty(0, dtype=np.int64)
+    ends = np.append(starts[1:], len(openings)).astype(np.int64)
+    if len(starts) and fill_gaps:
+        # the position of every candle in the complete range of periods
+        positions = (openings[starts] - openings[0]) // duration
+        result = np.empty(positions[-1] + 1, dtype=dtype)
+        result['timestamp'] = openings[0] + np.arange(len(result), dtype=np.int64) * duration
+        # the index of the last candle at or before every period carries its close forward
+        previous = np.zeros(len(result), dtype=np.int64)
+        previous[positions] = np.arange(len(starts))
+        closes = array['close'][ends - 1][np.maximum.accumulate(previous)]
+        for field in ['open', 'high', 'low', 'close']:
+            result[field] = closes
+        result['volume'] = 0
+    else:
+        positions = slice(None)
+        result = np.empty(len(starts), dtype=dtype)
+        result['timestamp'] = openings[starts]
+    if len(starts):
+        result['open'][positions] = array['open'][starts]
+        result['high'][positions] = np.fmax.reduceat(array['high'], starts)
+        result['low'][positions] = np.fmin.reduceat(array['low'], starts)
+        result['close'][positions] = array['close'][ends - 1]
+        result['volume'][positions] = np.add.reduceat(np.nan_to_num(array['volume']), starts)
+    if hasattr(ohlcvs, 'dtype'):
+        return result
+    if isinstance(ohlcvs, dict):
+        return dict((field, result[field]) for field in OHLCV_FIELDS)
+    return [list(candle) for candle in result.tolist()]
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+"""Incrementally updated order books"""
+
+# -----------------------------------------------------------------------------
+
+from bisect import bisect_left
+import weakref
+import zlib
+
+try:
+    from collections.abc import Mapping  # Python 3
+except ImportError:
+    from collections import Mapping      # Python 2
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'OrderBook',
+    'OrderBookView',
+    'OrderBookSide',
+    'Asks',
+    'Bids',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class OrderBookSide(object):
+    """One side of an order book sorted from the best price to the worst one
+
+    The price levels are kept in two parallel lists, the sort keys and the
+    [price, amount] pairs, so a level is found with a binary search and
+    inserted or deleted with a single list.insert/del (a memmove) instead of
+    a linear scan in Python. A level is replaced rather than mutated in place,
+    so the lists handed out by limit() are never changed under the consumer."""
+
+    descending = False
+
+    def __init__(self, deltas=None):
+        self.index = []  # sort keys, the price for asks and the negated price for bids
+        self.levels = []  # [price, amount] pairs in the same order
+        if deltas:
+            self.update(deltas)
+
+    def store(self, price, amount):
+        key = -price if self.descending else price
+        index = self.index
+        i = bisect_left(index, key)
+        if i < len(index) and index[i] == key:
+            if amount:
+                self.levels[i] = [price, amount]
+            else:
+                del index[i]
+                del self.levels[i]
+        elif amount:
+            index.insert(i, key)
+            self.levels.insert(i, [price, amount])
+
+    def store_array(self, delta):
+        self.store(delta[0], delta[1])
+
+    def update(self, deltas):
+        for delta in deltas:
+            self.store(delta[0], delta[1])
+
+    def clear(self):
+        self.index = []
+        self.levels = []
+
+    def limit(self, n=None):
+        """Returns the n best levels as a new list of [price, amount] pairs"""
+        return self.levels[:] if n is None else self.levels[:n]
+
+    def best(self):
+        return self.levels[0] if self.levels else None
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __iter__(self):
+        return iter(self.levels)
+
+    def __getitem__(self, item):
+        return self.levels[item]
+
+    def __eq__(self, other):
+        return list(self.levels) == list(other)
+
+    def __repr__(self):
+        return repr(self.levels)
+
+
+class Asks(OrderBookSide):
+    descending = False
+
+
+class Bids(OrderBookSide):
+    descending = True
+
+
+class OrderBookView(Mapping):
+    """A read-only view of the best levels of an OrderBook at a given version
+
+    The levels are only sliced from the live book when a consumer reads
+    'bids' or 'asks'. If the view is still referenced when the book is about
+    to change, the book copies the levels into the view first, so a view
+    always shows the book as it was at its version. Views that are dropped
+    right after the event handlers return are never copied."""
+
+    __slots__ = ('orderbook', 'depth', 'version', 'timestamp', 'datetime', 'nonce', 'frozen', '__weakref__')
+
+    fields = ('bids', 'asks', 'timestamp', 'datetime', 'nonce')
+
+    __hash__ = object.__hash__  # views are tracked in a WeakSet by their book
+
+    def __init__(self, orderbook, limit=None):
+        self.orderbook = orderbook
+        self.depth = limit
+        self.version = orderbook.version
+        self.timestamp = orderbook['timestamp']
+        self.datetime = orderbook['datetime']
+        self.nonce = orderbook['nonce']
+        self.frozen = None
+
+    def freeze(self):
+        if self.frozen is None:
+            self.frozen = {
+                'bids': self.orderbook['bids'].limit(self.depth),
+                'asks': self.orderbook['asks'].limit(self.depth),
+            }
+
+    def __getitem__(self, key):
+        if key == 'bids' or key == 'asks':
+            if self.frozen is not None:
+                return self.frozen[key]
+            return self.orderbook[key].limit(self.depth)
+        if key in self.fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def snapshot(self):
+        """Returns a plain dictionary copy that is safe to keep"""
+        return {key: self[key] for key in self.fields}
+
+    def __repr__(self):
+        return repr(self.snapshot())
+
+
+class OrderBook(dict):
+    """An order book dictionary with sorted Bids and Asks sides and nonce tracking
+
+    Apply updates through apply() and reset() so that the views handed out
+    with view() keep showing the version they were created at."""
+
+    def __init__(self, snapshot=None):
+        super(OrderBook, self).__init__()
+        self.version = 0
+        self.views = weakref.WeakSet()
+        self.reset(snapshot)
+
+    def view(self, limit=None):
+        """Returns a read-only OrderBookView of the n best levels without copying them"""
+        view = OrderBookView(self, limit)
+        self.views.add(view)
+        return view
+
+    def freeze_views(self):
+        for view in list(self.views):
+            view.freeze()
+        self.views.clear()
+
+    def apply(self, bids=None, asks=None):
+        """Stores the [price, amount] deltas, a zero amount removes the level"""
+        if self.views:
+            self.freeze_views()
+        self.version += 1
+        if bids:
+            self['bids'].update(bids)
+        if asks:
+            self['asks'].update(asks)
+        return self
+
+    def reset(self, snapshot=None):
+        if self.views:
+            self.freeze_views()
+        self.version += 1
+        snapshot = snapshot or {}
+        self['bids'] = Bids(snapshot.get('bids'))
+        self['asks'] = Asks(snapshot.get('asks'))
+        self['timestamp'] = snapshot.get('timestamp')
+        self['datetime'] = snapshot.get('datetime')
+        self['nonce'] = snapshot.get('nonce')
+        return self
+
+    def is_stale(self, nonce):
+        """Whether an update with this nonce was already applied to the book"""
+        return (nonce is not None) and (self['nonce'] is not None) and (nonce <= self['nonce'])
+
+    def limit(self, n=None):
+        """Returns a plain dictionary copy of the n best levels on both sides"""
+        return {
+            'bids': self['bids'].limit(n),
+            'asks': self['asks'].limit(n),
+            'timestamp': self['timestamp'],
+            'datetime': self['datetime'],
+            'nonce': self['nonce'],
+        }
+
+    def checksum(self, depth=25, formatter=str):
+        """CRC32 over the interleaved top levels, bid:amount:ask:amount:..., as a signed integer"""
+        bids = self['bids'].levels
+        asks = self['asks'].levels
+        parts = []
+        for i in range(0, depth):
+            if i < len(bids):
+                parts.append(formatter(bids[i][0]))
+                parts.append(formatter(bids[i][1]))
+            if i < len(asks):
+                parts.append(formatter(asks[i][0]))
+                parts.append(formatter(asks[i][1]))
+        crc = zlib.crc32(':'.join(parts).encode()) & 0xffffffff
+        return crc - (1 << 32) if crc >= (1 << 31) else crc
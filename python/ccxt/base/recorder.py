@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""Recorded HTTP responses for offline tests and benchmarks
+
+A RecordingSession or ReplaySession is passed to an exchange as its session,
+Exchange.fetch sends the requests through it as usual:
+
+    store = FixtureStore('fixtures/binance.jsonl.gz')
+    exchange = ccxt.binance({'session': RecordingSession(store)})
+    exchange.fetch_ticker('BTC/USDT')
+    store.save()
+
+    exchange = ccxt.binance({'session': ReplaySession(FixtureStore('fixtures/binance.jsonl.gz'))})
+    exchange.fetch_ticker('BTC/USDT')  # without network access
+
+The responses are matched by method, url and body without the nonce,
+timestamp and signature parameters, which change with every request. The
+request headers, the api keys among them, are not stored, the response
+bodies are stored as they are."""
+
+# -----------------------------------------------------------------------------
+
+import base64
+import datetime
+import gzip
+import json
+import os
+import threading
+
+from requests import Session
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from ccxt.base.errors import ExchangeNotAvailable
+
+try:
+    from urllib.parse import parse_qsl, urlencode, urlsplit  # Python 3
+except ImportError:
+    from urllib import urlencode  # Python 2
+    from urlparse import parse_qsl, urlsplit
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'FixtureStore',
+    'RecordingSession',
+    'ReplaySession',
+]
+
+# -----------------------------------------------------------------------------
+
+# the request parameters that are left out of the keys, compared in lowercase
+ignored_parameters = [
+    'nonce', 'tonce', 'timestamp', 'ts', 'time', 'recvwindow', 'expires',
+    'signature', 'sign', 'sig', 'hmac', 'signaturemethod', 'signatureversion',
+    'apikey', 'api_key', 'key', 'accesskeyid', 'access_key',
+]
+
+# the response headers describing the transfer rather than the body
+skipped_headers = ['content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie']
+
+
+class FixtureStore(object):
+    """The recorded responses by request key, saved as JSON lines, gzipped if the path ends with .gz
+
+    Every request key holds the responses in the order they were recorded,
+    they are replayed in the same order and the last one is repeated. meta
+    is saved with the responses for the tools that recorded them."""
+
+    def __init__(self, path=None, ignore=None):
+        self.path = path
+        self.ignore = set(name.lower() for name in (ignored_parameters if ignore is None else ignore))
+        self.entries = {}
+        self.positions = {}
+        self.meta = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def filter(self, pairs):
+        return sorted((key, value) for key, value in pairs if key.lower() not in self.ignore)
+
+    def key(self, method, url, body=None):
+        parts = urlsplit(str(url))
+        query = urlencode(self.filter(parse_qsl(parts.query, keep_blank_values=True)))
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        if body:
+            try:
+                decoded = json.loads(body)
+                if isinstance(decoded, dict):
+                    decoded = dict(self.filter(decoded.items()))
+                body = json.dumps(decoded, sort_keys=True, separators=(',', ':'))
+            except ValueError:
+                if '=' in body:
+                    body = urlencode(self.filter(parse_qsl(body, keep_blank_values=True)))
+        return ' '.join([method.upper(), parts.scheme + '://' + parts.netloc + parts.path, query, body or ''])
+
+    def add(self, method, url, body, status, reason, headers, content, encoding=None):
+        entry = {
+            'key': self.key(method, url, body),
+            'status': status,
+            'reason': reason,
+            'headers': dict((name, value) for name, value in headers.items() if name.lower() not in skipped_headers),
+            'encoding': encoding,
+        }
+        try:
+            entry['body'] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['body64'] = base64.b64encode(content).decode('ascii')
+        with self.lock:
+            self.entries.setdefault(entry['key'], []).append(entry)
+        return entry
+
+    def response(self, method, url, body=None):
+        """The next recorded response of the request"""
+        key = self.key(method, url, body)
+        with self.lock:
+            entries = self.entries.get(key)
+            if not entries:
+                raise ExchangeNotAvailable(method + ' ' + str(url) + ' was not recorded')
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+        return entries[min(position, len(entries) - 1)]
+
+    @staticmethod
+    def content(entry):
+        if 'body64' in entry:
+            return base64.b64decode(entry['body64'])
+        return entry['body'].encode('utf-8')
+
+    def rewind(self):
+        with self.lock:
+            self.positions = {}
+
+    def open(self, path, mode):
+        return gzip.open(path, mode) if path.endswith('.gz') else open(path, mode)
+
+    def load(self, path):
+        with self.open(path, 'rb') as file:
+            lines = file.read().decode('utf-8').splitlines()
+        for line in lines:
+            entry = json.loads(line)
+            if 'meta' in entry:
+                self.meta = entry['meta']
+            else:
+                self.entries.setdefault(entry['key'], []).append(entry)
+
+    def save(self, path=None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with self.lock:
+            lines = [json.dumps({'meta': self.meta}, sort_keys=True)]
+            for key in sorted(self.entries):
+                lines.extend(json.dumps(entry, sort_keys=True, separators=(',', ':')) for entry in self.entries[key])
+        with self.open(path, 'wb') as file:
+            file.write(('\n'.join(lines) + '\n').encode('utf-8'))
+
+
+class RecordingSession(Session):
+    """A requests session adding every response to a FixtureStore"""
+
+    def __init__(self, store):
+        super(RecordingSession, self).__init__()
+        self.store = store
+
+    def request(self, method, url, data=None, **kwargs):
+        response = super(RecordingSession, self).request(method, url, data=data, **kwargs)
+        self.store.add(method, url, data, response.status_code, response.reason, response.headers, response.content, response.encoding)
+        return response
+
+
+class ReplaySession(Session):
+    """A requests session answering the requests with the responses from a FixtureStore, it does not connect anywhere"""
+
+    def __init__(self, store):
+        super(ReplaySession, self).__init__()
+        self.store = store
+
+    def request(self, method, url, data=None, **kwargs):
+        entry = self.store.response(method, url, data)
+        response = Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = entry['encoding']
+        response._content = FixtureStore.content(entry)
+        response.url = url
+        response.elapsed = datetime.timedelta(0)
+        return response
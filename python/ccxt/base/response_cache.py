@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""Caches of the decoded responses of public endpoints, see Exchange.responseCache"""
+
+# -----------------------------------------------------------------------------
+
+import collections
+import hashlib
+import json
+import os
+import threading
+
+# -----------------------------------------------------------------------------
+
+from ccxt.base.json_codec import get_json_codec
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'ResponseCache',
+    'FileResponseCache',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class ResponseCache(object):
+    """An in-process LRU of [timestamp, response] entries holding at most max_size responses
+
+    The exchange decides whether an entry is fresh from its timestamp, the
+    cache only stores and evicts them. The responses are stored as JSON, so
+    every get() returns a new object that the caller is free to modify. Any
+    object with the same get() and set() methods can be used as a backend."""
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return None
+            self.entries[key] = entry  # most recently used
+        return [entry[0], get_json_codec().loads(entry[1])]
+
+    def set(self, key, response, timestamp):
+        data = json.dumps(response, separators=(',', ':'))
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = [timestamp, data]
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class FileResponseCache(object):
+    """Stores the entries as JSON files in a directory shared by several processes
+
+    Every max_size / 10 writes the least recently written files beyond
+    max_size are removed, the directory holds about max_size responses."""
+
+    def __init__(self, path, max_size=1000):
+        self.path = path
+        self.max_size = max_size
+        self.writes = 0
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def filename(self, key):
+        return os.path.join(self.path, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key):
+        try:
+            with open(self.filename(key), 'rb') as file:
+                entry = get_json_codec().loads(file.read())
+        except (IOError, OSError, ValueError):
+            return None
+        # a hash collision is a miss
+        return [entry['timestamp'], entry['response']] if entry.get('key') == key else None
+
+    def set(self, key, response, timestamp):
+        filename = self.filename(key)
+        temporary = filename + '.' + str(os.getpid()) + '.' + str(threading.current_thread().ident) + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(json.dumps({'key': key, 'timestamp': timestamp, 'response': response}, separators=(',', ':')).encode('utf-8'))
+        rename = getattr(os, 'replace', os.rename)  # os.replace is Python 3.3+
+        rename(temporary, filename)
+        self.writes += 1
+        if self.writes >= max(1, self.max_size // 10):
+            self.writes = 0
+            self.evict(filename)
+
+    def evict(self, keep=None):
+        entries = []
+        for name in os.listdir(self.path):
+            filename = os.path.join(self.path, name)
+            if name.endswith('.json') and filename != keep:
+                try:
+                    entries.append((os.path.getmtime(filename), filename))
+                except OSError:
+                    pass  # removed by another process
+        entries.sort()
+        # the file just written counts but is kept
+        for modified, filename in entries[:max(0, len(entries) + (keep is not None) - self.max_size)]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.path, name))
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+"""Deterministic ECDSA signing (RFC 6979) for Exchange.ecdsa"""
+
+# -----------------------------------------------------------------------------
+
+from ccxt.static_dependencies.ecdsa import rfc6979
+from ccxt.static_dependencies.ecdsa.numbertheory import inverse_mod
+from ccxt.static_dependencies.ecdsa.keys import BadDigestError
+from ccxt.static_dependencies.ecdsa.ecdsa import RSZeroError
+from ccxt.static_dependencies.ecdsa.util import string_to_number
+
+try:
+    from cryptography.hazmat import backends
+    from cryptography.hazmat.primitives.asymmetric import ec
+except ImportError:
+    ec = None
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'Curve',
+    'SigningKey',
+    'signing_key',
+]
+
+# -----------------------------------------------------------------------------
+
+# curves that OpenSSL multiplies faster than the precomputed table below
+NATIVE_CURVES = {
+    'NIST224p': 'SECP224R1',
+    'NIST256p': 'SECP256R1',
+    'NIST384p': 'SECP384R1',
+    'NIST521p': 'SECP521R1',
+}
+
+
+class Curve(object):
+    """Scalar multiplication of the generator of a short Weierstrass curve
+
+    The pure Python implementation works in Jacobian coordinates, so a point
+    addition does not need a modular inversion, and adds up precomputed
+    multiples of the generator, one per 6-bit window of the scalar, so there
+    are no doublings at all. The table is built on first use. When the curve
+    is implemented natively by the cryptography package the multiplication
+    is done by OpenSSL instead."""
+
+    window = 6  # 2 ** 6 points per row, about 30ms to build for a 256-bit curve
+
+    def __init__(self, curve):
+        self.name = curve.name
+        self.p = curve.curve.p()
+        self.a = curve.curve.a()
+        self.n = curve.order
+        self.baselen = curve.baselen
+        self.gx = curve.generator.x()
+        self.gy = curve.generator.y()
+        self.table = None
+        self.native = None
+        if ec is not None and self.name in NATIVE_CURVES:
+            native = getattr(ec, NATIVE_CURVES[self.name])()
+            backend = backends.default_backend()
+            if backend.elliptic_curve_supported(native):
+                self.native = (native, backend)
+
+    def multiply_generator(self, k):
+        """Returns the affine coordinates of k * G"""
+        if self.native is not None:
+            numbers = ec.derive_private_key(k, self.native[0], self.native[1]).public_key().public_numbers()
+            return numbers.x, numbers.y
+        if self.table is None:
+            self.table = self.precompute()
+        p = self.p
+        mask = (1 << self.window) - 1
+        point = None
+        for row in self.table:
+            digit = k & mask
+            k >>= self.window
+            if digit:
+                x, y = row[digit]
+                point = (x, y, 1) if point is None else self.add(point, x, y)
+            if not k:
+                break
+        if point is None:
+            return None
+        X, Y, Z = point
+        if Z == 0:
+            return None
+        z = inverse_mod(Z, p)
+        zz = z * z % p
+        return X * zz % p, Y * zz * z % p
+
+    def double(self, point):
+        X, Y, Z = point
+        p = self.p
+        if Y == 0 or Z == 0:
+            return (0, 1, 0)
+        YY = Y * Y % p
+        S = 4 * X * YY % p
+        M = (3 * X * X + self.a * pow(Z, 4, p)) % p
+        X3 = (M * M - 2 * S) % p
+        return X3, (M * (S - X3) - 8 * YY * YY) % p, 2 * Y * Z % p
+
+    def add(self, point, x, y):
+        """Adds the affine point (x, y) to the Jacobian point"""
+        X1, Y1, Z1 = point
+        p = self.p
+        if Z1 == 0:
+            return (x, y, 1)
+        ZZ = Z1 * Z1 % p
+        H = (x * ZZ - X1) % p
+        R = (y * ZZ * Z1 - Y1) % p
+        if H == 0:
+            return self.double(point) if R == 0 else (0, 1, 0)
+        HH = H * H % p
+        HHH = H * HH % p
+        V = X1 * HH % p
+        X3 = (R * R - HHH - 2 * V) % p
+        return X3, (R * (V - X3) - Y1 * HHH) % p, Z1 * H % p
+
+    def normalize(self, points):
+        """Converts a list of Jacobian points to affine with a single modular inversion"""
+        p = self.p
+        products = []
+        acc = 1
+        for X, Y, Z in points:
+            acc = acc * Z % p
+            products.append(acc)
+        inverse = inverse_mod(acc, p)
+        result = [None] * len(points)
+        for i in range(len(points) - 1, -1, -1):
+            X, Y, Z = points[i]
+            z = inverse * products[i - 1] % p if i else inverse
+            inverse = inverse * Z % p
+            zz = z * z % p
+            result[i] = (X * zz % p, Y * zz * z % p)
+        return result
+
+    def precompute(self):
+        """table[i][j] is j * 2 ** (window * i) * G in affine coordinates"""
+        size = 1 << self.window
+        rows = (self.n.bit_length() + self.window - 1) // self.window
+        table = []
+        x, y = self.gx, self.gy
+        for i in range(0, rows):
+            points = [(x, y, 1)]
+            for j in range(2, size + 1):
+                points.append(self.add(points[-1], x, y))
+            affine = self.normalize(points)
+            table.append([None] + affine[:-1])
+            x, y = affine[-1]
+        return table
+
+
+class SigningKey(object):
+    """A private key on one of the curves of the vendored ecdsa package
+
+    Produces the same signatures as SigningKey.sign_digest_deterministic()
+    of the vendored package with sigencode_strings_canonize, without computing
+    the public key and with a faster multiplication of the generator."""
+
+    curves = {}
+
+    def __init__(self, secret, curve):
+        if curve.name not in SigningKey.curves:
+            SigningKey.curves[curve.name] = Curve(curve)
+        self.curve = SigningKey.curves[curve.name]
+        assert len(secret) == curve.baselen, (len(secret), curve.baselen)
+        self.secexp = string_to_number(secret)
+        self.order = curve.order
+        assert 1 <= self.secexp < self.order
+
+    def sign_number(self, number, k):
+        n = self.order
+        point = self.curve.multiply_generator(k % n)
+        x, y = point if point is not None else (0, 0)
+        r = x % n
+        if r == 0:
+            raise RSZeroError('amazingly unlucky random number r')
+        s = (inverse_mod(k, n) * (number + (self.secexp * r) % n)) % n
+        if s == 0:
+            raise RSZeroError('amazingly unlucky random number s')
+        v = y % 2 or (2 if x == k else 0)
+        # canonical low-s form
+        if s > n / 2:
+            s = n - s
+            v ^= 1
+        return r, s, v
+
+    def sign_digest_deterministic(self, digest, hashfunc, extra_entropy=b''):
+        """Returns the (r, s, v) integers of the canonical signature of the digest"""
+        if len(digest) > self.curve.baselen:
+            raise BadDigestError('this curve (%s) is too short for your digest (%d)' % (self.curve.name, 8 * len(digest)))
+        number = string_to_number(digest)
+        retry_gen = 0
+        while True:
+            k = rfc6979.generate_k(self.order, self.secexp, hashfunc, digest, retry_gen=retry_gen, extra_entropy=extra_entropy)
+            try:
+                return self.sign_number(number, k)
+            except RSZeroError:
+                retry_gen += 1
+
+
+keys = {}
+
+
+def signing_key(secret, curve):
+    """Returns a cached SigningKey for the binary secret on the vendored ecdsa curve"""
+    key = (secret, curve.name)
+    if key not in keys:
+        if len(keys) >= 64:
+            keys.clear()
+        keys[key] = SigningKey(secret, curve)
+    return keys[key]
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""Token bucket rate limiting shared by the sync and async exchange classes"""
+
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+
+try:
+    from time import monotonic  # Python 3
+except ImportError:
+    from time import time as monotonic  # Python 2
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'TokenBucket',
+    'Throttle',
+    'RateLimitFeedback',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class TokenBucket(object):
+    """A single token bucket, refillRate is measured in tokens per millisecond"""
+
+    def __init__(self, config=None, now=None):
+        config = config or {}
+        self.refillRate = config.get('refillRate', 0.001)
+        self.capacity = config.get('capacity', 1.0)
+        self.numTokens = config.get('numTokens', 0)
+        self.lastTimestamp = monotonic() if now is None else now
+
+    def refill(self, now):
+        elapsed = now - self.lastTimestamp
+        self.lastTimestamp = now
+        self.numTokens = min(self.capacity, self.numTokens + elapsed * self.refillRate * 1000)
+
+    def delay(self, num_tokens=0):
+        """Seconds until the bucket holds at least num_tokens"""
+        deficit = num_tokens - self.numTokens
+        if deficit <= 0:
+            return 0.0
+        return deficit / (self.refillRate * 1000)
+
+    def take(self, cost):
+        self.numTokens -= cost
+
+
+class Throttle(object):
+    """Blocking rate limiter over one or more token buckets
+
+    A request may be charged to several buckets at once (per IP, per account,
+    per endpoint family), it is released when all of them are non-negative.
+    The cost is reserved up front and the caller sleeps until its turn, so
+    consecutive callers are served in order without polling. Reservations
+    are made under a lock, threads sharing an exchange instance sleep
+    concurrently and are released at the rate of the buckets."""
+
+    def __init__(self, config=None, buckets=None):
+        config = config or {}
+        self.defaultCost = config.get('defaultCost', 1.0)
+        self.rateLimit = config.get('rateLimit')
+        now = monotonic()
+        self.buckets = {
+            'default': TokenBucket(config, now),
+        }
+        for name, bucket_config in (buckets or {}).items():
+            self.buckets[name] = TokenBucket(bucket_config, now)
+        self.totalDelay = 0.0
+        self.lock = threading.Lock()
+
+    def costs(self, cost=None):
+        """Normalizes a number or a {bucket: cost} dictionary to a {bucket: cost} dictionary"""
+        if cost is None:
+            return {'default': self.defaultCost}
+        if isinstance(cost, dict):
+            # buckets that are not configured on this instance are not charged
+            return {name: cost[name] for name in cost if name in self.buckets}
+        return {'default': cost}
+
+    def reserve(self, cost=None, now=None):
+        """Charges the cost and returns the number of seconds to wait before sending the request"""
+        costs = self.costs(cost)
+        delay = 0.0
+        with self.lock:
+            now = monotonic() if now is None else now
+            for name in costs:
+                bucket = self.buckets[name]
+                bucket.refill(now)
+                delay = max(delay, bucket.delay())
+            for name in costs:
+                self.buckets[name].take(costs[name])
+            self.totalDelay += delay
+        return delay
+
+    def __call__(self, rate_limit=None, cost=None):
+        if rate_limit is not None and rate_limit != self.rateLimit:
+            # only recompute the refill rate when the exchange rateLimit has actually changed
+            with self.lock:
+                self.rateLimit = rate_limit
+                self.buckets['default'].refillRate = 1 / rate_limit
+        delay = self.reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimitFeedback(object):
+    """Adjusts a token bucket at runtime from the rate limit headers of the exchange
+
+    The configuration maps the values the controller needs to header names:
+        'used': the weight already used in the current window
+        'remaining': the weight remaining in the current window
+        'limit': the weight allowed per window, a header name or a number
+        'reset': the unix timestamp in seconds when the current window resets
+        'window': the window length in milliseconds, used when there is no reset header
+        'reserve': the fraction of the limit that is never spent, 0.05 by default
+
+    The remaining budget is spread over the rest of the window, the bucket is
+    slowed down as soon as it would otherwise run out before the window resets
+    and it is blocked until the reset when nothing is left, so the client backs
+    off before the exchange answers with a 429 or a 418. A Retry-After header
+    blocks the bucket for the requested number of seconds."""
+
+    def __init__(self, bucket, config, clock=None, lock=None):
+        self.bucket = bucket
+        self.config = config
+        self.clock = clock or monotonic
+        self.lock = lock or threading.Lock()  # the lock of the Throttle that owns the bucket
+        self.refillRate = bucket.refillRate
+        self.capacity = bucket.capacity
+        self.remaining = None
+        self.resetIn = None
+
+    def header(self, headers, key):
+        name = self.config.get(key)
+        if name is None:
+            return None
+        if not isinstance(name, str):
+            return float(name)
+        value = headers.get(name)
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def block(self, milliseconds):
+        self.bucket.numTokens = min(self.bucket.numTokens, -milliseconds * self.bucket.refillRate)
+
+    def update(self, headers, timestamp):
+        """Feeds the response headers received at timestamp (in milliseconds) into the bucket"""
+        if headers is None:
+            return
+        with self.lock:
+            self.adjust(headers, timestamp)
+
+    def adjust(self, headers, timestamp):
+        self.bucket.refill(self.clock())
+        retry_after = headers.get('Retry-After')
+        if retry_after is not None and retry_after.isdigit():
+            self.bucket.refillRate = self.refillRate
+            self.block(int(retry_after) * 1000)
+            return
+        limit = self.header(headers, 'limit')
+        remaining = self.header(headers, 'remaining')
+        if remaining is None:
+            used = self.header(headers, 'used')
+            if used is None or limit is None:
+                return
+            remaining = limit - used
+        reset = self.header(headers, 'reset')
+        if reset is not None:
+            reset_in = reset * 1000 - timestamp
+        else:
+            window = self.config.get('window', 60000)
+            reset_in = window - timestamp % window
+        reset_in = max(reset_in, 1)
+        self.remaining = remaining
+        self.resetIn = reset_in
+        budget = remaining - self.config.get('reserve', 0.05) * (limit or 0)
+        if budget <= 0:
+            self.bucket.refillRate = self.refillRate
+            self.bucket.capacity = self.capacity
+            self.block(reset_in)
+            return
+        rate = budget / reset_in
+        if rate < self.refillRate:
+            # slow down to make the remaining budget last until the reset
+            self.bucket.refillRate = rate
+            self.bucket.capacity = min(self.capacity, budget)
+        else:
+            self.bucket.refillRate = self.refillRate
+            self.bucket.capacity = self.capacity
@@ -74,7 +74,6 @@ setup(
         'certifi>=2018.1.18',
         'requests>=2.18.4',
         'cryptography>=2.6.1',
-        'autobahn>=18.6.1',
         'pyee>=7.0.1',
     ],
 
@@ -84,6 +83,12 @@ setup(
             'aiodns==1.1.1',
             'yarl==1.1.0',
         ],
+        'json': [
+            'orjson>=3.0.0',
+        ],
+        'numpy': [
+            'numpy>=1.13.0',
+        ],
         'qa': [
             'flake8==3.5.0'
         ],
@@ -19,6 +19,7 @@ sys.path.append(root)
 # ------------------------------------------------------------------------------
 
 import ccxt  # noqa: E402
+from ccxt.base.recorder import FixtureStore, RecordingSession, ReplaySession  # noqa: E402
 
 # ------------------------------------------------------------------------------
 
@@ -29,6 +30,8 @@ class Argv(object):
     nonce = None
     exchange = None
     symbol = None
+    record = None
+    replay = None
     pass
 
 
@@ -38,12 +41,15 @@ parser = argparse.ArgumentParser()
 
 parser.add_argument('--verbose', action='store_true', help='enable verbose output')
 parser.add_argument('--nonce', type=int, help='integer')
+parser.add_argument('--record', type=str, help='save the responses to fixtures in this folder')
+parser.add_argument('--replay', type=str, help='answer the requests with the responses from the fixtures in this folder')
 parser.add_argument('exchange', type=str, help='exchange id in lowercase', nargs='?')
 parser.add_argument('symbol', type=str, help='symbol in uppercase', nargs='?')
 
 parser.parse_args(namespace=argv)
 
 exchanges = {}
+fixture_stores = []
 
 # ------------------------------------------------------------------------------
 
@@ -380,6 +386,10 @@ for id in ccxt.exchanges:
         exchange_config.update({'enableRateLimit': True})
     if id in config:
         exchange_config = ccxt.Exchange.deep_extend(exchange_config, config[id])
+    if argv.record or argv.replay:
+        store = FixtureStore(os.path.join(argv.record or argv.replay, id + '.jsonl.gz'))
+        fixture_stores.append(store)
+        exchange_config['session'] = RecordingSession(store) if argv.record else ReplaySession(store)
     exchanges[id] = exchange(exchange_config)
 
 # ------------------------------------------------------------------------------
@@ -415,3 +425,6 @@ def main():
 
 if __name__ == '__main__':
     main()
+    for store in fixture_stores:
+        if argv.record and store.entries:
+            store.save()
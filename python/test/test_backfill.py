@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.base.errors import ExchangeNotAvailable  # noqa: E402
+from ccxt.base.ohlcv import ohlcv_array  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+minute = 60000
+# 1000 candles with nothing traded from the 500th to the 509th minute
+candles = [[i * minute, 1, 2, 0.5, 1.5, 10] for i in range(0, 1000) if not 500 <= i < 510]
+
+
+class Exchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'test',
+            'options': {'paginate': {'fetchOHLCV': {'limit': 100}}},
+        })
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        if since in self.failing:
+            raise ExchangeNotAvailable('failing window')
+        self.inflight += 1
+        self.concurrent = max(self.concurrent, self.inflight)
+        await asyncio.sleep(0.001)
+        self.inflight -= 1
+        self.requests += 1
+        # the exchange returns at most 60 candles, less than the limit
+        page = [candle for candle in candles if candle[0] >= since][:min(limit, 60)]
+        return ohlcv_array(page) if self.ohlcvFormat == 'numpy' else page
+
+
+async def test_backfill(loop):
+    exchange = Exchange({'asyncio_loop': loop})
+    exchange.failing = []
+    exchange.inflight = exchange.concurrent = exchange.requests = 0
+    backfill = await exchange.backfill_ohlcv('BTC/USDT', '1m', 30, 1000 * minute, concurrency=4)
+    assert backfill.candles == candles
+    assert backfill.gaps == [[500 * minute, 510 * minute]]
+    assert exchange.concurrent == 4
+    assert backfill.fetched == 10
+
+    # without the rate limiter the windows are fetched one at a time by default
+    exchange.concurrent = 0
+    await exchange.backfill_ohlcv('BTC/USDT', '1m', 30, 1000 * minute)
+    assert exchange.concurrent == 1
+
+    # an interrupted backfill resumes from the checkpoint
+    checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint.jsonl')
+    exchange.failing = [300 * minute, 700 * minute]
+    try:
+        await exchange.backfill_ohlcv('BTC/USDT', '1m', 0, 1000 * minute, checkpoint=checkpoint)
+        assert False
+    except ExchangeNotAvailable:
+        pass
+    with open(checkpoint, 'a') as file:
+        file.write('{"window":')  # cut short
+    exchange.failing = []
+    exchange.requests = 0
+    backfill = await exchange.backfill_ohlcv('BTC/USDT', '1m', 0, 1000 * minute, checkpoint=checkpoint)
+    assert backfill.fetched == 2 and exchange.requests == 4
+    assert backfill.candles == candles
+
+    # a later until fetches the last window again
+    backfill = await exchange.backfill_ohlcv('BTC/USDT', '1m', 0, 1050 * minute, checkpoint=checkpoint)
+    assert backfill.fetched == 1
+    assert backfill.gaps == [[500 * minute, 510 * minute], [1000 * minute, 1050 * minute]]
+    os.remove(checkpoint)
+
+    # the candles of the numpy ohlcvFormat are checkpointed as lists
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        numpy = None
+    if numpy is not None:
+        exchange.ohlcvFormat = 'numpy'
+        backfill = await exchange.backfill_ohlcv('BTC/USDT', '1m', 0, 1000 * minute, checkpoint=checkpoint)
+        assert backfill.candles.tolist() == ohlcv_array(candles).tolist()
+        assert backfill.gaps == [[500 * minute, 510 * minute]]
+        backfill = await exchange.backfill_ohlcv('BTC/USDT', '1m', 0, 1000 * minute, checkpoint=checkpoint)
+        assert backfill.fetched == 0 and len(backfill.candles) == len(candles)
+        os.remove(checkpoint)
+        exchange.ohlcvFormat = None
+    await exchange.close()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_backfill(loop))
+loop.close()
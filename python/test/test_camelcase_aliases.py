@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class Exchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'test',
+            'api': {
+                'public': {
+                    'get': ['ticker/{symbol}'],
+                },
+            },
+        })
+
+    def fetch_ticker(self, symbol, params={}):
+        return symbol
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return timeframe
+
+
+first = Exchange()
+second = Exchange({'markets_loading': True})
+
+# methods are aliased once on the class
+assert '_defined_camelcase' in Exchange.__dict__
+assert first.fetchTicker('BTC/USDT') == 'BTC/USDT'
+assert second.fetchOHLCV('BTC/USDT', '1h') == '1h'
+assert Exchange.__dict__['fetchTicker'] is Exchange.__dict__['fetch_ticker']
+# static and class methods stay static and class methods
+assert first.safeString({'a': 1}, 'a') == '1'
+assert Exchange.safeString({'a': 1}, 'a') == '1'
+# generated api methods
+assert callable(first.publicGetTickerSymbol) and callable(first.public_get_ticker_symbol)
+# properties of the instance are aliased on the instance
+assert second.marketsLoading is True
+assert 'marketsLoading' not in first.__dict__
+
+# the api methods are regenerated when an instance has a different api
+custom = Exchange({'api': {'public': {'get': ['time']}}})
+assert callable(custom.publicGetTime)
+assert Exchange.__dict__['_defined_api'] == custom.api
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.candles import CandleBuilder  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+generator = random.Random(1)
+start = 1590000000000
+trades = []
+timestamp = start
+for i in range(0, 2000):
+    timestamp += generator.randint(0, 3000)
+    trades.append({'symbol': 'BTC/USDT', 'timestamp': timestamp, 'price': generator.randint(9000, 9100) / 4.0, 'amount': generator.randint(1, 100) / 8.0})
+
+exchange = Exchange()
+
+# ----------------------------------------------------------------------------
+# the streamed candles match build_ohlcv, including the last trade
+
+closed = []
+builder = CandleBuilder(['1s', '1m', '5m', '1h'], max_candles=None, on_close=lambda symbol, timeframe, candle: closed.append([symbol, timeframe, candle]))
+builder.add_trades(trades)
+for timeframe in builder.timeframes:
+    expected = exchange.build_ohlcv(trades, timeframe)
+    assert builder.ohlcv('BTC/USDT', timeframe) == expected, timeframe
+    assert builder.closed('BTC/USDT', timeframe) == expected[:-1]
+    assert builder.partial('BTC/USDT', timeframe) == expected[-1]
+assert exchange.build_ohlcv(trades, '1h')[-1][4] == trades[-1]['price']
+assert closed[0][0:2] == ['BTC/USDT', '1s']
+assert len([entry for entry in closed if entry[1] == '1m']) == len(exchange.build_ohlcv(trades, '1m')) - 1
+
+# symbols are separate
+builder.update('ETH/USDT', start, 200, 1)
+assert builder.ohlcv('ETH/USDT', '1m') == [[start, 200, 200, 200, 200, 1]]
+assert builder.ohlcv('LTC/USDT', '1m') == []
+assert builder.partial('LTC/USDT', '1m') is None
+
+# ----------------------------------------------------------------------------
+# vwap and count, flush and late trades
+
+builder = CandleBuilder(['1m'], vwap=True, count=True, max_candles=2)
+builder.update('BTC/USDT', start + 1000, 10, 1)
+builder.update('BTC/USDT', start + 2000, 20, 3)
+builder.update('BTC/USDT', start + 3000, 15, 0)
+assert builder.partial('BTC/USDT', '1m') == [start, 10, 20, 10, 15, 4, 17.5, 3]
+builder.flush(start + 59999)
+assert builder.closed('BTC/USDT', '1m') == []
+builder.flush(start + 60000)
+assert builder.closed('BTC/USDT', '1m') == [[start, 10, 20, 10, 15, 4, 17.5, 3]]
+assert builder.partial('BTC/USDT', '1m') is None
+builder.update('BTC/USDT', start + 120000, 30, 0)
+assert builder.partial('BTC/USDT', '1m') == [start + 120000, 30, 30, 30, 30, 0, 30, 1]
+builder.update('BTC/USDT', start + 5000, 11, 1)
+assert builder.late == 1
+builder.update('BTC/USDT', start + 180000, 40, 1)
+builder.update('BTC/USDT', start + 240000, 50, 1)
+assert [candle[0] for candle in builder.closed('BTC/USDT', '1m')] == [start + 120000, start + 180000]  # max_candles
+
+# ----------------------------------------------------------------------------
+# the batch mode matches the stream
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    print('numpy is not installed, skipping the batch mode')
+    sys.exit(0)
+
+builder = CandleBuilder(['1s', '1m', '5m', '1h'], vwap=True, count=True, max_candles=None)
+builder.add_trades(trades)
+for trades_argument in [trades, [[trade['timestamp'] for trade in trades], [trade['price'] for trade in trades], [trade['amount'] for trade in trades]]]:
+    arrays = builder.build(trades_argument)
+    for timeframe in builder.timeframes:
+        array = arrays[timeframe]
+        assert array.dtype.names == ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'count')
+        expected = builder.ohlcv('BTC/USDT', timeframe)
+        assert len(array) == len(expected)
+        for candle, row in zip(array.tolist(), expected):
+            assert list(candle[0:6]) == row[0:6]
+            assert abs(candle[6] - row[6]) < 1e-9
+            assert candle[7] == row[7]
+# unsorted trades with distinct timestamps give the same candles
+distinct = list(dict((trade['timestamp'], trade) for trade in trades).values())
+shuffled = list(distinct)
+generator.shuffle(shuffled)
+arrays = CandleBuilder(['1m']).build(shuffled)
+assert arrays['1m'].tolist() == [tuple(candle) for candle in exchange.build_ohlcv(distinct, '1m')]
+assert len(CandleBuilder(['1m']).build([])['1m']) == 0
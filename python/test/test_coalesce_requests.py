@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.base.errors import ExchangeNotAvailable  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class Exchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'test',
+            'enableRateLimit': True,
+            'rateLimit': 50,
+            'coalesceRequests': True,
+            'api': {
+                'public': {'get': ['ticker', 'broken']},
+                'fapiPublic': {'get': ['ticker']},
+                'private': {'get': ['balance']},
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': 'https://test/' + api + '/' + path + '?' + self.urlencode(params), 'method': method, 'body': None, 'headers': None}
+
+    async def fetch(self, url, method='GET', headers=None, body=None):
+        self.requests.append(url)
+        await asyncio.sleep(0.02)
+        if 'broken' in url:
+            raise ExchangeNotAvailable(url)
+        return {'url': url}
+
+
+async def test_coalesce_requests(loop):
+    exchange = Exchange({'asyncio_loop': loop})
+    exchange.requests = []
+    responses = await asyncio.gather(*[exchange.public_get_ticker({'symbol': 'BTCUSDT'}) for i in range(0, 10)])
+    assert exchange.requests == ['https://test/public/ticker?symbol=BTCUSDT']
+    # every caller gets its own copy of the response
+    assert all(response == responses[0] for response in responses)
+    assert all(response is not responses[0] for response in responses[1:])
+    assert exchange.coalescedRequests == {'hits': 9, 'misses': 1}
+    assert exchange.inflight_requests == {}
+
+    # different parameters and private requests are sent separately
+    exchange.requests = []
+    await asyncio.gather(
+        exchange.public_get_ticker({'symbol': 'BTCUSDT'}),
+        exchange.public_get_ticker({'symbol': 'ETHUSDT'}),
+        exchange.private_get_balance(),
+        exchange.private_get_balance(),
+    )
+    assert len(exchange.requests) == 4
+
+    # errors reach every caller, a cancelled caller does not cancel the others
+    results = await asyncio.gather(*[exchange.public_get_broken() for i in range(0, 3)], return_exceptions=True)
+    assert all(isinstance(result, ExchangeNotAvailable) for result in results)
+    first = asyncio.ensure_future(exchange.public_get_ticker())
+    second = asyncio.ensure_future(exchange.public_get_ticker())
+    await asyncio.sleep(0)
+    first.cancel()
+    assert (await second) == {'url': 'https://test/public/ticker?'}
+
+    # a list selects the public api types, private api types are never coalesced
+    exchange.coalesceRequests = ['fapiPublic', 'private']
+    exchange.requests = []
+    await asyncio.gather(*[exchange.fapiPublic_get_ticker() for i in range(0, 3)])
+    await asyncio.gather(*[exchange.public_get_ticker() for i in range(0, 3)])
+    await asyncio.gather(*[exchange.private_get_balance() for i in range(0, 3)])
+    assert len(exchange.requests) == 1 + 3 + 3
+    await exchange.close()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_coalesce_requests(loop))
+loop.close()
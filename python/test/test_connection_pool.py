@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import aiohttp  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base import connection_pool  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+async def test_connection_pool(loop):
+    shared = [ccxt.Exchange({'asyncio_loop': loop, 'connectionPool': True}) for i in range(0, 3)]
+    tuned = ccxt.Exchange({'asyncio_loop': loop, 'connectionPool': {'limit_per_host': 4, 'ttl_dns_cache': 300}})
+    named = ccxt.Exchange({'asyncio_loop': loop, 'connectionPool': {'name': 'binance', 'limit_per_host': 4, 'ttl_dns_cache': 300}})
+    single = ccxt.Exchange({'asyncio_loop': loop})
+    for exchange in shared + [tuned, named, single]:
+        exchange.open()
+
+    # the instances keep their sessions and share the connector
+    connector = shared[0].session.connector
+    assert all(exchange.session.connector is connector for exchange in shared)
+    assert len(set(id(exchange.session) for exchange in shared)) == 3
+    assert tuned.session.connector is not connector and tuned.session.connector.limit_per_host == 4
+    assert named.session.connector is not tuned.session.connector
+    assert single.session.connector is not connector and single.acquired_pool is None
+    # the TLS context is created once
+    assert single.session.connector._ssl is connector._ssl
+
+    # the connector is closed with the last session that uses it
+    await shared[0].close()
+    await shared[0].close()
+    assert not connector.closed
+    await shared[1].close()
+    await shared[2].close()
+    assert connector.closed
+    for exchange in [tuned, named, single]:
+        await exchange.close()
+    assert connection_pool.pools == {}
+
+    # the pool of an instance does not hide the option of a subclass
+    class Shared(ccxt.Exchange):
+        connectionPool = True
+
+    subclassed = Shared({'asyncio_loop': loop})
+    assert subclassed.connectionPool is True
+
+    # a closed pool is not reused
+    reopened = ccxt.Exchange({'asyncio_loop': loop, 'connectionPool': True})
+    reopened.open()
+    assert not reopened.session.connector.closed and reopened.session.connector is not connector
+    await reopened.close()
+
+    # sessions passed in the config are left alone
+    session = aiohttp.ClientSession(loop=loop)
+    custom = ccxt.Exchange({'asyncio_loop': loop, 'session': session, 'connectionPool': True})
+    custom.open()
+    await custom.close()
+    assert not session.closed
+    await session.close()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_connection_pool(loop))
+loop.close()
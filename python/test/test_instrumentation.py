@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base.errors import ExchangeNotAvailable  # noqa: E402
+from ccxt.base.instrumentation import Instrumentation  # noqa: E402
+from ccxt.base.instrumentation import LatencyHistogram  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    orders = 0
+
+    def respond(self, status, body):
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(0.01)
+        self.respond(200, '{"symbol":"BTCUSDT","price":"9000.5"}')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        Handler.orders += 1
+        # every other order request fails
+        self.respond(503 if Handler.orders % 2 else 200, '{"id":"1"}')
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+server.daemon_threads = True
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = 'http://127.0.0.1:%d/' % server.server_port
+
+
+def describe(exchange):
+    return {
+        'id': 'test',
+        'has': {'fetchTicker': True, 'createOrder': True, 'fetchOrders': False},
+        'api': {
+            'public': {'get': ['ticker']},
+            'private': {'post': ['order']},
+        },
+    }
+
+
+def sign(exchange, path, api='public', method='GET', params={}, headers=None, body=None):
+    body = exchange.json(params) if method == 'POST' else None
+    return {'url': url + path, 'method': method, 'body': body, 'headers': {'Content-Type': 'application/json'} if body else None}
+
+
+class Exchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), describe(self))
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return sign(self, path, api, method, params, headers, body)
+
+    def fetch_ticker(self, symbol, params={}):
+        response = self.public_get_ticker()
+        time.sleep(0.02)  # parsing
+        return {'symbol': symbol, 'last': float(response['price'])}
+
+    def create_order(self, symbol, type, side, amount, price=None, params={}):
+        try:
+            return self.private_post_order({'symbol': symbol})
+        except ExchangeNotAvailable:
+            return self.private_post_order({'symbol': symbol})
+
+
+class AsyncExchange(ccxt.async_support.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(AsyncExchange, self).describe(), describe(self))
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return sign(self, path, api, method, params, headers, body)
+
+    async def fetch_ticker(self, symbol, params={}):
+        response = await self.public_get_ticker()
+        await asyncio.sleep(0.02)  # other tasks run in between
+        return {'symbol': symbol, 'last': float(response['price'])}
+
+
+class Recorder(Instrumentation):
+
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def start(self, timings):
+        self.started.append(timings)
+
+    def end(self, timings):
+        self.ended.append(timings)
+
+
+# ----------------------------------------------------------------------------
+# sync
+
+recorder = Recorder()
+exchange = Exchange({'instrumentation': recorder})
+assert exchange.fetch_ticker('BTC/USDT') == {'symbol': 'BTC/USDT', 'last': 9000.5}
+assert [timings.name for timings in recorder.started] == ['fetchTicker', 'publicGetTicker']
+assert [timings.name for timings in recorder.ended] == ['publicGetTicker', 'fetchTicker']
+request, call = recorder.ended
+assert request.kind == 'request' and call.kind == 'call'
+assert request.call == 'fetchTicker' and request.url == url + 'ticker' and request.status == 200
+assert sorted(request.timings) == ['handle_errors', 'parse_json', 'read', 'sign', 'throttle', 'total', 'ttfb']
+assert request.timings['ttfb'] >= 0.01
+assert request.bytes_sent == 0 and request.bytes_received == 37
+assert abs(sum(request.timings[phase] for phase in request.timings if phase != 'total') - request.timings['total']) < 0.001
+assert call.requests == 1 and call.timings['parse'] >= 0.02 and call.timings['total'] >= request.timings['total'] + 0.02
+# the camelcase name is the same wrapper
+exchange.fetchTicker('BTC/USDT')
+assert len(recorder.ended) == 4
+assert exchange.instrumented_calls is None
+
+# a failed request and its retry
+recorder.ended = []
+exchange.create_order('BTC/USDT', 'limit', 'buy', 1, 9000)
+first, second, call = recorder.ended
+assert isinstance(first.error, ExchangeNotAvailable) and first.status == 503 and first.retries == 0
+assert second.error is None and second.retries == 1 and second.bytes_sent == len('{"symbol":"BTC/USDT"}')
+assert call.name == 'createOrder' and call.requests == 2 and call.error is None
+
+# the histogram
+histogram = LatencyHistogram()
+exchange.set_instrumentation(histogram)
+assert 'fetchOrders' not in exchange.__dict__  # has['fetchOrders'] is False
+for i in range(0, 3):
+    exchange.fetch_ticker('BTC/USDT')
+    exchange.create_order('BTC/USDT', 'limit', 'buy', 1, 9000)
+histograms, counters = histogram.snapshot()
+assert histograms[('test', 'publicGetTicker', 'ttfb')]['count'] == 3
+assert counters[('test', 'publicGetTicker')]['bytes_received'] == 3 * 37
+assert counters[('test', 'privatePostOrder')] == {'requests': 6, 'errors': 3, 'retries': 3, 'bytes_sent': 6 * 21, 'bytes_received': 6 * 10}
+assert counters[('test', 'createOrder')]['errors'] == 0
+assert 0.01 <= histogram.percentile('publicGetTicker', 'ttfb', 0.5) <= 1
+assert 0.02 <= histogram.percentile('fetchTicker', 'parse', 0.99) <= 1
+assert histogram.percentile('fetchBalance') is None
+metrics = histogram.prometheus()
+assert '# TYPE ccxt_phase_seconds histogram' in metrics
+assert 'ccxt_phase_seconds_count{exchange="test",name="publicGetTicker",phase="total"} 3\n' in metrics
+assert 'ccxt_requests_total{exchange="test",name="fetchTicker"} 3\n' in metrics
+
+# turned off, nothing is wrapped or measured
+exchange.set_instrumentation(None)
+assert 'fetch_ticker' not in exchange.__dict__ and 'fetchTicker' not in exchange.__dict__
+exchange.fetch_ticker('BTC/USDT')
+assert histogram.snapshot()[0][('test', 'publicGetTicker', 'ttfb')]['count'] == 3
+
+# ----------------------------------------------------------------------------
+# async
+
+
+async def test_async_instrumentation(loop):
+    recorder = Recorder()
+    exchange = AsyncExchange({'asyncio_loop': loop, 'instrumentation': recorder, 'enableRateLimit': True, 'rateLimit': 5})
+    tickers = await asyncio.gather(*[exchange.fetch_ticker('BTC/USDT') for i in range(0, 4)])
+    assert all(ticker['last'] == 9000.5 for ticker in tickers)
+    requests = [timings for timings in recorder.ended if timings.kind == 'request']
+    calls = [timings for timings in recorder.ended if timings.kind == 'call']
+    assert len(requests) == 4 and len(calls) == 4
+    # every concurrent call counted its own request only
+    assert all(timings.call == 'fetchTicker' for timings in requests)
+    assert all(timings.requests == 1 and timings.timings['parse'] >= 0.02 for timings in calls)
+    assert all('connect' in timings.timings and timings.timings['connect'] <= timings.timings['ttfb'] for timings in requests)
+    assert sum(timings.timings['throttle'] for timings in requests) >= 0.01  # the rate limiter delayed some of them
+    assert all(timings.status == 200 and timings.bytes_received == 37 for timings in requests)
+    assert exchange.instrumented_call_stacks == {}
+    await exchange.close()
+
+    # coalesced requests are measured once
+    recorder = Recorder()
+    exchange = AsyncExchange({'asyncio_loop': loop, 'instrumentation': recorder, 'coalesceRequests': True})
+    await asyncio.gather(*[exchange.public_get_ticker() for i in range(0, 3)])
+    assert [timings.name for timings in recorder.ended] == ['publicGetTicker']
+    await exchange.close()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_async_instrumentation(loop))
+loop.close()
+server.shutdown()
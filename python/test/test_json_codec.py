@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base import json_codec  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+documents = [
+    '{"symbol":"BTCUSDT","price":"9876.54","qty":0.1,"time":1590000000000,"ok":true,"none":null}',
+    '[[1590000000000,"9876.54",1e-7,-0.0,18446744073709551615]]',
+    '[12345678901234567890123]',  # wider than 64 bits
+    '{"id":-9223372036854775809,"ids":[1, 18446744073709551616]}',
+    '123456789012345678901234567890',
+    '{"a":NaN,"b":Infinity}',  # not JSON, but accepted by the json module
+    u'{"name":"биткойн","path":"a/b"}',
+]
+
+for name in ['json', 'orjson', 'ujson', 'simdjson']:
+    try:
+        codec = json_codec.set_json_codec(name)
+    except ImportError:
+        continue
+    assert json_codec.get_json_codec() is codec
+    for document in documents:
+        expected = json.loads(document)
+        # NaN is not equal to itself
+        assert repr(codec.loads(document)) == repr(expected), name
+        assert repr(codec.loads(document.encode('utf-8'))) == repr(expected), name
+        # request bodies are signed, they are encoded by the json module whatever the codec
+        assert Exchange.json(expected) == json.dumps(expected, separators=(',', ':')), name
+    assert Exchange.unjson(Exchange.json({1: [1, 2]})) == {'1': [1, 2]}
+    assert Exchange.json({'name': u'биткойн', 'nan': float('nan'), 'wide': 2 ** 70}) == \
+        '{"name":"\\u0431\\u0438\\u0442\\u043a\\u043e\\u0439\\u043d","nan":NaN,"wide":1180591620717411303424}', name
+
+json_codec.set_json_codec()
+assert json_codec.get_json_codec().name in ['orjson', 'ujson', 'simdjson', 'json']
+
+# responses are decoded from bytes
+exchange = Exchange()
+assert exchange.parse_json(b'{"a":1}') == {'a': 1}
+assert exchange.parse_json('[1]') == [1]
+assert exchange.parse_json(b'<html>{}</html>') is None
+assert exchange.parse_json(b'{broken') is None
+assert Exchange.is_json_encoded_object(b'[]') and not Exchange.is_json_encoded_object(b'ok')
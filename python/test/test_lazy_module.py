@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+import inspect
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+# the exchange modules are imported on first access
+assert 'ccxt.kraken' not in sys.modules
+assert 'kraken' in dir(ccxt)
+assert inspect.isclass(ccxt.kraken)
+assert 'ccxt.kraken' in sys.modules
+
+# importing a submodule directly binds the class to the package, not the module
+from ccxt.bequant import bequant  # noqa: E402
+assert ccxt.bequant is bequant
+assert inspect.isclass(ccxt.hitbtc)  # imported by bequant as its base class
+
+assert not hasattr(ccxt, 'nonexistent')
+assert all(inspect.isclass(getattr(ccxt, id)) for id in ccxt.exchanges)
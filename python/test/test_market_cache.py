@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.market_cache import MarketCache  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class Exchange(ccxt.Exchange):
+
+    fetches = 0
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'test',
+            'urls': {'api': 'https://api.test'},
+        })
+
+    def fetch_markets(self, params={}):
+        Exchange.fetches += 1
+        return [
+            {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'precision': {'price': 2, 'amount': 4}},
+            {'id': 'ETHUSDT', 'symbol': 'ETH/USDT', 'base': 'ETH', 'quote': 'USDT', 'precision': {'price': 2, 'amount': 3}},
+        ]
+
+
+class NumericExchange(Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(NumericExchange, self).describe(), {'id': 'numeric'})
+
+    def fetch_markets(self, params={}):
+        Exchange.fetches += 1
+        return [
+            {'id': 1, 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'baseId': 10, 'quoteId': 20},
+            {'id': 2, 'symbol': 'ETH/USDT', 'base': 'ETH', 'quote': 'USDT', 'baseId': 30, 'quoteId': 20},
+        ]
+
+
+directory = tempfile.mkdtemp()
+try:
+    # the first load fetches and stores the markets, the second one reads them back
+    fetched = Exchange({'marketsCache': {'path': directory, 'ttl': 60000}})
+    fetched.load_markets()
+    cached = Exchange({'marketsCache': {'path': directory, 'ttl': 60000}})
+    cached.load_markets()
+    assert Exchange.fetches == 1
+    assert cached.markets == fetched.markets
+    assert cached.markets_by_id['BTCUSDT'] is cached.markets['BTC/USDT']
+    assert cached.symbols == fetched.symbols and cached.ids == fetched.ids
+    assert cached.currencies == fetched.currencies
+    assert cached.currencies_by_id['USDT']['code'] == 'USDT'
+    assert cached.price_to_precision('BTC/USDT', 1.005) == '1.01'
+
+    # reloading always fetches
+    cached.load_markets(True)
+    assert Exchange.fetches == 2
+
+    # expired entries and entries of another version are not used
+    Exchange({'marketsCache': {'path': directory, 'ttl': -1}}).load_markets()
+    assert Exchange.fetches == 3
+    Exchange({'marketsCache': {'path': directory}, 'version': 'v2'}).load_markets()
+    assert Exchange.fetches == 4
+
+    # a prebuilt index shipped as a single compressed file
+    index = os.path.join(directory, 'test-markets.json.gz')
+    fetched.marketsCache = MarketCache(index)
+    assert fetched.save_markets_cache()
+    shipped = Exchange({'marketsCache': {'path': index}})
+    shipped.load_markets()
+    assert Exchange.fetches == 4
+    assert shipped.markets == fetched.markets
+
+    # a broken file is a miss
+    with open(index, 'wb') as file:
+        file.write(b'garbage')
+    assert MarketCache(index).read('test', fetched.markets_cache_key()) is None
+
+    # a directory that does not exist yet is created and shared by the exchanges
+    nested = os.path.join(directory, 'cache', 'markets')
+    Exchange({'marketsCache': {'path': nested}}).load_markets()
+    NumericExchange({'marketsCache': {'path': nested}}).load_markets()
+    assert len(os.listdir(nested)) == 2
+    assert Exchange.fetches == 6
+    # numeric ids keep their type
+    numeric = NumericExchange({'marketsCache': {'path': nested}})
+    numeric.load_markets()
+    assert Exchange.fetches == 6
+    assert numeric.markets_by_id[1] is numeric.markets['BTC/USDT']
+    assert numeric.ids == [1, 2]
+finally:
+    shutil.rmtree(directory)
+
+# no cache is configured by default
+assert Exchange().marketsCache is None
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import aiohttp
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base.mock_server import BinanceMockServer  # noqa: E402
+from ccxt.base.errors import BaseError, DDoSProtection, ExchangeError, ExchangeNotAvailable  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+async def raises(error, coroutine):
+    try:
+        await coroutine
+    except error as e:
+        return e
+    assert False, 'expected ' + error.__name__
+
+
+async def test_rest(loop):
+    server = BinanceMockServer({'apiKey': 'key', 'secret': 'secret', 'symbols': ['BTC/USDT', 'ETH/BTC']})
+    await server.start()
+    exchange = server.configure(ccxt.binance({'asyncio_loop': loop, 'apiKey': 'key', 'secret': 'secret'}))
+    try:
+        await exchange.load_markets()
+        assert sorted(exchange.symbols) == ['BTC/USDT', 'ETH/BTC']
+        orderbook = await exchange.fetch_order_book('BTC/USDT', 5)
+        assert len(orderbook['bids']) == 5 and len(orderbook['asks']) == 5
+        assert orderbook['bids'][0][0] < orderbook['asks'][0][0]
+        ticker = await exchange.fetch_ticker('BTC/USDT')
+        assert ticker['bid'] == orderbook['bids'][0][0]
+        assert len(await exchange.fetch_trades('BTC/USDT', limit=10)) == 10
+        ohlcvs = await exchange.fetch_ohlcv('BTC/USDT', '1h', limit=3)
+        assert len(ohlcvs) == 3 and ohlcvs[1][0] - ohlcvs[0][0] == 3600000
+        order = await exchange.create_order('BTC/USDT', 'limit', 'buy', 0.5, 8000)
+        assert order['status'] == 'open' and order['amount'] == 0.5
+        assert (await exchange.fetch_order(order['id'], 'BTC/USDT'))['status'] == 'open'
+        assert (await exchange.cancel_order(order['id'], 'BTC/USDT'))['status'] == 'canceled'
+        assert (await exchange.create_order('BTC/USDT', 'market', 'sell', 0.5))['status'] == 'closed'
+        assert (await exchange.fetch_balance())['total']['USDT'] == 1000
+        assert exchange.last_response_headers['X-MBX-USED-WEIGHT-1M'] == str(server.stats['requests'])
+        # the signed endpoints check the key and the signature
+        exchange.secret = 'other'
+        assert '-1022' in str(await raises(ExchangeError, exchange.fetch_balance()))
+        exchange.secret = 'secret'
+        exchange.apiKey = 'other'
+        assert '-2015' in str(await raises(BaseError, exchange.fetch_balance()))
+        exchange.apiKey = 'key'
+        # the injected errors go through the error handling of the exchange
+        for kind, error in [[429, DDoSProtection], [418, DDoSProtection], [502, ExchangeNotAvailable], [503, ExchangeNotAvailable], ['maintenance', ExchangeNotAvailable]]:
+            server.inject(kind)
+            e = await raises(error, exchange.fetch_ticker('BTC/USDT'))
+            if kind == 429:
+                assert exchange.last_response_headers['Retry-After'] == '1'
+            if kind == 'maintenance':
+                assert 'maintenance' in str(e)
+        errors = server.stats['errors']
+        server.inject(503, 2)
+        await raises(ExchangeNotAvailable, exchange.fetch_ticker('BTC/USDT'))
+        await raises(ExchangeNotAvailable, exchange.fetch_ticker('BTC/USDT'))
+        await exchange.fetch_ticker('BTC/USDT')
+        assert server.stats['errors'] == errors + 2
+        # the weight over the limit is answered with a 429 and the time until the next minute
+        server.weightLimit = server.weight[1] + 1
+        await exchange.fetch_ticker('BTC/USDT')
+        await raises(DDoSProtection, exchange.fetch_ticker('BTC/USDT'))
+        assert 0 < int(exchange.last_response_headers['Retry-After']) <= 60
+        server.weightLimit = None
+        server.latency = 0.05
+        started = time.time()
+        await asyncio.gather(*[exchange.fetch_ticker('BTC/USDT') for i in range(0, 10)])
+        assert 0.05 <= time.time() - started < 0.5  # concurrently
+    finally:
+        await exchange.close()
+        await server.stop()
+
+
+async def test_streams(loop):
+    server = BinanceMockServer({'messageRate': 200, 'symbols': ['BTC/USDT', 'ETH/USDT']})
+    await server.start()
+    session = aiohttp.ClientSession(loop=loop)
+    try:
+        # the diff events continue the update ids of the snapshot
+        websocket = await session.ws_connect(server.stream_url + 'btcusdt@depth@100ms/ethusdt@trade')
+        async with session.get(server.url + '/api/v3/depth?symbol=BTCUSDT') as response:
+            snapshot = await response.json()
+        last = snapshot['lastUpdateId']
+        trades = 0
+        while last < snapshot['lastUpdateId'] + 50:
+            message = json.loads((await websocket.receive(timeout=5)).data)
+            if message['stream'] == 'ethusdt@trade':
+                assert message['data']['e'] == 'trade' and message['data']['s'] == 'ETHUSDT'
+                trades += 1
+                continue
+            assert message['stream'] == 'btcusdt@depth@100ms'
+            data = message['data']
+            if data['u'] <= snapshot['lastUpdateId']:
+                continue
+            assert data['U'] == last + 1 and data['u'] >= data['U']
+            last = data['u']
+        assert trades > 0
+        # streams are added and removed on the same connection
+        await websocket.send_str(json.dumps({'method': 'UNSUBSCRIBE', 'params': ['btcusdt@depth@100ms', 'ethusdt@trade'], 'id': 1}))
+        await websocket.send_str(json.dumps({'method': 'SUBSCRIBE', 'params': ['btcusdt@depth5'], 'id': 2}))
+        await websocket.send_str(json.dumps({'method': 'LIST_SUBSCRIPTIONS', 'id': 3}))
+        results = {}
+        while len(results) < 3:
+            message = json.loads((await websocket.receive(timeout=5)).data)
+            if 'id' in message:
+                results[message['id']] = message['result']
+        assert results == {1: None, 2: None, 3: ['btcusdt@depth5']}
+        message = json.loads((await websocket.receive(timeout=5)).data)
+        assert message['stream'] == 'btcusdt@depth5'
+        assert len(message['data']['bids']) == 5 and 'lastUpdateId' in message['data']
+        await websocket.close()
+    finally:
+        await session.close()
+        await server.stop()
+
+
+async def test_exchange_streams(loop):
+    server = BinanceMockServer({'messageRate': 100, 'symbols': ['BTC/USDT', 'ETH/USDT']})
+    await server.start()
+    exchange = server.configure(ccxt.binance({'asyncio_loop': loop}))
+    received = {'ob': [], 'trade': [], 'err': []}
+    exchange.on('ob', lambda symbol, orderbook: received['ob'].append(orderbook))
+    exchange.on('trade', lambda symbol, trade: received['trade'].append(trade))
+    exchange.on('err', lambda error, conxid=None: received['err'].append(error))
+    try:
+        await exchange.websocket_subscribe_all([
+            {'event': 'ob', 'symbol': 'BTC/USDT', 'params': {}},
+            {'event': 'trade', 'symbol': 'ETH/USDT', 'params': {}},
+        ])
+        started = time.time()
+        while (len(received['ob']) < 10 or len(received['trade']) < 10) and time.time() - started < 5:
+            await asyncio.sleep(0.05)
+        assert not received['err']
+        assert len(received['ob']) >= 10 and len(received['trade']) >= 10
+        nonces = [orderbook['nonce'] for orderbook in received['ob']]
+        assert nonces == sorted(nonces)
+        assert received['trade'][-1]['symbol'] == 'ETH/USDT'
+    finally:
+        exchange.websocketCloseAll()
+        await exchange.close()
+        await server.stop()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_rest(loop))
+loop.run_until_complete(test_streams(loop))
+loop.run_until_complete(test_exchange_streams(loop))
+loop.close()
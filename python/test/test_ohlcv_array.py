@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    print('numpy is not installed, skipping')
+    sys.exit(0)
+
+# ----------------------------------------------------------------------------
+
+minute = 60000
+klines = [[1590000000000 + i * minute, '9000.%d' % i, '9010.5', '8990', '9005.25', '%d.125' % i, 0, '0', 0, '0', '0', '0'] for i in range(0, 10)]
+
+
+def as_lists(array):
+    return [[int(candle[0])] + [float(value) for value in list(candle)[1:]] for candle in array]
+
+
+def compare(exchange, ohlcvs, since=None, limit=None):
+    exchange.ohlcvFormat = None
+    expected = exchange.sort_by(exchange.parse_ohlcvs(ohlcvs, None, '1m', since, limit), 0)
+    exchange.ohlcvFormat = 'numpy'
+    array = exchange.parse_ohlcvs(ohlcvs, None, '1m', since, limit)
+    assert array.dtype.names == ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+    assert str(array['timestamp'].dtype) == 'int64'
+    assert as_lists(array) == expected, (as_lists(array), expected)
+    return array
+
+# ----------------------------------------------------------------------------
+# binance rows hold the candle in their first six columns
+
+
+binance = ccxt.binance()
+array = compare(binance, klines)
+assert len(array) == 10
+assert array['close'][0] == 9005.25
+compare(binance, klines, since=klines[3][0])
+compare(binance, klines, limit=4)
+compare(binance, klines, since=klines[3][0], limit=4)
+compare(binance, list(reversed(klines)), limit=4)  # the limit applies before sorting, like the lists
+compare(binance, [])
+
+# ----------------------------------------------------------------------------
+# candles in another layout are parsed row by row
+
+
+class Reordered(Exchange):
+
+    def parse_ohlcv(self, ohlcv, market=None, timeframe='1m', since=None, limit=None):
+        # [timestamp, open, close, high, low, volume]
+        return [ohlcv[0], float(ohlcv[1]), float(ohlcv[3]), float(ohlcv[4]), float(ohlcv[2]), float(ohlcv[5])]
+
+
+reordered = Reordered()
+rows = [[candle[0], candle[1], candle[4], candle[2], candle[3], candle[5]] for candle in klines]
+array = compare(reordered, rows, since=klines[2][0])
+assert array['close'][0] == 9005.25
+assert array['high'][0] == 9010.5
+
+# ----------------------------------------------------------------------------
+# missing values are NaN
+
+exchange = Exchange({'ohlcvFormat': 'numpy'})
+array = exchange.parse_ohlcvs([[1590000000000, 1, 2, 0.5, 1.5, None]])
+assert as_lists(array)[0][0:5] == [1590000000000, 1, 2, 0.5, 1.5]
+assert numpy.isnan(array['volume'][0])
+
+# ----------------------------------------------------------------------------
+# sort_by sorts the structured arrays like the lists
+
+binance.ohlcvFormat = 'numpy'
+array = binance.parse_ohlcvs(klines)
+assert binance.sort_by(array, 0) is array
+assert as_lists(binance.sort_by(array, 0, True)) == list(reversed(as_lists(array)))
+assert as_lists(binance.sort_by(array, 'volume', True)) == sorted(as_lists(array), key=lambda candle: candle[5], reverse=True)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.order_book import OrderBook  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+orderbook = OrderBook({
+    'bids': [[10.0, 1.0], [9.0, 2.0], [11.0, 3.0]],
+    'asks': [[13.0, 1.0], [12.0, 2.0]],
+    'nonce': 100,
+})
+
+# both sides are sorted from the best price
+assert orderbook['bids'] == [[11.0, 3.0], [10.0, 1.0], [9.0, 2.0]]
+assert orderbook['asks'] == [[12.0, 2.0], [13.0, 1.0]]
+
+# upsert, insert and delete levels
+orderbook['bids'].store(10.0, 5.0)
+orderbook['bids'].store(10.5, 1.0)
+orderbook['bids'].store(9.0, 0)
+orderbook['asks'].update([[12.0, 0], [12.5, 4.0], [14.0, 1.0]])
+assert orderbook['bids'] == [[11.0, 3.0], [10.5, 1.0], [10.0, 5.0]]
+assert orderbook['asks'] == [[12.5, 4.0], [13.0, 1.0], [14.0, 1.0]]
+
+# removing a missing level is a no-op
+orderbook['asks'].store(20.0, 0)
+assert len(orderbook['asks']) == 3
+
+# top-N views do not change when the book is updated afterwards
+top = orderbook.limit(2)
+assert top['bids'] == [[11.0, 3.0], [10.5, 1.0]]
+orderbook['bids'].store(11.0, 7.0)
+assert top['bids'] == [[11.0, 3.0], [10.5, 1.0]]
+assert orderbook['bids'][:1] == [[11.0, 7.0]]
+assert orderbook['bids'].best() == [11.0, 7.0]
+
+# nonce tracking
+assert orderbook.is_stale(99)
+assert orderbook.is_stale(100)
+assert not orderbook.is_stale(101)
+
+# checksum over the interleaved top levels
+small = OrderBook({'bids': [[1.5, 2.0]], 'asks': [[3.0, 4.0]]})
+assert small.checksum(25, lambda x: ('%f' % x).rstrip('0').rstrip('.')) == 172137539  # crc32 of '1.5:2:3:4'
+assert small.checksum(0) == 0
+
+# reset to a new snapshot
+orderbook.reset({'bids': [[1.0, 1.0]]})
+assert orderbook['bids'] == [[1.0, 1.0]]
+assert orderbook['asks'] == []
+assert orderbook['nonce'] is None
+
+# views are read lazily from the live book and keep their version
+orderbook = OrderBook({'bids': [[10.0, 1.0], [9.0, 1.0]], 'asks': [[11.0, 1.0]], 'nonce': 1})
+view = orderbook.view(1)
+assert view.version == orderbook.version
+assert view['bids'] == [[10.0, 1.0]]
+assert view['nonce'] == 1
+assert sorted(view.keys()) == ['asks', 'bids', 'datetime', 'nonce', 'timestamp']
+snapshot = view.snapshot()
+assert isinstance(snapshot, dict) and snapshot['asks'] == [[11.0, 1.0]]
+try:
+    view['bids'] = []
+    assert False
+except TypeError:
+    pass
+
+# a view that is still referenced is copied before the book changes
+orderbook.apply([[10.0, 0]], [[10.5, 2.0]])
+orderbook['nonce'] = 2
+assert view['bids'] == [[10.0, 1.0]]
+assert view['asks'] == [[11.0, 1.0]]
+assert orderbook.view(1)['bids'] == [[9.0, 1.0]]
+assert orderbook.view()['asks'] == [[10.5, 2.0], [11.0, 1.0]]
+assert orderbook.view().version == view.version + 1
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.base.errors import ExchangeError  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+# several trades share a timestamp, so the pages requested by timestamp overlap
+trades = [{'id': str(i), 'timestamp': 1000 + (i // 3) * 10, 'price': 1, 'amount': 1} for i in range(0, 100)]
+
+
+class Exchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'test',
+            'options': {
+                'paginate': {
+                    'fetchMyTrades': {'type': 'id', 'param': 'fromId', 'limit': 7},
+                    'fetchLedger': {'type': 'offset', 'param': 'ofs', 'order': 'desc'},
+                    'fetchOrders': {'type': 'page', 'param': 'page', 'start': 0},
+                    'fetchClosedOrders': {'type': 'cursor', 'param': 'after', 'header': 'CB-AFTER'},
+                },
+            },
+        })
+
+    async def fetch_trades(self, symbol, since=None, limit=None, params={}):
+        self.calls += 1
+        return [trade for trade in trades if trade['timestamp'] >= (since or 0)][:limit]
+
+    async def fetch_my_trades(self, symbol=None, since=None, limit=None, params={}):
+        # binance rejects fromId together with startTime
+        assert since is None or 'fromId' not in params
+        if 'fromId' in params:
+            start = int(params['fromId'])  # fromId is inclusive
+        else:
+            start = len([trade for trade in trades if trade['timestamp'] < (since or 0)])
+        return trades[start:start + limit]
+
+    async def fetch_ledger(self, code=None, since=None, limit=None, params={}):
+        newest = list(reversed(trades))
+        offset = params.get('ofs', 0)
+        return newest[offset:offset + limit]
+
+    async def fetch_orders(self, symbol=None, since=None, limit=None, params={}):
+        page = params.get('page', 0)
+        return trades[page * limit:(page + 1) * limit]
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        duration = self.parse_timeframe(timeframe) * 1000
+        candles = [[duration * i, 1, 2, 0.5, 1.5, 10] for i in range(0, 50)]
+        return [candle for candle in candles if candle[0] >= (since or 0)][:limit]
+
+
+async def collect(iterator):
+    result = []
+    async for item in iterator:
+        result.append(item)
+    return result
+
+
+async def test_paginator(loop):
+    exchange = Exchange({'asyncio_loop': loop})
+    ids = [trade['id'] for trade in trades]
+
+    exchange.calls = 0
+    result = await collect(exchange.paginate('fetch_trades', 'BTC/USDT', 0, 10))
+    assert [trade['id'] for trade in result] == ids
+    assert exchange.calls < 20
+    result = await collect(exchange.paginate('fetch_trades', 'BTC/USDT', 0, 10, until=1100))
+    assert [trade['id'] for trade in result] == ids[0:30]
+    # a full page of trades sharing one timestamp does not end the iteration
+    result = await collect(exchange.paginate('fetch_trades', 'BTC/USDT', 0, 2))
+    assert result[-1]['id'] == ids[-1]
+    assert len(set(trade['id'] for trade in result)) == len(result)
+
+    result = await collect(exchange.paginate('fetch_my_trades', 'BTC/USDT'))
+    assert [trade['id'] for trade in result] == ids
+    result = await collect(exchange.paginate('fetch_my_trades', 'BTC/USDT', 1300))
+    assert [trade['id'] for trade in result] == [trade['id'] for trade in trades if trade['timestamp'] >= 1300]
+
+    result = await collect(exchange.paginate('fetch_ledger', 'BTC', None, 9))
+    assert [trade['id'] for trade in result] == list(reversed(ids))
+    # going back in time stops at since
+    result = await collect(exchange.paginate('fetch_ledger', 'BTC', 1300, 9))
+    assert [trade['id'] for trade in result] == list(reversed(ids))[0:len([trade for trade in trades if trade['timestamp'] >= 1300])]
+    # and skips the objects past until
+    result = await collect(exchange.paginate('fetch_ledger', 'BTC', None, 9, until=1300))
+    assert [trade['id'] for trade in result] == [trade['id'] for trade in reversed(trades) if trade['timestamp'] < 1300]
+
+    result = await collect(exchange.paginate('fetch_orders', None, None, 8))
+    assert [trade['id'] for trade in result] == ids
+
+    # fetchOHLCV is found by its python name, candles are keyed by their timestamp
+    candles = await collect(exchange.paginate('fetch_ohlcv', 'BTC/USDT', None, 7, timeframe='1h'))
+    assert [candle[0] for candle in candles] == [3600000 * i for i in range(0, 50)]
+
+    # a pagination passed to paginate() wins over the options
+    result = await collect(exchange.paginate('fetch_orders', None, None, 25, pagination={'type': 'page', 'param': 'page', 'start': 2}))
+    assert [trade['id'] for trade in result] == ids[50:]
+
+    # the cursor is read from the response headers
+    exchange.enableLastResponseHeaders = False
+    try:
+        exchange.paginate('fetch_closed_orders')
+        assert False
+    except ExchangeError:
+        pass
+    await exchange.close()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_paginator(loop))
+loop.close()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.decimal_to_precision import decimal_to_precision  # noqa: E402
+from ccxt.base.decimal_to_precision import precision_formatter  # noqa: E402
+from ccxt.base.decimal_to_precision import TRUNCATE, ROUND, DECIMAL_PLACES, TICK_SIZE, PAD_WITH_ZERO  # noqa: E402
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+# formatters are compiled once per set of arguments
+assert precision_formatter(ROUND, 2, DECIMAL_PLACES) is precision_formatter(ROUND, 2, DECIMAL_PLACES)
+assert precision_formatter(ROUND, 0.05, TICK_SIZE) is not precision_formatter(TRUNCATE, 0.05, TICK_SIZE)
+
+# floats, ints and strings are formatted alike, exponents go through Decimal
+formatter = precision_formatter(ROUND, 0.05, TICK_SIZE, PAD_WITH_ZERO)
+for n in [1.024, 1.025, -1.075, 0.0, -0.0, '12.3456', 1e-10, 1e22, 123]:
+    assert formatter(n) == decimal_to_precision(str(n) if isinstance(n, float) else n, ROUND, 0.05, TICK_SIZE, PAD_WITH_ZERO)
+assert formatter(1.024) == '1.00'
+assert formatter(-1.075) == '-1.05'  # 0.025 is less than the float 0.05 / 2, same as with Decimals
+
+exchange = Exchange({
+    'markets': {
+        'BTC/USDT': {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'precision': {'price': 2, 'amount': 4}},
+        'ETH/USDT': {'id': 'ETHUSDT', 'symbol': 'ETH/USDT', 'base': 'ETH', 'quote': 'USDT', 'precision': {'price': None, 'amount': 3}},
+    },
+})
+
+assert exchange.price_to_precision('BTC/USDT', 9876.545) == '9876.55'
+assert exchange.amount_to_precision('BTC/USDT', 0.123456) == '0.1234'
+assert exchange.amounts_to_precision('BTC/USDT', [0.123456, 1, '2.00009']) == ['0.1234', '1', '2']
+assert exchange.prices_to_precision('BTC/USDT', [1.005, 1.004]) == ['1.01', '1']
+assert exchange.market_precision_formatter('ETH/USDT', 'price') is None
+
+# the precompiled formatters are not used once the market precision changes
+exchange.markets['BTC/USDT']['precision']['amount'] = 1
+assert exchange.amount_to_precision('BTC/USDT', 0.123456) == '0.1'
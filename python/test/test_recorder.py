@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.async_support.base import recorder as async_recorder  # noqa: E402
+from ccxt.base.errors import ExchangeNotAvailable  # noqa: E402
+from ccxt.base.recorder import FixtureStore  # noqa: E402
+from ccxt.base.recorder import RecordingSession  # noqa: E402
+from ccxt.base.recorder import ReplaySession  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    requests = 0
+
+    def respond(self, status, body, content_type='application/json'):
+        Handler.requests += 1
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/public/ticker'):
+            self.respond(200, ('{"price":"%d"}' % Handler.requests).encode())
+        elif self.path.startswith('/public/binary'):
+            self.respond(200, b'\xff\xfe\x00binary', 'application/octet-stream')
+        else:
+            self.respond(503, b'{"error":"maintenance"}')
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.respond(200, b'{"id":"1","request":' + body + b'}')
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+server.daemon_threads = True
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = 'http://127.0.0.1:%d/' % server.server_port
+
+
+def describe(exchange):
+    return {
+        'id': 'test',
+        'apiKey': 'key',
+        'secret': 'secret',
+        'api': {
+            'public': {'get': ['ticker', 'binary', 'status']},
+            'private': {'post': ['order']},
+        },
+    }
+
+
+def sign(exchange, path, api='public', method='GET', params={}, headers=None, body=None):
+    if api == 'private':
+        # a nonce and a signature that change with every request
+        body = exchange.json(exchange.extend({'nonce': exchange.nonce(), 'apiKey': exchange.apiKey}, params))
+        headers = {'Content-Type': 'application/json', 'X-Signature': exchange.hmac(exchange.encode(body), exchange.encode(exchange.secret))}
+    query = exchange.urlencode(exchange.extend({'timestamp': exchange.nonce()}, params)) if api == 'public' else ''
+    return {'url': url + api + '/' + path + ('?' + query if query else ''), 'method': method, 'body': body, 'headers': headers}
+
+
+class Exchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), describe(self))
+
+    def nonce(self):
+        return self.microseconds()
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return sign(self, path, api, method, params, headers, body)
+
+
+class AsyncExchange(ccxt.async_support.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(AsyncExchange, self).describe(), describe(self))
+
+    def nonce(self):
+        return self.microseconds()
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return sign(self, path, api, method, params, headers, body)
+
+
+directory = tempfile.mkdtemp()
+
+# ----------------------------------------------------------------------------
+# the keys leave out the nonce, timestamp, signature and key parameters
+
+store = FixtureStore()
+assert store.key('get', 'https://api.test/v1/ticker?symbol=BTC&timestamp=1&signature=abc') == 'GET https://api.test/v1/ticker symbol=BTC '
+assert store.key('POST', 'https://api.test/order', '{"nonce":1,"b":2,"a":1}') == store.key('POST', 'https://api.test/order', b'{"a":1,"b":2,"nonce":3}')
+assert store.key('POST', 'https://api.test/order', 'nonce=1&pair=XBTUSD') == 'POST https://api.test/order  pair=XBTUSD'
+assert store.key('GET', 'https://api.test/ticker?symbol=BTC') != store.key('GET', 'https://api.test/ticker?symbol=ETH')
+
+# ----------------------------------------------------------------------------
+# sync
+
+path = os.path.join(directory, 'test.jsonl.gz')
+store = FixtureStore(path)
+exchange = Exchange({'session': RecordingSession(store)})
+recorded = [exchange.public_get_ticker({'symbol': 'BTC'}), exchange.public_get_ticker({'symbol': 'BTC'})]
+order = exchange.private_post_order({'symbol': 'BTC', 'amount': 1})
+binary = exchange.public_get_binary()
+try:
+    exchange.public_get_status()
+    assert False
+except ExchangeNotAvailable:
+    pass
+assert recorded[0] != recorded[1]
+assert binary == b'\xff\xfe\x00binary'
+store.save()
+requests = Handler.requests
+
+store = FixtureStore(path)
+assert len(store.entries) == 4
+exchange = Exchange({'session': ReplaySession(store)})
+# the same responses in the same order, the last one is repeated
+assert [exchange.public_get_ticker({'symbol': 'BTC'}) for i in range(0, 3)] == recorded + recorded[1:]
+replayed = exchange.private_post_order({'symbol': 'BTC', 'amount': 1})
+assert replayed == order and replayed['request']['nonce'] != exchange.nonce()
+assert exchange.last_response_headers['Content-Type'] == 'application/json'
+assert exchange.public_get_binary() == binary
+try:
+    exchange.public_get_status()
+    assert False
+except ExchangeNotAvailable as e:
+    assert 'maintenance' in str(e)  # the recorded error is raised again
+try:
+    exchange.public_get_ticker({'symbol': 'ETH'})
+    assert False
+except ExchangeNotAvailable as e:
+    assert 'was not recorded' in str(e)
+assert Handler.requests == requests  # nothing was sent
+store.rewind()
+assert exchange.public_get_ticker({'symbol': 'BTC'}) == recorded[0]
+
+# ----------------------------------------------------------------------------
+# async
+
+
+async def test_async_recorder(loop):
+    path = os.path.join(directory, 'async.jsonl')
+    store = FixtureStore(path)
+    session = async_recorder.RecordingSession(store)
+    exchange = AsyncExchange({'asyncio_loop': loop, 'session': session})
+    recorded = await exchange.public_get_ticker({'symbol': 'BTC'})
+    order = await exchange.private_post_order({'symbol': 'BTC', 'amount': 1})
+    await exchange.close()
+    await session.close()
+    store.save()
+    requests = Handler.requests
+
+    exchange = AsyncExchange({'asyncio_loop': loop, 'session': async_recorder.ReplaySession(FixtureStore(path))})
+    assert await exchange.public_get_ticker({'symbol': 'BTC'}) == recorded
+    assert await exchange.private_post_order({'symbol': 'BTC', 'amount': 1}) == order
+    try:
+        await exchange.public_get_ticker({'symbol': 'ETH'})
+        assert False
+    except ExchangeNotAvailable:
+        pass
+    await exchange.close()
+    assert Handler.requests == requests
+    # the fixtures recorded by the sync exchanges are replayed by the async ones
+    exchange = AsyncExchange({'asyncio_loop': loop, 'session': async_recorder.ReplaySession(FixtureStore(os.path.join(directory, 'test.jsonl.gz')))})
+    assert await exchange.public_get_binary() == b'\xff\xfe\x00binary'
+    await exchange.close()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_async_recorder(loop))
+loop.close()
+server.shutdown()
+shutil.rmtree(directory)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+try:
+    import numpy
+except ImportError:
+    print('numpy is not installed, skipping')
+    sys.exit(0)
+
+# ----------------------------------------------------------------------------
+
+minute = 60000
+start = 1590000000000 - 1590000000000 % 3600000
+
+
+def resample(ohlcvs, timeframe, fill_gaps=True):
+    # the rollup in plain Python
+    duration = Exchange.parse_timeframe(timeframe) * 1000
+    groups = {}
+    for candle in sorted(ohlcvs, key=lambda candle: candle[0]):
+        opening = Exchange.round_timeframe(timeframe, candle[0])
+        group = groups.get(opening)
+        if group is None:
+            groups[opening] = list(candle)
+            groups[opening][0] = opening
+        else:
+            group[2] = max(group[2], candle[2])
+            group[3] = min(group[3], candle[3])
+            group[4] = candle[4]
+            group[5] += candle[5]
+    result = []
+    for opening in sorted(groups):
+        while fill_gaps and result and result[-1][0] + duration < opening:
+            close = result[-1][4]
+            result.append([result[-1][0] + duration, close, close, close, close, 0])
+        result.append(groups[opening])
+    return result
+
+
+generator = random.Random(1)
+candles = []
+for i in range(0, 1000):
+    if generator.random() < 0.3:
+        continue  # sparse candles
+    prices = [generator.randint(900, 1000) / 8.0 for j in range(0, 4)]
+    candles.append([start + i * minute, prices[0], max(prices), min(prices), prices[3], generator.randint(0, 100) / 4.0])
+# a gap of several hours
+candles = [candle for candle in candles if not (start + 200 * minute <= candle[0] < start + 500 * minute)]
+
+for timeframe in ['1m', '5m', '15m', '1h', '1d']:
+    for fill_gaps in [True, False]:
+        expected = resample(candles, timeframe, fill_gaps)
+        assert Exchange.resample_ohlcv(candles, timeframe, fill_gaps) == expected, (timeframe, fill_gaps)
+
+resampled = Exchange.resample_ohlcv(candles, '5m')
+assert all(resampled[i + 1][0] - resampled[i][0] == 5 * minute for i in range(0, len(resampled) - 1))
+gap = [candle for candle in resampled if start + 205 * minute <= candle[0] < start + 495 * minute]
+assert gap and all(candle[5] == 0 and candle[1] == candle[4] == gap[0][4] for candle in gap)
+
+# unsorted input, the columnar forms keep their form
+shuffled = list(candles)
+generator.shuffle(shuffled)
+assert Exchange.resample_ohlcv(shuffled, '15m') == resample(candles, '15m')
+exchange = Exchange({'ohlcvFormat': 'numpy'})
+array = exchange.parse_ohlcvs(shuffled)
+result = Exchange.resample_ohlcv(array, '15m')
+assert result.dtype == array.dtype
+assert [list(candle) for candle in result.tolist()] == resample(candles, '15m')
+columns = dict((field, array[field]) for field in array.dtype.names)
+result = Exchange.resample_ohlcv(columns, '15m')
+assert sorted(result.keys()) == sorted(columns.keys())
+assert result['close'].tolist() == [candle[4] for candle in resample(candles, '15m')]
+
+# missing values are ignored by high and low and count as no volume
+nan = float('nan')
+result = Exchange.resample_ohlcv([[start, 1, 2, 0.5, 1.5, 10], [start + minute, 1.5, nan, nan, 1.25, nan]], '5m')
+assert result == [[start, 1, 2, 0.5, 1.25, 10]]
+
+assert Exchange.resample_ohlcv([], '1h') == []
+assert len(Exchange.resample_ohlcv(numpy.empty(0, dtype=array.dtype), '1h')) == 0
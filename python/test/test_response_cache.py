@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base.response_cache import ResponseCache  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+api = {
+    'public': {'get': ['exchangeInfo', 'ticker'], 'post': ['query']},
+    'private': {'get': ['balance']},
+}
+
+
+class Exchange(ccxt.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {'id': 'test', 'api': api})
+
+    def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        self.requests.append(path)
+        return {'path': path, 'params': params, 'count': len(self.requests)}
+
+
+exchange = Exchange({'responseCache': {'ttl': {'exchangeInfo': 60000, 'ticker': 50}, 'maxSize': 2}})
+exchange.requests = []
+assert exchange.public_get_exchangeinfo() == exchange.public_get_exchangeinfo()
+assert exchange.requests == ['exchangeInfo']
+# every caller gets its own copy of the response
+exchange.public_get_exchangeinfo()['params']['modified'] = True
+assert exchange.public_get_exchangeinfo()['params'] == {}
+# the parameters are part of the key, short ttls expire
+exchange.public_get_ticker({'symbol': 'BTCUSDT'})
+exchange.public_get_ticker({'symbol': 'BTCUSDT'})
+assert exchange.requests == ['exchangeInfo', 'ticker']
+time.sleep(0.06)
+exchange.public_get_ticker({'symbol': 'BTCUSDT'})
+assert exchange.requests == ['exchangeInfo', 'ticker', 'ticker']
+# the least recently used responses are evicted
+exchange.public_get_ticker({'symbol': 'ETHUSDT'})
+exchange.public_get_exchangeinfo()
+assert exchange.requests[-1] == 'exchangeInfo'
+# only public GET endpoints are cached
+exchange.requests = []
+exchange.private_get_balance()
+exchange.private_get_balance()
+exchange.public_post_query()
+exchange.public_post_query()
+assert exchange.requests == ['balance', 'balance', 'query', 'query']
+
+# a directory shared by several instances
+directory = tempfile.mkdtemp()
+try:
+    first = Exchange({'responseCache': {'ttl': 60000, 'path': directory}})
+    second = Exchange({'responseCache': {'ttl': 60000, 'path': directory}})
+    first.requests = []
+    second.requests = []
+    first.public_get_ticker({'symbol': 'BTCUSDT'})
+    assert second.public_get_ticker({'symbol': 'BTCUSDT'})['params'] == {'symbol': 'BTCUSDT'}
+    assert second.requests == []
+    # the least recently written files are removed past maxSize
+    bounded = Exchange({'responseCache': {'ttl': 60000, 'path': directory, 'maxSize': 10}})
+    bounded.requests = []
+    for i in range(0, 30):
+        bounded.public_get_ticker({'symbol': str(i)})
+    assert len(os.listdir(directory)) <= 10
+    bounded.public_get_ticker({'symbol': '29'})
+    assert len(bounded.requests) == 30
+finally:
+    shutil.rmtree(directory)
+
+# a backend object
+backend = ResponseCache()
+exchange = Exchange({'responseCache': {'ttl': 60000, 'backend': backend}})
+exchange.requests = []
+exchange.public_get_ticker()
+assert len(backend.entries) == 1
+
+
+class AsyncExchange(ccxt.async_support.Exchange):
+
+    def describe(self):
+        return self.deep_extend(super(AsyncExchange, self).describe(), {'id': 'test', 'api': api})
+
+    async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        self.requests.append(path)
+        await asyncio.sleep(0.01)
+        return len(self.requests)
+
+
+async def test_stale_while_revalidate(loop):
+    exchange = AsyncExchange({'asyncio_loop': loop, 'responseCache': {'ttl': 20, 'staleWhileRevalidate': 1000}})
+    exchange.requests = []
+    assert await exchange.public_get_ticker() == 1
+    await asyncio.sleep(0.03)
+    # stale responses are returned while a single request refreshes them
+    assert await exchange.public_get_ticker() == 1
+    assert await exchange.public_get_ticker() == 1
+    await asyncio.sleep(0.015)
+    assert await exchange.public_get_ticker() == 2
+    assert exchange.requests == ['ticker', 'ticker']
+    assert exchange.revalidating_responses == {}
+    await exchange.close()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_stale_while_revalidate(loop))
+loop.close()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.signing import Curve, SigningKey, signing_key  # noqa: E402
+from ccxt.static_dependencies import ecdsa  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+def reference(secret, curve, digest, hashfunc, extra_entropy=b''):
+    key = ecdsa.SigningKey.from_string(secret, curve=curve)
+    r, s, v = key.sign_digest_deterministic(digest, hashfunc=hashfunc, sigencode=ecdsa.util.sigencode_strings_canonize, extra_entropy=extra_entropy)
+    r, s = ecdsa.util.sigdecode_strings((r, s), curve.order)
+    return r, s, v
+
+
+curves = [
+    (ecdsa.NIST192p, hashlib.sha1),
+    (ecdsa.NIST256p, hashlib.sha256),
+    (ecdsa.SECP256k1, hashlib.sha256),
+]
+
+for curve, hashfunc in curves:
+    for native in (True, False):
+        for i in range(0, 8):
+            secret = hashlib.sha512(('%s%d' % (curve.name, i)).encode()).digest()[:curve.baselen]
+            digest = hashfunc(secret).digest()
+            extra_entropy = secret if i % 2 else b''
+            key = SigningKey(secret, curve)
+            if not native:
+                # force the pure Python multiplication
+                key.curve = Curve(curve)
+                key.curve.native = None
+            # the signatures are byte-identical to the vendored implementation
+            assert key.sign_digest_deterministic(digest, hashfunc, extra_entropy) == reference(secret, curve, digest, hashfunc, extra_entropy)
+
+# keys are cached per secret and curve
+secret = b'\x1a' * 32
+assert signing_key(secret, ecdsa.SECP256k1) is signing_key(secret, ecdsa.SECP256k1)
+assert signing_key(secret, ecdsa.SECP256k1) is not signing_key(secret, ecdsa.NIST256p)
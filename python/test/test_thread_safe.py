@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.exchange import Exchange  # noqa: E402
+from ccxt.base.throttle import Throttle  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+# concurrent callers are released one per token
+throttle = Throttle({'refillRate': 0.1, 'capacity': 1, 'numTokens': 1})  # 100 per second
+start = time.time()
+with ThreadPoolExecutor(8) as executor:
+    list(executor.map(lambda i: throttle(), range(0, 21)))
+elapsed = time.time() - start
+assert 0.18 <= elapsed < 0.4, elapsed
+# no reservation was lost
+assert throttle.reserve(0) < 0.01
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        time.sleep(0.05)
+        body = ('{"path":"' + self.path + '"}').encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Set-Cookie', 'session=' + self.path[1:])
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+server.daemon_threads = True
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = 'http://127.0.0.1:%d/' % server.server_port
+
+exchange = Exchange({'threadSafe': True, 'httpPool': {'pool_maxsize': 8}})
+assert exchange.session.get_adapter(url)._pool_maxsize == 8
+
+
+def fetch(i):
+    response = exchange.fetch(url + str(i))
+    # every thread sees its own last response
+    assert exchange.last_json_response == response == {'path': '/' + str(i)}
+    return response
+
+
+start = time.time()
+with ThreadPoolExecutor(8) as executor:
+    responses = list(executor.map(fetch, range(0, 16)))
+assert time.time() - start < 0.5  # 16 requests of 50 ms in flight concurrently
+assert responses == [{'path': '/' + str(i)} for i in range(0, 16)]
+assert exchange.last_json_response is None  # nothing was fetched on this thread
+assert len(exchange.session.cookies) == 0
+
+# without the threadSafe mode the last response is shared
+shared = Exchange()
+thread = threading.Thread(target=lambda: shared.fetch(url + 'shared'))
+thread.start()
+thread.join()
+assert shared.last_json_response == {'path': '/shared'}
+assert shared.lastJsonResponse == {'path': '/shared'}
+server.shutdown()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.base.throttle import Throttle  # noqa: E402
+from ccxt.base.throttle import RateLimitFeedback  # noqa: E402
+from ccxt.async_support.base.throttle import throttle  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+async def test_throttle(loop):
+    rate_limit = 20  # milliseconds
+    limiter = throttle({
+        'loop': loop,
+        'refillRate': 1 / rate_limit,
+        'rateLimit': rate_limit,
+    })
+
+    # five requests with a unit cost take four intervals to pass
+    start = loop.time()
+    await asyncio.gather(*[limiter(rate_limit) for i in range(0, 5)])
+    elapsed = loop.time() - start
+    assert 0.07 <= elapsed < 0.2, elapsed
+
+    # weighted requests pay proportionally more
+    start = loop.time()
+    await limiter(rate_limit, 3)
+    await limiter(rate_limit)
+    elapsed = loop.time() - start
+    assert 0.07 <= elapsed < 0.2, elapsed
+
+    # the queue is exposed while requests are pending
+    futures = [limiter(rate_limit) for i in range(0, 3)]
+    assert limiter.queue_depth() == 3
+    assert limiter.wait_time() > 0
+    # a cancelled request does not spend any tokens
+    futures[1].cancel()
+    await futures[0]
+    await futures[2]
+    assert limiter.queue_depth() == 0
+    assert limiter.stats()['totalDelay'] > 0
+
+
+def test_sync_throttle():
+    rate_limit = 20  # milliseconds
+    limiter = Throttle({'refillRate': 1 / rate_limit}, {
+        'orders': {'refillRate': 1 / (rate_limit * 4), 'capacity': 2},
+    })
+    now = limiter.buckets['default'].lastTimestamp
+    # a request is released once every bucket it is charged to is non-negative
+    assert limiter.reserve({'default': 1, 'orders': 1}, now) == 0
+    assert abs(limiter.reserve({'default': 1, 'orders': 1}, now) - 0.08) < 1e-9
+    # requests that are not charged to the orders bucket only wait for the default one
+    assert abs(limiter.reserve(1, now + 0.02) - 0.02) < 1e-9
+    # unknown buckets are ignored
+    assert limiter.costs({'default': 2, 'unknown': 1}) == {'default': 2}
+    # the default bucket follows the exchange rateLimit when it is changed at runtime
+    limiter(rate_limit, 0)
+    assert limiter.buckets['default'].refillRate == 1 / rate_limit
+    limiter(rate_limit * 2, 0)
+    assert limiter.buckets['default'].refillRate == 1 / (rate_limit * 2)
+
+
+def test_rate_limit_feedback():
+    limiter = Throttle({'refillRate': 0.02})  # 1200 per minute
+    bucket = limiter.buckets['default']
+    feedback = RateLimitFeedback(bucket, {
+        'used': 'X-MBX-USED-WEIGHT-1M',
+        'limit': 1200,
+        'window': 60000,
+    })
+    # plenty of weight left, the bucket keeps its configured pace
+    feedback.update({'X-MBX-USED-WEIGHT-1M': '100'}, 30000)
+    assert bucket.refillRate == 0.02
+    # the remaining weight would run out before the window resets, slow down
+    feedback.update({'X-MBX-USED-WEIGHT-1M': '1000'}, 30000)
+    assert abs(bucket.refillRate - (200 - 60) / 30000) < 1e-9
+    # nothing left, block until the window resets
+    feedback.update({'X-MBX-USED-WEIGHT-1M': '1200'}, 30000)
+    assert bucket.refillRate == 0.02
+    assert abs(bucket.delay() - 30) < 0.1
+    # a Retry-After header blocks the bucket for at least the requested time
+    feedback.update({'Retry-After': '120'}, 30000)
+    assert abs(bucket.delay() - 120) < 0.1
+
+
+test_sync_throttle()
+test_rate_limit_feedback()
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_throttle(loop))
+loop.close()
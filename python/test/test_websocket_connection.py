@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import socket
+import sys
+
+import aiohttp
+from aiohttp import web
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.websocket.websocket_connection import WebsocketConnection  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+
+async def handler(request):
+    # the pings are answered unless ?silent is requested
+    websocket = web.WebSocketResponse(compress=True, autoping='silent' not in request.query)
+    await websocket.prepare(request)
+    request.app['extensions'].append(request.headers.get('Sec-WebSocket-Extensions', ''))
+    await websocket.send_str('hello')
+    await websocket.send_bytes(b'\x00\x01binary')
+    async for message in websocket:
+        if message.type == aiohttp.WSMsgType.TEXT and message.data == 'bye':
+            await websocket.close()
+        elif message.type == aiohttp.WSMsgType.TEXT:
+            await websocket.send_str(message.data)
+    return websocket
+
+
+async def wait(condition, timeout=5):
+    for i in range(0, int(timeout * 100)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    assert False, 'timed out'
+
+
+def events(connection):
+    received = {'open': 0, 'message': [], 'pong': [], 'close': 0, 'err': []}
+    connection.on('open', lambda: received.__setitem__('open', received['open'] + 1))
+    connection.on('message', lambda message: received['message'].append(message))
+    connection.on('pong', lambda data: received['pong'].append(data))
+    connection.on('close', lambda: received.__setitem__('close', received['close'] + 1))
+    connection.on('err', lambda error: received['err'].append(error))
+    return received
+
+
+async def test_websocket_connection(loop):
+    app = web.Application()
+    app['extensions'] = []
+    app.router.add_get('/ws', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    await web.SockSite(runner, sock).start()
+    url = 'ws://127.0.0.1:%d/ws' % sock.getsockname()[1]
+    session = aiohttp.ClientSession()
+    try:
+        # without a session the connection has a connector of its own, the receive buffer is set before connecting
+        connection = WebsocketConnection({'url': url, 'receiveBuffer': 1 << 20}, 10000, loop)
+        received = events(connection)
+        await asyncio.gather(connection.connect(), connection.connect())  # connected once
+        assert received['open'] == 1 and connection.isActive()
+        assert connection.session.connector is not session.connector
+        await wait(lambda: len(received['message']) == 2)
+        # text frames as str, binary frames as bytes
+        assert received['message'] == ['hello', b'\x00\x01binary']
+        assert 'permessage-deflate' in app['extensions'][0]
+        assert connection.client.compress == 15
+        assert connection.client.get_extra_info('socket').getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 1 << 20
+        # sent in order, on_message replaces the event
+        direct = []
+        connection.on_message = direct.append
+        for i in range(0, 100):
+            connection.send(str(i))
+        await wait(lambda: len(direct) == 100)
+        assert direct == [str(i) for i in range(0, 100)]
+        assert len(received['message']) == 2
+        # the round trip time of the pings
+        connection.sendPing(42)
+        await wait(lambda: received['pong'])
+        assert received['pong'] == ['42'] and connection.latency > 0 and list(connection.latencies) == [connection.latency]
+        assert not connection.pings
+        # the server closes
+        connection.send('bye')
+        await wait(lambda: received['close'])
+        assert not connection.isActive() and not received['err']
+        await connection.closing
+        assert connection.session is None
+        # closed by the client, a given session stays open, the receive buffer is set after the handshake
+        connection = WebsocketConnection({'url': url, 'compress': 0, 'receiveBuffer': 1 << 20}, 10000, loop, session)
+        received = events(connection)
+        await connection.connect()
+        assert connection.client.compress == 0
+        assert connection.client.get_extra_info('socket').getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 1 << 20
+        connection.close()
+        await asyncio.sleep(0.1)
+        assert not connection.isActive() and not received['close'] and not received['err']
+        assert not session.closed
+        # the pings that are not answered fail the connection
+        connection = WebsocketConnection({'url': url + '?silent=1', 'pingInterval': 0.1}, 10000, loop, session)
+        received = events(connection)
+        await connection.connect()
+        await wait(lambda: received['err'])
+        assert isinstance(received['err'][0], asyncio.TimeoutError) and not connection.isActive()
+        # the errors of connect are raised and emitted
+        connection = WebsocketConnection({'url': 'ws://127.0.0.1:1/ws'}, 10000, loop)
+        received = events(connection)
+        try:
+            await connection.connect()
+            assert False
+        except aiohttp.ClientError:
+            pass
+        assert len(received['err']) == 1 and not connection.isActive()
+        connection.close()
+    finally:
+        await session.close()
+        await runner.cleanup()
+
+
+loop = asyncio.new_event_loop()
+asyncio.set_event_loop(loop)
+loop.run_until_complete(test_websocket_connection(loop))
+loop.close()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base.mock_server import BinanceMockServer  # noqa: E402
+
+# ----------------------------------------------------------------------------
+
+symbols = ['BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'LTC/USDT', 'XRP/USDT']
+
+
+def streams(exchange, symbol):
+    return [conxid for conxid in exchange.websocketShards['default'] if exchange._contextIsSubscribed(conxid, 'trade', symbol)]
+
+
+def assert_no_gaps(ids):
+    ids = sorted(set(int(id) for id in ids))
+    assert ids == list(range(ids[0], ids[-1] + 1)), 'missing trades'
+
+
+async def wait_for_connections(server, count):
+    for i in range(0, 200):
+        if len(server.connections) == count:
+            return
+        await asyncio.sleep(0.01)
+    assert False, 'expected %d connections, got %d' % (count, len(server.connections))
+
+
+async def test_max_streams(loop):
+    server = BinanceMockServer({'messageRate': 100, 'symbols': symbols})
+    await server.start()
+    exchange = server.configure(ccxt.binance({'asyncio_loop': loop, 'wsconf': {'conx-tpls': {'default': {'maxStreams': 2}}}}))
+    trades = dict((symbol, []) for symbol in symbols)
+    errors = []
+    exchange.on('trade', lambda symbol, trade: trades[symbol].append(trade['id']))
+    exchange.on('err', lambda error, conxid=None: errors.append(error))
+    try:
+        await exchange.websocket_subscribe_all([{'event': 'trade', 'symbol': symbol, 'params': {}} for symbol in symbols[0:3]])
+        # the least loaded connection with room takes the next stream
+        assert exchange.websocketShards['default'] == ['default', 'default-1']
+        assert [len(exchange._websocketContextGetSubscribedEventSymbols(conxid)) for conxid in ['default', 'default-1']] == [2, 1]
+        await exchange.websocket_subscribe('trade', symbols[3])
+        assert streams(exchange, symbols[3]) == ['default-1']
+        await exchange.websocket_subscribe('trade', symbols[4])
+        assert exchange.websocketShards['default'] == ['default', 'default-1', 'default-2']
+        await wait_for_connections(server, 3)
+        await asyncio.sleep(0.3)
+        assert all(len(trades[symbol]) > 10 for symbol in symbols)
+        # default-1 is reconnected with the streams of default-2, which is closed afterwards
+        await exchange.websocket_unsubscribe('trade', symbols[3])
+        assert exchange.websocketShards['default'] == ['default', 'default-1']
+        assert streams(exchange, symbols[4]) == ['default-1']
+        await wait_for_connections(server, 2)
+        count = len(trades[symbols[4]])
+        await asyncio.sleep(0.3)
+        assert len(trades[symbols[4]]) > count + 10
+        # the other streams kept coming through the reconnections
+        for symbol in [symbols[0], symbols[1], symbols[2], symbols[4]]:
+            assert_no_gaps(trades[symbol])
+        # default is disconnected when it has no streams left and takes the streams of default-1
+        await exchange.websocket_unsubscribe_all([{'event': 'trade', 'symbol': symbol, 'params': {}} for symbol in [symbols[0], symbols[1]]])
+        assert exchange.websocketShards['default'] == ['default']
+        assert streams(exchange, symbols[2]) == ['default'] and streams(exchange, symbols[4]) == ['default']
+        await wait_for_connections(server, 1)
+        count = len(trades[symbols[4]])
+        await asyncio.sleep(0.3)
+        assert len(trades[symbols[4]]) > count + 10
+        assert_no_gaps(trades[symbols[2]])
+        assert_no_gaps(trades[symbols[4]])
+        assert not errors
+    finally:
+        exchange.websocketCloseAll()
+        await exchange.close()
+        await server.stop()
+
+
+async def test_message_rate(loop):
+    server = BinanceMockServer({'messageRate': 20, 'symbols': symbols})
+    await server.start()
+    exchange = server.configure(ccxt.binance({'asyncio_loop': loop}))
+    exchange.wsconf['conx-tpls']['default']['messageRate'] = 25
+    books = dict((symbol, []) for symbol in symbols)
+    exchange.on('ob', lambda symbol, orderbook: books[symbol].append(orderbook['nonce']))
+    try:
+        # 10 messages per second for every order book at 100ms, 1 at 1000ms
+        await exchange.websocket_subscribe_all([{'event': 'ob', 'symbol': symbol, 'params': {'obinterval': '100ms'}} for symbol in symbols[0:3]])
+        assert [exchange._websocket_shard_load(conxid)[2] for conxid in exchange.websocketShards['default']] == [20, 10]
+        await exchange.websocket_subscribe('ob', symbols[3], {'obinterval': '1000ms'})
+        await exchange.websocket_subscribe('ticker', symbols[3])
+        assert [exchange._websocket_shard_load(conxid)[2] for conxid in exchange.websocketShards['default']] == [20, 12]
+        assert exchange._websocketGetConxid4Event('ob', symbols[0], {'obinterval': '100ms'}, False)['conxid'] == 'default'
+        await asyncio.sleep(0.5)
+        for symbol in symbols[0:4]:
+            assert len(books[symbol]) > 3 and books[symbol] == sorted(books[symbol])
+    finally:
+        exchange.websocketCloseAll()
+        await exchange.close()
+        await server.stop()
+
+
+loop = asyncio.new_event_loop()
+loop.run_until_complete(test_max_streams(loop))
+loop.run_until_complete(test_message_rate(loop))
+loop.close()